@@ -0,0 +1,71 @@
+"""
+Per-call overhead of `trace_event` for sync and async functions.
+
+Spans are created by a tracer provider without span processors, so numbers reflect
+decorator and SDK span bookkeeping only, not export.
+
+Run with:
+    python tracely/benchmarks/decorator_overhead.py
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from tracely import trace_event
+from tracely._context import set_tracer
+
+ITERATIONS = 20000
+
+
+def plain(question: str, session_id: str, temperature: float = 0.5) -> str:
+    return question
+
+
+async def async_plain(question: str, session_id: str, temperature: float = 0.5) -> str:
+    return question
+
+
+traced = trace_event()(plain)
+async_traced = trace_event()(async_plain)
+traced_ignored = trace_event(ignore_args=["session_id"])(plain)
+
+
+def _measure_sync(func: Callable, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func("what is tracing?", "session-1")
+    return (time.perf_counter() - start) / iterations
+
+
+def _measure_async(func: Callable, iterations: int) -> float:
+    async def run():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func("what is tracing?", "session-1")
+        return (time.perf_counter() - start) / iterations
+
+    return asyncio.run(run())
+
+
+def main():
+    set_tracer(TracerProvider().get_tracer("evidently"))
+    # warm up
+    _measure_sync(traced, 1000)
+    _measure_async(async_traced, 1000)
+
+    base_sync = _measure_sync(plain, ITERATIONS)
+    base_async = _measure_async(async_plain, ITERATIONS)
+    results = {
+        "sync": _measure_sync(traced, ITERATIONS) - base_sync,
+        "sync (ignore_args)": _measure_sync(traced_ignored, ITERATIONS) - base_sync,
+        "async": _measure_async(async_traced, ITERATIONS) - base_async,
+    }
+    for name, overhead in results.items():
+        print(f"{name:<20} {overhead * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Export throughput of `init_tracing(export=ExportConfig(...))` profiles with http exporter.
+
+Spans are produced in bursts by several threads and exported to local fake collector;
+the numbers show how many spans reach the collector,
+how many are dropped by the queue and how many bytes are sent.
+
+Run with:
+    python tracely/benchmarks/export_throughput.py
+"""
+
+import json
+import threading
+import time
+import uuid
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from tracely import ExportConfig
+from tracely import init_tracing
+from tracely import trace_event
+from tracely.fake_collector import FakeCollector
+
+THREADS = 8
+SPANS_PER_THREAD = 10000
+
+PROFILES = {
+    "default": ExportConfig(),
+    "default+gzip": ExportConfig(compression="gzip"),
+    "burst": ExportConfig(max_queue_size=65536, max_batch_size=4096, schedule_delay=1.0, compression="gzip"),
+    "low-latency": ExportConfig(max_queue_size=8192, max_batch_size=256, schedule_delay=0.2),
+}
+
+
+@trace_event()
+def handle(question: str, user_id: str) -> dict:
+    return {"answer": question * 4, "user_id": user_id}
+
+
+def _produce() -> None:
+    for idx in range(SPANS_PER_THREAD):
+        handle("what is the status of my order?", f"user-{idx % 100}")
+
+
+def run_profile(config: ExportConfig) -> dict:
+    collector = FakeCollector()
+    collector.start()
+    provider = init_tracing(
+        address=collector.address,
+        exporter_type="http",
+        project_id=str(uuid.UUID(int=0)),
+        export_name="benchmark",
+        as_global=False,
+        export=config,
+    )
+    assert isinstance(provider, TracerProvider)
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_produce) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    produced = time.perf_counter() - start
+    provider.shutdown()
+    total = time.perf_counter() - start
+    collector.stop()
+    created = THREADS * SPANS_PER_THREAD
+    stats = collector.stats()
+    return {
+        "created": created,
+        "exported": stats["spans_received"],
+        "dropped": created - stats["spans_received"],
+        "produce_seconds": round(produced, 2),
+        "total_seconds": round(total, 2),
+        "exported_per_second": round(stats["spans_received"] / total),
+        "bytes_per_span": round(stats["bytes_received"] / max(stats["spans_received"], 1)),
+    }
+
+
+def main() -> None:
+    for name, config in PROFILES.items():
+        print(name, json.dumps(run_profile(config)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark suite for tracely hot paths and export pipeline with machine-readable results.
+
+Micro benchmarks create spans with a tracer provider without span processors, so they measure
+tracely and SDK span bookkeeping only. Export benchmark sends spans through `init_tracing`
+http exporter to a local stand-in collector and measures throughput and end-to-end latency
+(from span end to collector receiving it).
+
+Run with:
+    python tracely/benchmarks/suite.py --output results.json
+    python tracely/benchmarks/suite.py --compare results.json  # compare with previous results
+    python tracely/benchmarks/suite.py --filter sync           # run only matching benchmarks
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import uuid
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import opentelemetry.version
+from opentelemetry.sdk.trace import TracerProvider
+
+import tracely
+from tracely import ExportConfig
+from tracely import Interceptor
+from tracely import create_trace_event
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._context import _data_context
+from tracely._context import set_tracer
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+ROUNDS = 7
+
+
+class TagInterceptor(Interceptor):
+    def before_call(self, span, context, *args, **kwargs):
+        span.set_attribute("tenant", "acme")
+
+    def after_call(self, span, context, return_value):
+        pass
+
+    def on_exception(self, span, context, ex):
+        return False
+
+
+def answer(question: str, session_id: str, temperature: float = 0.5) -> str:
+    return question
+
+
+async def async_answer(question: str, session_id: str, temperature: float = 0.5) -> str:
+    return question
+
+
+LARGE_RESULT = {f"key_{idx}": {"text": "value " * 10, "score": idx / 7} for idx in range(1000)}
+
+
+def large_result() -> dict:
+    return LARGE_RESULT
+
+
+def _nested(depth: int) -> Callable[[], int]:
+    @trace_event()
+    def level_0() -> int:
+        return 0
+
+    func = level_0
+    for _ in range(1, depth):
+
+        def make(inner: Callable[[], int]) -> Callable[[], int]:
+            @trace_event()
+            def level_n() -> int:
+                return inner() + 1
+
+            return level_n
+
+        func = make(func)
+    return func
+
+
+traced = trace_event()(answer)
+async_traced = trace_event()(async_answer)
+traced_large = trace_event()(large_result)
+nested_10 = _nested(10)
+
+
+def _context_manager() -> None:
+    with create_trace_event("step", question="what is tracing?") as span:
+        span.set_result("answer")
+
+
+def _update_usage() -> None:
+    with create_trace_event("llm") as span:
+        span.update_usage(tokens={"input": 120, "output": 40})
+
+
+def _time_sync(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def _time_async(func: Callable[[], Any], iterations: int) -> float:
+    async def run() -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+        return (time.perf_counter() - start) / iterations
+
+    return asyncio.run(run())
+
+
+def _per_call(
+    name: str,
+    func: Callable[[], Any],
+    iterations: int,
+    interceptors: Optional[List[Interceptor]] = None,
+    is_async: bool = False,
+) -> Dict[str, Any]:
+    set_tracer(TracerProvider().get_tracer("evidently"))
+    _data_context.interceptors = list(interceptors or [])
+    measure = _time_async if is_async else _time_sync
+    measure(func, max(iterations // 10, 1))
+    samples = [measure(func, iterations) * 1e9 for _ in range(ROUNDS)]
+    _data_context.interceptors = []
+    return {
+        "name": name,
+        "unit": "ns/call",
+        "value": round(min(samples)),
+        "median": round(statistics.median(samples)),
+        "rounds": ROUNDS,
+        "iterations": iterations,
+    }
+
+
+def _export(name: str, spans: int, config: ExportConfig) -> List[Dict[str, Any]]:
+    collector = FakeCollector(FakeCollectorConfig(keep_spans=True))
+    collector.start()
+    provider = init_tracing(
+        address=collector.address,
+        exporter_type="http",
+        project_id=str(uuid.UUID(int=0)),
+        export_name="benchmark",
+        as_global=False,
+        export=config,
+    )
+    assert isinstance(provider, TracerProvider)
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=lambda: [traced("what is tracing?", "session-1") for _ in range(spans // 4)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    provider.shutdown()
+    elapsed = time.perf_counter() - start
+    collector.stop()
+    received = collector.stats()["spans_received"]
+    latencies = sorted(collector.latencies) or [0.0]
+    return [
+        {"name": f"{name}.throughput", "unit": "spans/s", "value": round(received / elapsed)},
+        {"name": f"{name}.dropped", "unit": "spans", "value": spans - received},
+        {"name": f"{name}.latency_p50", "unit": "ms", "value": round(latencies[len(latencies) // 2] * 1e3, 1)},
+        {"name": f"{name}.latency_p99", "unit": "ms", "value": round(latencies[int(len(latencies) * 0.99)] * 1e3, 1)},
+    ]
+
+
+BENCHMARKS: Dict[str, Callable[[], List[Dict[str, Any]]]] = {
+    "sync": lambda: [_per_call("sync", lambda: traced("what is tracing?", "session-1"), 20000)],
+    "sync_interceptors": lambda: [
+        _per_call("sync_interceptors", lambda: traced("what is tracing?", "session-1"), 20000, [TagInterceptor()])
+    ],
+    "async": lambda: [_per_call("async", lambda: async_traced("what is tracing?", "session-1"), 20000, is_async=True)],
+    "async_interceptors": lambda: [
+        _per_call(
+            "async_interceptors",
+            lambda: async_traced("what is tracing?", "session-1"),
+            20000,
+            [TagInterceptor()],
+            is_async=True,
+        )
+    ],
+    "nested_depth_10": lambda: [_per_call("nested_depth_10", nested_10, 2000)],
+    "large_dict_result": lambda: [_per_call("large_dict_result", traced_large, 500)],
+    "context_manager": lambda: [_per_call("context_manager", _context_manager, 20000)],
+    "update_usage": lambda: [_per_call("update_usage", _update_usage, 20000)],
+    "export_default": lambda: _export("export_default", 20000, ExportConfig()),
+    "export_burst": lambda: _export(
+        "export_burst",
+        20000,
+        ExportConfig(max_queue_size=65536, max_batch_size=4096, schedule_delay=1.0, compression="gzip"),
+    ),
+}
+
+
+def _compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None or not previous["value"]:
+            change = "new"
+        else:
+            change = f"{(result['value'] - previous['value']) / previous['value']:+.1%}"
+        print(f"{result['name']:<32} {result['value']:>12} {result['unit']:<8} {change}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", help="write results to JSON file")
+    parser.add_argument("--compare", help="compare with results from JSON file")
+    parser.add_argument("--filter", default="", help="run only benchmarks with names containing this string")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for name, benchmark in BENCHMARKS.items():
+        if args.filter in name:
+            results.extend(benchmark())
+    report = {
+        "tracely": tracely.__version__,
+        "opentelemetry": opentelemetry.version.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    if args.compare:
+        _compare(results, args.compare)
+    else:
+        for result in results:
+            print(f"{result['name']:<32} {result['value']:>12} {result['unit']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
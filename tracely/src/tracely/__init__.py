@@ -1,13 +1,27 @@
 from ._tracer_provider import UsageDetails
 from ._tracer_provider import init_tracing
+from ._sampling import SamplingConfig
+from ._spool import SpoolConfig
+from ._export_config import ExportConfig
+from ._file_exporter import FileExportConfig
+from ._tail_sampling import TailSamplingConfig
+from ._tail_sampling import TailSamplingSpanProcessor
+from ._context import PricingTier
 from ._context import get_info
+from ._stats import get_stats
 from ._context import get_interceptors
+from ._context import add_interceptor
+from ._context import remove_interceptor
 from ._context import get_tracer
 from .decorators import trace_event
 from .context import create_trace_event
 from .context import bind_to_trace
+from ._pipeline import TracelyPipeline
+from .interceptors import AsyncInterceptor
 from .interceptors import Interceptor
 from .proxy import SpanObject
+from .serialization import SerializationConfig
+from .serialization import register_serializer
 from ._runtime_context import get_current_span
 from ._runtime_context import RuntimeContext
 from ._version import __version__
@@ -15,16 +29,30 @@ from ._version import __version__
 
 __all__ = [
     "UsageDetails",
+    "PricingTier",
     "create_trace_event",
+    "ExportConfig",
+    "FileExportConfig",
     "get_current_span",
     "get_info",
+    "get_stats",
     "get_tracer",
     "get_interceptors",
+    "add_interceptor",
+    "remove_interceptor",
     "init_tracing",
     "bind_to_trace",
+    "register_serializer",
     "Interceptor",
+    "AsyncInterceptor",
     "trace_event",
+    "TracelyPipeline",
     "SpanObject",
     "RuntimeContext",
+    "SamplingConfig",
+    "SerializationConfig",
+    "SpoolConfig",
+    "TailSamplingConfig",
+    "TailSamplingSpanProcessor",
     "__version__",
 ]
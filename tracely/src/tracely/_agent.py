@@ -0,0 +1,282 @@
+"""
+Local span agent.
+
+Worker processes export spans with `LocalAgentSpanExporter`, which writes encoded OTLP batches
+to agent's Unix domain socket as length-prefixed records (same framing as segment files).
+Agent merges records from all workers into larger batches, compresses them and forwards
+to collector through single authenticated session.
+"""
+
+import collections
+import dataclasses
+import logging
+import os
+import select
+import socket
+import socketserver
+import threading
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+
+import requests
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from ._delivery import Delivery
+from ._delivery import merge_requests
+from ._delivery import post_with_retries
+from ._delivery import prepare_body
+from ._env import _TRACE_AGENT_SOCKET
+from ._segments import _LENGTH
+
+logger = logging.getLogger(__name__)
+
+_CONNECTION_CLOSE_TIMEOUT = 1.0
+
+
+class LocalAgentSpanExporter(SpanExporter):
+    """Span exporter that sends encoded OTLP batches to local agent over Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float = 10.0):
+        self._socket_path = socket_path
+        self._timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._timeout)
+            try:
+                sock.connect(self._socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._socket = sock
+        return self._socket
+
+    def _close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        payload = encode_spans(spans).SerializeToString()
+        record = _LENGTH.pack(len(payload)) + payload
+        with self._lock:
+            # connection is reopened once in case agent was restarted since last export
+            for attempt in range(2):
+                try:
+                    self._connect().sendall(record)
+                    return SpanExportResult.SUCCESS
+                except OSError as e:
+                    self._close()
+                    if attempt == 1:
+                        logger.warning("tracely failed to send spans to agent at %s: %s", self._socket_path, e)
+        return SpanExportResult.FAILURE
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._close()
+
+
+@dataclasses.dataclass
+class AgentConfig:
+    """
+    Local agent configuration.
+
+    Args:
+        socket_path: path of Unix domain socket to listen on
+        flush_interval: maximum delay in seconds before received spans are forwarded
+        max_batch_bytes: maximum size of single forwarded batch before compression
+        max_queue_bytes: maximum size of spans waiting to be forwarded, oldest are dropped when exceeded
+        compression: compress forwarded batches with gzip
+        max_retries: number of retries of failed batch before it is dropped
+        timeout: timeout in seconds of single request to collector
+    """
+
+    socket_path: str = _TRACE_AGENT_SOCKET
+    flush_interval: float = 1.0
+    max_batch_bytes: int = 4 * 1024 * 1024
+    max_queue_bytes: int = 256 * 1024 * 1024
+    compression: bool = True
+    max_retries: int = 5
+    timeout: float = 10.0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def finish(self) -> None:
+        with self.server.lock:
+            self.server.connections.discard(threading.current_thread())
+        super().finish()
+
+    def handle(self) -> None:
+        while True:
+            header = self.rfile.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(header)
+            payload = self.rfile.read(length)
+            if len(payload) < length:
+                return
+            self.server.agent.receive(payload)
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, agent: "TracelyAgent"):
+        self.agent = agent
+        self.lock = threading.Lock()
+        self.connections: Set[threading.Thread] = set()
+        super().__init__(agent.config.socket_path, _Handler)
+
+    def process_request(self, request, client_address) -> None:
+        # connection is registered before its thread starts, so `stop()` waits for it even if it has not run yet
+        thread = threading.Thread(target=self.process_request_thread, args=(request, client_address), daemon=True)
+        with self.lock:
+            self.connections.add(thread)
+        thread.start()
+
+
+class TracelyAgent:
+    """
+    Receives spans from worker processes over Unix domain socket and forwards them to collector.
+
+    Args:
+        endpoint: collector traces endpoint
+        session: authenticated session to send requests with
+        resource_attributes: attributes set on resource of every forwarded span (export and project ids)
+        config: agent configuration
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        session: requests.Session,
+        resource_attributes: Dict[str, str],
+        config: Optional[AgentConfig] = None,
+    ):
+        self.config = config or AgentConfig()
+        self._endpoint = endpoint
+        self._session = session
+        self._resource_attributes = resource_attributes
+        self._pending: Deque[bytes] = collections.deque()
+        self._pending_bytes = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._server: Optional[_Server] = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if os.path.exists(self.config.socket_path):
+            # socket file left by previous agent run
+            os.unlink(self.config.socket_path)
+        self._server = _Server(self)
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="tracely-agent-server", daemon=True),
+            threading.Thread(target=self._run, name="tracely-agent-forwarder", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop accepting spans and forward everything received."""
+        if self._server is not None:
+            self._server.shutdown()
+            # accept connections which are still waiting in the listen backlog
+            while select.select([self._server], [], [], 0)[0]:
+                self._server.handle_request()
+            self._server.server_close()
+            with self._server.lock:
+                connections = list(self._server.connections)
+            # give workers which already disconnected time to deliver spans still in socket buffer
+            for connection in connections:
+                connection.join(_CONNECTION_CLOSE_TIMEOUT)
+            self._server = None
+            if os.path.exists(self.config.socket_path):
+                os.unlink(self.config.socket_path)
+        self._stop.set()
+        with self._condition:
+            self._condition.notify()
+        for thread in self._threads:
+            thread.join(self.config.timeout * (self.config.max_retries + 1))
+
+    def force_flush(self, timeout: Optional[float] = None) -> bool:
+        """Forward received spans immediately, returns False if they are not forwarded after timeout."""
+        with self._condition:
+            self._condition.notify()
+        return self._idle.wait(timeout)
+
+    def receive(self, payload: bytes) -> None:
+        with self._condition:
+            self._pending.append(payload)
+            self._pending_bytes += len(payload)
+            dropped = 0
+            while self._pending_bytes > self.config.max_queue_bytes and len(self._pending) > 1:
+                self._pending_bytes -= len(self._pending.popleft())
+                dropped += 1
+            self._idle.clear()
+            if self._pending_bytes >= self.config.max_batch_bytes:
+                self._condition.notify()
+        if dropped:
+            logger.warning(
+                "tracely agent queue exceeded %d bytes, dropped %d batches", self.config.max_queue_bytes, dropped
+            )
+
+    def _take_batch(self) -> List[bytes]:
+        batch: List[bytes] = []
+        size = 0
+        with self._condition:
+            while self._pending and (not batch or size + len(self._pending[0]) <= self.config.max_batch_bytes):
+                payload = self._pending.popleft()
+                size += len(payload)
+                batch.append(payload)
+            self._pending_bytes -= size
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._pending and not self._stop.is_set():
+                    self._idle.set()
+                    self._condition.wait(self.config.flush_interval)
+                elif self._pending_bytes < self.config.max_batch_bytes and not self._stop.is_set():
+                    # wait for more spans to forward fewer, larger batches
+                    self._condition.wait(self.config.flush_interval)
+            batch = self._take_batch()
+            if batch:
+                # records come from any local process, malformed ones should not stop forwarding of others
+                merged = merge_requests(batch, self._resource_attributes, skip_invalid=True)
+                if merged.resource_spans:
+                    self._send(merged.SerializeToString())
+            elif self._stop.is_set():
+                self._idle.set()
+                return
+
+    def _send(self, body: bytes) -> bool:
+        body, headers = prepare_body(body, self.config.compression)
+        result = post_with_retries(
+            lambda: self._session.post(self._endpoint, data=body, headers=headers, timeout=self.config.timeout),
+            "tracely agent",
+            max_retries=self.config.max_retries,
+            backoff=1.0,
+            max_backoff=30.0,
+            wait=self._stop.wait,
+        )
+        if result is Delivery.FAILED:
+            logger.error("tracely agent dropped batch after %d retries", self.config.max_retries)
+        return result is Delivery.SENT
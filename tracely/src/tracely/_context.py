@@ -1,25 +1,61 @@
+import contextvars
 import dataclasses
 import typing
 import uuid
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 import opentelemetry
+import opentelemetry.sdk.trace
 from opentelemetry import trace
 from opentelemetry.context import Context
 from opentelemetry.trace import NonRecordingSpan
 from opentelemetry.trace import SpanContext
 from opentelemetry.trace import TraceFlags
 
+from ._pricing import PricingTable
+from .interceptors import AnyInterceptor
+from .interceptors import InterceptorHooks
+from .serialization import AttributeSerializer
+
 if typing.TYPE_CHECKING:
-    from .interceptors import Interceptor
+    from ._pipeline import TracelyPipeline
+    from ._serialization_exporter import DeferredValues
+    from ._sampling import Sampler
+    from .proxy import NullSpanObject
+
+
+@dataclasses.dataclass
+class PricingTier:
+    """
+    Prices applied to calls with at least `min_input_tokens` input tokens (including cached ones).
+
+    Token types missing in `cost_per_token` are priced with base prices of the model.
+    """
+
+    min_input_tokens: int
+    cost_per_token: Dict[str, float]
 
 
 @dataclasses.dataclass
 class UsageDetails:
+    """
+    Prices of a model.
+
+    Args:
+        cost_per_token: cost of single token by token type (`input`, `cached_input`, `output`, ...),
+                        `cached_input` tokens are priced as `input` if not set
+        tiers: prices for calls with large number of input tokens
+        aliases: other model ids with the same prices, ids ending with `*` match by prefix
+    """
+
     cost_per_token: Dict[str, float]
+    tiers: List[PricingTier] = dataclasses.field(default_factory=list)
+    aliases: List[str] = dataclasses.field(default_factory=list)
 
 
 class DataContext:
@@ -27,7 +63,12 @@ class DataContext:
     project_id: Union[str, uuid.UUID]
     default_usage_details: Optional[UsageDetails]
     usage_details_by_model_id: Optional[Dict[str, UsageDetails]]
-    interceptors: List["Interceptor"]
+    pricing: PricingTable
+    interceptor_hooks: InterceptorHooks
+    sampler: Optional["Sampler"]
+    serializer: AttributeSerializer
+    deferred_values: Optional["DeferredValues"]
+    null_span: Optional["NullSpanObject"]
 
     def __init__(
         self,
@@ -35,13 +76,32 @@ class DataContext:
         project_id: str,
         default_usage_details: Optional[UsageDetails] = None,
         usage_details_by_model_id: Optional[Dict[str, UsageDetails]] = None,
-        interceptors: Optional[List["Interceptor"]] = None,
+        interceptors: Optional[Sequence[AnyInterceptor]] = None,
+        sampler: Optional["Sampler"] = None,
+        serializer: Optional[AttributeSerializer] = None,
     ):
         self.export_id = export_id
         self.project_id = project_id
         self.default_usage_details = default_usage_details
         self.usage_details_by_model_id = usage_details_by_model_id
-        self.interceptors = interceptors or []
+        self.pricing = PricingTable(default_usage_details, usage_details_by_model_id)
+        self.interceptors = interceptors or ()
+        self.sampler = sampler
+        self.serializer = serializer or AttributeSerializer()
+        # values captured for deferred serialization, set if it is enabled
+        self.deferred_values = None
+        # span object of not sampled calls, created by `proxy.get_null_span`
+        self.null_span = None
+
+    @property
+    def interceptors(self) -> Tuple[AnyInterceptor, ...]:
+        return self._interceptors
+
+    @interceptors.setter
+    def interceptors(self, interceptors: Sequence[AnyInterceptor]) -> None:
+        # hooks are compiled once per interceptor set, so it is kept immutable: in-place changes would be ignored
+        self._interceptors = tuple(interceptors)
+        self.interceptor_hooks = InterceptorHooks(self._interceptors)
 
     def get_model_usage_details(self, model_id: str) -> Optional[UsageDetails]:
         if self.usage_details_by_model_id is None:
@@ -52,26 +112,61 @@ class DataContext:
 _tracer: Optional[trace.Tracer] = None
 _context: Optional[Context] = None
 _data_context: DataContext = DataContext("<not_set>", "<not_set>")
+# pipeline selected with `TracelyPipeline.activate()`, None - tracing configured by `init_tracing` is used
+_selected_pipeline: contextvars.ContextVar[Optional["TracelyPipeline"]] = contextvars.ContextVar(
+    "tracely_pipeline", default=None
+)
+# set once any tracer (global or of a pipeline) is created, until then traced calls skip pipeline lookup
+_tracing_configured = False
 
 
-def set_tracer(new_tracer: trace.Tracer) -> None:
+def set_tracer(new_tracer: Optional[trace.Tracer]) -> None:
     global _tracer
     _tracer = new_tracer
+    if new_tracer is not None:
+        mark_tracing_configured()
+
+
+def mark_tracing_configured() -> None:
+    global _tracing_configured
+    _tracing_configured = True
+
+
+def get_pipeline_state(pipeline: Optional["TracelyPipeline"] = None) -> Tuple[Optional[trace.Tracer], DataContext]:
+    """Tracer and data context of given pipeline, of pipeline selected for current context or global ones."""
+    if pipeline is None:
+        pipeline = _selected_pipeline.get()
+        if pipeline is None:
+            return _tracer, _data_context
+    return pipeline.tracer, pipeline.data_context
 
 
 def get_tracer() -> Optional[trace.Tracer]:
-    return _tracer
+    return get_pipeline_state()[0]
 
 
 def get_info():
+    data_context = get_pipeline_state()[1]
     return {
-        "export_id": _data_context.export_id,
-        "project_id": _data_context.project_id,
+        "export_id": data_context.export_id,
+        "project_id": data_context.project_id,
     }
 
 
-def get_interceptors() -> List["Interceptor"]:
-    return _data_context.interceptors
+def get_interceptors() -> Tuple[AnyInterceptor, ...]:
+    return get_pipeline_state()[1].interceptors
+
+
+def add_interceptor(interceptor: AnyInterceptor) -> None:
+    """Add interceptor to current pipeline (or global tracing), it is used for calls started after this one."""
+    data_context = get_pipeline_state()[1]
+    data_context.interceptors = (*data_context.interceptors, interceptor)
+
+
+def remove_interceptor(interceptor: AnyInterceptor) -> None:
+    """Remove interceptor from current pipeline (or global tracing)."""
+    data_context = get_pipeline_state()[1]
+    data_context.interceptors = tuple(item for item in data_context.interceptors if item is not interceptor)
 
 
 def create_context(trace_id: int, parent_span_id: Optional[int]):
@@ -0,0 +1,106 @@
+import collections
+import logging
+import threading
+from typing import Callable
+from typing import Deque
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from ._spans import replace_span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_SPANS = 2048
+
+
+class DeferredSpanExporter(SpanExporter):
+    """
+    Span exporter which creates actual exporter in background thread.
+
+    Spans exported before actual exporter is ready are buffered (oldest are dropped over the limit).
+    Failed `resolve` is retried with exponential backoff (from `backoff` up to `max_backoff` seconds)
+    until it succeeds or exporter is shut down.
+    Spans created with `placeholder` resource are exported with resource returned by `resolve`.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[], Tuple[SpanExporter, Resource]],
+        placeholder: Resource,
+        max_buffered_spans: int = DEFAULT_MAX_BUFFERED_SPANS,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self._placeholder = placeholder
+        self._exporter: Optional[SpanExporter] = None
+        self._resource: Optional[Resource] = None
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._stop = threading.Event()
+        self._buffer: Deque[ReadableSpan] = collections.deque(maxlen=max_buffered_spans)
+        self._lock = threading.Lock()
+        self._resolver = threading.Thread(target=self._resolve, args=(resolve,), name="tracely-init", daemon=True)
+        self._resolver.start()
+
+    def _resolve(self, resolve: Callable[[], Tuple[SpanExporter, Resource]]) -> None:
+        backoff = self._backoff
+        while True:
+            try:
+                exporter, resource = resolve()
+                break
+            except Exception as e:
+                # collector may be temporarily unavailable on cold start, spans are kept in the buffer meanwhile
+                logger.warning("tracely failed to initialize exporter, retrying in %.1f seconds: %s", backoff, e)
+            if self._stop.wait(backoff):
+                return
+            backoff = min(backoff * 2, self._max_backoff)
+        with self._lock:
+            self._resource = resource
+            self._exporter = exporter
+            buffered = list(self._buffer)
+            self._buffer.clear()
+        if buffered:
+            self._export(exporter, buffered)
+
+    def _export(self, exporter: SpanExporter, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        assert self._resource is not None
+        return exporter.export(
+            [
+                replace_span(span, resource=self._resource) if span.resource is self._placeholder else span
+                for span in spans
+            ]
+        )
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            exporter = self._exporter
+            if exporter is None:
+                if len(self._buffer) + len(spans) > (self._buffer.maxlen or 0):
+                    logger.warning("tracely is not initialized yet, dropping oldest buffered spans")
+                self._buffer.extend(spans)
+                return SpanExportResult.SUCCESS
+        return self._export(exporter, spans)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until actual exporter is created, returns False if it is not ready after timeout."""
+        self._resolver.join(timeout)
+        return self._exporter is not None
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if not self.wait_ready(timeout_millis / 1000):
+            return False
+        assert self._exporter is not None
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._resolver.join(5)
+        exporter = self._exporter
+        if exporter is not None:
+            exporter.shutdown()
@@ -0,0 +1,132 @@
+"""
+Merging and delivery of encoded span batches to collector and progress checkpoints,
+shared by persistent spool, local agent and `tracely upload`.
+"""
+
+import enum
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import requests
+from google.protobuf.message import DecodeError  # type: ignore[import-untyped]
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue
+from opentelemetry.proto.common.v1.common_pb2 import KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource as PbResource
+
+logger = logging.getLogger(__name__)
+
+# client errors which are worth retrying, other 4xx responses mean batch is rejected
+RETRYABLE_STATUS_CODES = (408, 429)
+
+
+class Delivery(enum.Enum):
+    SENT = "sent"
+    # collector rejected batch, it should not be retried
+    REJECTED = "rejected"
+    # retries are exhausted or sender is stopping
+    FAILED = "failed"
+
+
+def merge_requests(
+    payloads: Sequence[bytes], resource_attributes: Dict[str, str], skip_invalid: bool = False
+) -> ExportTraceServiceRequest:
+    """
+    Merge encoded requests into one, grouping spans of equal resources and setting `resource_attributes`.
+
+    Payloads which cannot be decoded raise `DecodeError`, or are logged and dropped if `skip_invalid` is set.
+    """
+    merged = ExportTraceServiceRequest()
+    by_resource: Dict[bytes, int] = {}
+    for payload in payloads:
+        try:
+            request = ExportTraceServiceRequest.FromString(payload)
+        except DecodeError as e:
+            if not skip_invalid:
+                raise
+            logger.warning("tracely dropped %d bytes record which is not an encoded span batch: %s", len(payload), e)
+            continue
+        for resource_spans in request.resource_spans:
+            _set_attributes(resource_spans.resource, resource_attributes)
+            key = resource_spans.resource.SerializeToString(deterministic=True)
+            if key not in by_resource:
+                by_resource[key] = len(merged.resource_spans)
+                target = merged.resource_spans.add()
+                target.resource.CopyFrom(resource_spans.resource)
+                target.schema_url = resource_spans.schema_url
+            merged.resource_spans[by_resource[key]].scope_spans.extend(resource_spans.scope_spans)
+    return merged
+
+
+def _set_attributes(resource: PbResource, attributes: Dict[str, str]) -> None:
+    kept = [attribute for attribute in resource.attributes if attribute.key not in attributes]
+    del resource.attributes[:]
+    resource.attributes.extend(kept)
+    for key, value in attributes.items():
+        resource.attributes.append(KeyValue(key=key, value=AnyValue(string_value=value)))
+
+
+def prepare_body(body: bytes, compression: bool) -> Tuple[bytes, Dict[str, str]]:
+    """Request body (compressed with gzip if set) and its headers."""
+    headers = {"Content-Type": "application/x-protobuf"}
+    if compression:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def post_with_retries(
+    post: Callable[[], requests.Response],
+    name: str,
+    *,
+    max_retries: Optional[int],
+    backoff: float,
+    max_backoff: float,
+    wait: Callable[[float], Any] = time.sleep,
+    stopped: Optional[Callable[[], bool]] = None,
+) -> Delivery:
+    """
+    Send request with `post`, retrying server errors, throttling and connection errors with exponential backoff.
+
+    Args:
+        post: sends request
+        name: sender name for log messages
+        max_retries: number of retries, None to retry until `stopped` returns True
+        backoff: delay in seconds before the first retry, doubled after each retry up to `max_backoff`
+        wait: waits given number of seconds between retries
+        stopped: returns True if sender is stopping and retries should be abandoned
+    """
+    attempt = 0
+    while True:
+        try:
+            response = post()
+            if response.ok:
+                return Delivery.SENT
+            if response.status_code < 500 and response.status_code not in RETRYABLE_STATUS_CODES:
+                logger.error("%s dropped batch, collector responded %d", name, response.status_code)
+                return Delivery.REJECTED
+            logger.warning("%s failed to send batch, collector responded %d", name, response.status_code)
+        except requests.exceptions.RequestException as e:
+            logger.warning("%s failed to send batch: %s", name, e)
+        if (max_retries is not None and attempt >= max_retries) or (stopped is not None and stopped()):
+            return Delivery.FAILED
+        attempt += 1
+        wait(backoff)
+        backoff = min(backoff * 2, max_backoff)
+
+
+def write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Replace file with JSON data, readers never see partially written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
@@ -1,4 +1,10 @@
 import os
+from typing import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_TRACE_ENABLED = os.getenv("EVIDENTLY_TRACE_ENABLED", "true").lower() not in ("false", "0", "no")
 
 _TRACE_COLLECTOR_ADDRESS = os.getenv("EVIDENTLY_TRACE_COLLECTOR", "https://app.evidently.cloud")
 _TRACE_COLLECTOR_TYPE = os.getenv("EVIDENTLY_TRACE_COLLECTOR_TYPE", "http")
@@ -6,3 +12,20 @@ _TRACE_COLLECTOR_API_KEY = os.getenv("EVIDENTLY_TRACE_COLLECTOR_API_KEY", "")
 _EVIDENTLY_API_KEY = os.getenv("EVIDENTLY_API_KEY", "")
 _TRACE_COLLECTOR_EXPORT_NAME = os.getenv("EVIDENTLY_TRACE_COLLECTOR_EXPORT_NAME", "")
 _TRACE_COLLECTOR_PROJECT_ID = os.getenv("EVIDENTLY_TRACE_COLLECTOR_PROJECT_ID", "")
+_TRACE_CACHE_DIR = os.getenv("EVIDENTLY_TRACE_CACHE_DIR", "")
+_TRACE_AGENT_SOCKET = os.getenv("EVIDENTLY_TRACE_AGENT_SOCKET", "/tmp/tracely-agent.sock")
+# numeric values are kept as strings and parsed with `parse_env` when used,
+# so a typo in environment does not break `import tracely`
+_TRACE_MAX_QUEUE_SIZE = os.getenv("EVIDENTLY_TRACE_MAX_QUEUE_SIZE", "2048")
+_TRACE_MAX_BATCH_SIZE = os.getenv("EVIDENTLY_TRACE_MAX_BATCH_SIZE", "512")
+_TRACE_SCHEDULE_DELAY = os.getenv("EVIDENTLY_TRACE_SCHEDULE_DELAY", "5.0")
+_TRACE_EXPORT_TIMEOUT = os.getenv("EVIDENTLY_TRACE_EXPORT_TIMEOUT", "10.0")
+_TRACE_COMPRESSION = os.getenv("EVIDENTLY_TRACE_COMPRESSION", "none").lower()
+_TRACE_STATS_LOG_INTERVAL = os.getenv("EVIDENTLY_TRACE_STATS_LOG_INTERVAL", "0")
+
+
+def parse_env(name: str, value: str, parse: Callable[[str], T]) -> T:
+    try:
+        return parse(value)
+    except ValueError:
+        raise ValueError(f"Invalid value of {name} env variable: {value!r}, expected {parse.__name__}") from None
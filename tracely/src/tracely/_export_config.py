@@ -0,0 +1,57 @@
+import dataclasses
+import functools
+
+from ._env import _TRACE_COMPRESSION
+from ._env import _TRACE_EXPORT_TIMEOUT
+from ._env import _TRACE_MAX_BATCH_SIZE
+from ._env import _TRACE_MAX_QUEUE_SIZE
+from ._env import _TRACE_SCHEDULE_DELAY
+from ._env import parse_env
+
+_COMPRESSION_TYPES = ("none", "gzip")
+
+
+@dataclasses.dataclass
+class ExportConfig:
+    """
+    Batching, queue and compression settings of span export, applied to both http and grpc exporters.
+    Defaults can be changed with environment variables given in brackets.
+
+    Args:
+        max_queue_size: maximum number of finished spans waiting for export,
+                        when queue is full the oldest queued span is dropped to make room for a new one
+                        (EVIDENTLY_TRACE_MAX_QUEUE_SIZE)
+        max_batch_size: maximum number of spans sent in single request (EVIDENTLY_TRACE_MAX_BATCH_SIZE)
+        schedule_delay: maximum delay in seconds before queued spans are sent (EVIDENTLY_TRACE_SCHEDULE_DELAY)
+        export_timeout: timeout in seconds of single request to collector (EVIDENTLY_TRACE_EXPORT_TIMEOUT)
+        compression: "gzip" or "none" (EVIDENTLY_TRACE_COMPRESSION)
+    """
+
+    max_queue_size: int = dataclasses.field(
+        default_factory=functools.partial(parse_env, "EVIDENTLY_TRACE_MAX_QUEUE_SIZE", _TRACE_MAX_QUEUE_SIZE, int)
+    )
+    max_batch_size: int = dataclasses.field(
+        default_factory=functools.partial(parse_env, "EVIDENTLY_TRACE_MAX_BATCH_SIZE", _TRACE_MAX_BATCH_SIZE, int)
+    )
+    schedule_delay: float = dataclasses.field(
+        default_factory=functools.partial(parse_env, "EVIDENTLY_TRACE_SCHEDULE_DELAY", _TRACE_SCHEDULE_DELAY, float)
+    )
+    export_timeout: float = dataclasses.field(
+        default_factory=functools.partial(parse_env, "EVIDENTLY_TRACE_EXPORT_TIMEOUT", _TRACE_EXPORT_TIMEOUT, float)
+    )
+    compression: str = _TRACE_COMPRESSION
+
+
+def check_export_config(config: ExportConfig) -> None:
+    if config.max_queue_size <= 0:
+        raise ValueError(f"Export queue size should be positive, got {config.max_queue_size}")
+    if not 0 < config.max_batch_size <= config.max_queue_size:
+        raise ValueError(
+            f"Export batch size should be positive and not larger than queue size, got {config.max_batch_size}"
+        )
+    if config.schedule_delay <= 0:
+        raise ValueError(f"Export schedule delay should be positive, got {config.schedule_delay}")
+    if config.export_timeout <= 0:
+        raise ValueError(f"Export timeout should be positive, got {config.export_timeout}")
+    if config.compression not in _COMPRESSION_TYPES:
+        raise ValueError(f"Unexpected compression: {config.compression}. Expected values: none or gzip")
@@ -0,0 +1,146 @@
+import dataclasses
+import gzip
+import os
+import threading
+import time
+from typing import BinaryIO
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from ._segments import SegmentWriter
+
+_FILE_FORMATS = ("otlp", "jsonl")
+JSONL_SUFFIX = ".jsonl.gz"
+
+
+@dataclasses.dataclass
+class FileExportConfig:
+    """
+    Offline export to local files (`exporter_type="file"`).
+
+    Args:
+        directory: directory to write segment files to, should not be shared between processes
+        format: "otlp" - segments of encoded OTLP batches, which can be uploaded later with `tracely upload`,
+                "jsonl" - gzip-compressed JSON lines, one span per line
+        segment_bytes: size of a single segment file, new file is started when it is reached
+        segment_seconds: maximum time a segment file is written to, None to rotate by size only
+        fsync_interval: minimum number of seconds between fsync calls, 0 to fsync every batch
+    """
+
+    directory: str
+    format: str = "otlp"
+    segment_bytes: int = 64 * 1024 * 1024
+    segment_seconds: Optional[float] = 3600.0
+    fsync_interval: float = 1.0
+
+
+def check_file_export_config(config: FileExportConfig) -> None:
+    if config.format not in _FILE_FORMATS:
+        raise ValueError(f"Unexpected file export format: {config.format}. Expected values: otlp or jsonl")
+    if config.segment_bytes <= 0:
+        raise ValueError(f"File export segment_bytes should be positive, got {config.segment_bytes}")
+    if config.segment_seconds is not None and config.segment_seconds <= 0:
+        raise ValueError(f"File export segment_seconds should be positive, got {config.segment_seconds}")
+    if config.fsync_interval < 0:
+        raise ValueError(f"File export fsync_interval should not be negative, got {config.fsync_interval}")
+
+
+class JsonlSegmentWriter:
+    """Writes gzip-compressed JSON lines to `<sequence>.jsonl.gz` files, starting a new one when size limit is reached."""
+
+    def __init__(self, directory: str, max_segment_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        existing = sorted(name for name in os.listdir(directory) if name.endswith(JSONL_SUFFIX))
+        self._next_sequence = int(existing[-1][: -len(JSONL_SUFFIX)]) + 1 if existing else 0
+        self._raw: Optional[BinaryIO] = None
+        self._file: Optional[gzip.GzipFile] = None
+        self.current_path: Optional[str] = None
+
+    def append(self, payload: bytes) -> None:
+        if self._file is None or self._raw is None or self._raw.tell() >= self.max_segment_bytes:
+            self.rotate()
+        assert self._file is not None
+        self._file.write(payload)
+
+    def rotate(self) -> None:
+        # closing syncs the finished segment, so it is durable before writing continues in the next one
+        self.close()
+        self.current_path = os.path.join(self.directory, f"{self._next_sequence:020d}{JSONL_SUFFIX}")
+        self._next_sequence += 1
+        self._raw = open(self.current_path, "wb")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def sync(self) -> None:
+        if self._file is not None and self._raw is not None:
+            # makes everything written so far readable without closing gzip stream
+            self._file.flush()
+            os.fsync(self._raw.fileno())
+
+    def close(self) -> None:
+        if self._file is not None and self._raw is not None:
+            # gzip trailer is written on close
+            self._file.close()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+            self._file = None
+            self._raw = None
+            self.current_path = None
+
+
+class FileSpanExporter(SpanExporter):
+    """Span exporter writing batches to size- and time-rotated segment files, without collector."""
+
+    def __init__(self, config: FileExportConfig):
+        check_file_export_config(config)
+        self._config = config
+        self._writer: Union[SegmentWriter, JsonlSegmentWriter]
+        if config.format == "otlp":
+            self._writer = SegmentWriter(config.directory, config.segment_bytes)
+        else:
+            self._writer = JsonlSegmentWriter(config.directory, config.segment_bytes)
+        self._lock = threading.Lock()
+        self._segment_path: Optional[str] = None
+        self._segment_started = 0.0
+        self._synced = time.monotonic()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._config.format == "otlp":
+            payload = encode_spans(spans).SerializeToString()
+        else:
+            payload = "".join(span.to_json(indent=None) + "\n" for span in spans).encode("utf-8")
+        with self._lock:
+            now = time.monotonic()
+            segment_seconds = self._config.segment_seconds
+            if (
+                segment_seconds is not None
+                and self._writer.current_path is not None
+                and now - self._segment_started >= segment_seconds
+            ):
+                self._writer.rotate()
+            self._writer.append(payload)
+            if self._writer.current_path != self._segment_path:
+                self._segment_path = self._writer.current_path
+                self._segment_started = now
+            if now - self._synced >= self._config.fsync_interval:
+                self._writer.sync()
+                self._synced = now
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            self._writer.sync()
+            self._synced = time.monotonic()
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._writer.sync()
+            self._writer.close()
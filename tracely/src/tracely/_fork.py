@@ -0,0 +1,56 @@
+import logging
+import os
+import weakref
+from typing import Callable
+from typing import Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace import Span
+from opentelemetry.sdk.trace import SpanProcessor
+
+logger = logging.getLogger(__name__)
+
+_PROCESSORS: "weakref.WeakSet[ForkSafeSpanProcessor]" = weakref.WeakSet()
+
+
+class ForkSafeSpanProcessor(SpanProcessor):
+    """
+    Span processor built by factory, which is called again in child process after fork,
+    so the child gets its own export threads and connections instead of ones inherited from the parent.
+
+    Processor inherited from the parent is dropped without flushing: spans queued in it are exported by the parent.
+    """
+
+    def __init__(self, factory: Callable[[], SpanProcessor]):
+        self._factory = factory
+        self._processor = factory()
+        _PROCESSORS.add(self)
+
+    def reinit(self) -> None:
+        self._processor = self._factory()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self._processor.on_end(span)
+
+    def shutdown(self) -> None:
+        _PROCESSORS.discard(self)
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._processor.force_flush(timeout_millis)
+
+
+def _reinit_after_fork() -> None:
+    for processor in list(_PROCESSORS):
+        try:
+            processor.reinit()
+        except Exception:
+            logger.exception("tracely failed to reinitialize span processor after fork")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
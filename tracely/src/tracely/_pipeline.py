@@ -0,0 +1,163 @@
+"""
+Independent tracing pipelines.
+
+`init_tracing` configures tracing of the whole process. `TracelyPipeline` holds its own tracer provider
+and data context (export dataset, pricing, interceptors, sampling, serialization), so one process can trace
+calls to many projects. Traced calls pick the pipeline explicitly passed to `trace_event` / `create_trace_event`,
+then the one selected for current context with `TracelyPipeline.activate()`, then the global tracing.
+"""
+
+import contextlib
+import uuid
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from opentelemetry import trace
+
+from ._context import DataContext
+from ._context import UsageDetails
+from ._context import _selected_pipeline
+from ._context import mark_tracing_configured
+from ._env import _TRACE_ENABLED
+from ._export_config import ExportConfig
+from ._file_exporter import FileExportConfig
+from ._sampling import SamplingConfig
+from ._spool import SpoolConfig
+from ._stats import ExportStats
+from ._tail_sampling import TailSamplingConfig
+from ._tracer_provider import _create_tracer_provider
+from .context import create_trace_event
+from .decorators import trace_event
+from .interceptors import AnyInterceptor
+from .proxy import SpanObject
+from .serialization import SerializationConfig
+
+
+class TracelyPipeline:
+    """
+    Tracing pipeline with its own tracer provider, export dataset, pricing, interceptors and exporters.
+
+    Arguments are the same as of `init_tracing` (see it for details); the pipeline is never registered
+    as global OpenTelemetry provider and does not change tracing configured by `init_tracing`.
+    Export statistics of the pipeline are counted separately from `tracely.get_stats()`, see `get_stats`.
+
+    Example:
+        pipeline = TracelyPipeline(project_id=..., export_name="tenant-a")
+
+        @pipeline.trace_event()
+        def handle(request): ...
+
+        with pipeline.activate():
+            process(request)  # calls decorated with `tracely.trace_event()` are traced by the pipeline
+    """
+
+    provider: trace.TracerProvider
+    tracer: Optional[trace.Tracer]
+    data_context: DataContext
+    stats: ExportStats
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        exporter_type: Optional[str] = None,
+        api_key: Optional[str] = None,
+        project_id: Optional[Union[str, uuid.UUID]] = None,
+        export_name: Optional[str] = None,
+        *,
+        processor_type: str = "batch",
+        default_usage_details: Optional[UsageDetails] = None,
+        usage_details_by_model_id: Optional[Dict[str, UsageDetails]] = None,
+        interceptors: Optional[Sequence[AnyInterceptor]] = None,
+        sampling: Optional[SamplingConfig] = None,
+        tail_sampling: Optional[TailSamplingConfig] = None,
+        spool: Optional[SpoolConfig] = None,
+        export: Optional[ExportConfig] = None,
+        lazy: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 3600.0,
+        serialization: Optional[SerializationConfig] = None,
+        agent_socket: Optional[str] = None,
+        file_export: Optional[FileExportConfig] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.data_context = DataContext("<not_set>", "<not_set>")
+        self.stats = ExportStats()
+        if not (enabled if enabled is not None else _TRACE_ENABLED):
+            self.provider = trace.NoOpTracerProvider()
+            self.tracer = None
+            return
+        self.provider = _create_tracer_provider(
+            address,
+            exporter_type,
+            processor_type,
+            api_key,
+            project_id,
+            export_name,
+            default_usage_details,
+            usage_details_by_model_id,
+            interceptors,
+            sampling,
+            tail_sampling,
+            spool,
+            lazy,
+            cache_dir,
+            cache_ttl,
+            serialization,
+            agent_socket,
+            export,
+            file_export,
+            self.data_context,
+            self.stats,
+        )
+        self.tracer = self.provider.get_tracer("evidently")
+        mark_tracing_configured()
+
+    @contextlib.contextmanager
+    def activate(self) -> Generator["TracelyPipeline", None, None]:
+        """Trace calls in current context (thread or asyncio task) with this pipeline."""
+        token = _selected_pipeline.set(self)
+        try:
+            yield self
+        finally:
+            _selected_pipeline.reset(token)
+
+    def trace_event(
+        self,
+        span_name: Optional[str] = None,
+        track_args: Optional[List[str]] = None,
+        ignore_args: Optional[List[str]] = None,
+        track_output: Optional[bool] = True,
+        parse_output: Optional[bool] = True,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Same as `tracely.trace_event`, calls are always traced with this pipeline."""
+        return trace_event(span_name, track_args, ignore_args, track_output, parse_output, pipeline=self)
+
+    def create_trace_event(self, name: str, **params) -> ContextManager[SpanObject]:
+        """Same as `tracely.create_trace_event`, span is created with this pipeline."""
+        return create_trace_event(name, pipeline=self, **params)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "export_id": self.data_context.export_id,
+            "project_id": self.data_context.project_id,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Same as `tracely.get_stats`, for spans of this pipeline since it was created."""
+        return self.stats.snapshot()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        force_flush = getattr(self.provider, "force_flush", None)
+        return force_flush(timeout_millis) if force_flush is not None else True
+
+    def shutdown(self) -> None:
+        shutdown = getattr(self.provider, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
@@ -0,0 +1,100 @@
+"""
+Token prices resolved by model id.
+
+`usage_details_by_model_id` is compiled once at `init_tracing`: every model gets flat price tables
+(base and per tier, with `cached_input` falling back to `input` price), and model id lookups
+(exact, alias or prefix match, default) are memoized, so `update_usage` does single dict lookup
+to find prices and single pass over reported tokens to compute costs.
+"""
+
+import typing
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+if typing.TYPE_CHECKING:
+    from ._context import UsageDetails
+
+# bound of memoized model id lookups, model ids are usually few but may come from user input
+_MAX_RESOLVED = 1024
+_DEFAULT_MODEL_ID = "default"
+
+
+def _with_fallbacks(cost_per_token: Dict[str, float]) -> Dict[str, float]:
+    prices = dict(cost_per_token)
+    if "cached_input" not in prices and "input" in prices:
+        prices["cached_input"] = prices["input"]
+    return prices
+
+
+class ModelPrices:
+    """Compiled prices of single model."""
+
+    __slots__ = ("base", "tiers")
+
+    def __init__(self, details: "UsageDetails"):
+        self.base = _with_fallbacks(details.cost_per_token)
+        # highest threshold first, so the first matching tier is used
+        self.tiers: List[Tuple[int, Dict[str, float]]] = [
+            (tier.min_input_tokens, _with_fallbacks({**details.cost_per_token, **tier.cost_per_token}))
+            for tier in sorted(details.tiers, key=lambda tier: tier.min_input_tokens, reverse=True)
+        ]
+
+    def prices_for(self, tokens: Dict[str, int]) -> Dict[str, float]:
+        if self.tiers:
+            input_tokens = tokens.get("total_input")
+            if input_tokens is None:
+                input_tokens = tokens.get("input", 0) + tokens.get("cached_input", 0)
+            for min_input_tokens, prices in self.tiers:
+                if input_tokens >= min_input_tokens:
+                    return prices
+        return self.base
+
+    def costs(self, tokens: Dict[str, int]) -> Dict[str, float]:
+        prices = self.prices_for(tokens)
+        return {kind: prices[kind] * count for kind, count in tokens.items() if prices.get(kind)}
+
+
+class PricingTable:
+    """
+    Model id to prices mapping: exact id or alias, then the longest matching `prefix*`, then default prices.
+
+    Calls without model id use "default" model id entry if it is set, then default prices.
+    """
+
+    def __init__(
+        self,
+        default_usage_details: Optional["UsageDetails"] = None,
+        usage_details_by_model_id: Optional[Dict[str, "UsageDetails"]] = None,
+    ):
+        self._default = ModelPrices(default_usage_details) if default_usage_details is not None else None
+        self._exact: Dict[str, ModelPrices] = {}
+        self._prefixes: List[Tuple[str, ModelPrices]] = []
+        for model_id, details in (usage_details_by_model_id or {}).items():
+            prices = ModelPrices(details)
+            for name in (model_id, *details.aliases):
+                if name.endswith("*"):
+                    self._prefixes.append((name[:-1], prices))
+                else:
+                    self._exact[name] = prices
+        self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        self._resolved: Dict[str, Optional[ModelPrices]] = dict(self._exact)
+
+    def get(self, model_id: Optional[str] = None) -> Optional[ModelPrices]:
+        if model_id is None:
+            # calls without model id were priced with "default" entry of `usage_details_by_model_id` before
+            # model ids were supported, keep it taking precedence over `default_usage_details`
+            return self._exact.get(_DEFAULT_MODEL_ID, self._default)
+        try:
+            return self._resolved[model_id]
+        except KeyError:
+            pass
+        prices = self._default
+        for prefix, candidate in self._prefixes:
+            if model_id.startswith(prefix):
+                prices = candidate
+                break
+        if len(self._resolved) < len(self._exact) + _MAX_RESOLVED:
+            self._resolved[model_id] = prices
+        return prices
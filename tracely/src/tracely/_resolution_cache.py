@@ -0,0 +1,90 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ResolvedExport:
+    export_id: str
+    is_oss_mode: bool
+
+
+class ResolutionCache:
+    """
+    Local cache of resolved export dataset id and collector mode.
+
+    Each entry is stored in a separate file, written atomically, so concurrent processes
+    can safely share cache directory.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, address: str, project_id: str, export_name: str) -> str:
+        key = hashlib.sha256("\n".join((address, project_id, export_name)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key[:32]}.json")
+
+    def get(self, address: str, project_id: str, export_name: str) -> Optional[ResolvedExport]:
+        try:
+            with open(self._path(address, project_id, export_name)) as f:
+                data = json.load(f)
+            if time.time() - data["created_at"] > self.ttl:
+                return None
+            return ResolvedExport(export_id=data["export_id"], is_oss_mode=data["is_oss_mode"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, address: str, project_id: str, export_name: str, resolved: ResolvedExport) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({**dataclasses.asdict(resolved), "created_at": time.time()}, f)
+                os.replace(tmp_path, self._path(address, project_id, export_name))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning("tracely failed to write resolution cache: %s", e)
+
+    def invalidate(self, address: str, project_id: str, export_name: str) -> None:
+        try:
+            os.unlink(self._path(address, project_id, export_name))
+        except FileNotFoundError:
+            pass
+
+
+class CacheInvalidatingSpanExporter(SpanExporter):
+    """Span exporter which calls `invalidate` once wrapped exporter fails, so next start resolves export again."""
+
+    def __init__(self, exporter: SpanExporter, invalidate: Callable[[], None]):
+        self._exporter = exporter
+        self._invalidate: Optional[Callable[[], None]] = invalidate
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        result = self._exporter.export(spans)
+        if result == SpanExportResult.FAILURE and self._invalidate is not None:
+            self._invalidate()
+            self._invalidate = None
+        return result
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
@@ -1,36 +1,72 @@
+import contextvars
 from typing import Optional
+from typing import Tuple
 
+from opentelemetry.context import Context
+
+from ._context import DataContext
+from ._context import get_tracer
+from .proxy import NULL_SPAN
 from .proxy import SpanObject
 
 
 class RuntimeContext:
+    """
+    Holds current span for tracely.
+
+    Value is stored in a context variable, so each thread and asyncio task sees its own current span.
+    """
+
     def __init__(self):
-        self.span = None
+        self._span: contextvars.ContextVar[Optional[SpanObject]] = contextvars.ContextVar(
+            f"tracely_current_span_{id(self)}", default=None
+        )
 
-    def set_current_span(self, span: Optional[SpanObject]):
-        self.span = span
+    def set_current_span(self, span: Optional[SpanObject]) -> contextvars.Token:
+        return self._span.set(span)
 
     def get_current_span(self) -> Optional[SpanObject]:
-        return self.span
+        return self._span.get()
 
     def reset_span(self):
-        self.span = None
+        self._span.set(None)
 
 
 _DEFAULT_CONTEXT = RuntimeContext()
 
 
 def get_current_span(context: Optional[RuntimeContext] = None) -> Optional[SpanObject]:
+    """
+    Get span of current traced call.
+
+    Returns None outside of traced calls, or NullSpanObject (which ignores all writes)
+    if tracing is disabled or not initialized.
+    """
     if context is None:
-        return _DEFAULT_CONTEXT.get_current_span()
-    return context.get_current_span()
+        span = _DEFAULT_CONTEXT.get_current_span()
+    else:
+        span = context.get_current_span()
+    if span is None and get_tracer() is None:
+        return NULL_SPAN
+    return span
 
 
-def set_current_span(span: Optional[SpanObject], context: Optional[RuntimeContext] = None):
+def get_parent(span: Optional[SpanObject], data_context: DataContext) -> Tuple[Optional[SpanObject], Optional[Context]]:
+    """
+    Parent span object and OpenTelemetry context for new span of pipeline with given data context.
+
+    Current span of another pipeline is not used as parent: new span starts a trace of its own
+    (in empty context), so traces and usage totals do not cross projects.
+    """
+    if span is not None and span._data_context is not data_context:
+        return None, Context()
+    return span, None
+
+
+def set_current_span(span: Optional[SpanObject], context: Optional[RuntimeContext] = None) -> contextvars.Token:
     if context is None:
-        _DEFAULT_CONTEXT.set_current_span(span)
-    else:
-        context.set_current_span(span)
+        return _DEFAULT_CONTEXT.set_current_span(span)
+    return context.set_current_span(span)
 
 
 def reset_span(context: Optional[RuntimeContext] = None):
@@ -0,0 +1,72 @@
+import dataclasses
+import random
+import threading
+import time
+from typing import Optional
+
+import opentelemetry.trace
+from opentelemetry.context import Context
+
+from .proxy import NullSpanObject
+from .proxy import SpanObject
+
+
+@dataclasses.dataclass
+class SamplingConfig:
+    """
+    Head sampling configuration.
+
+    Args:
+        ratio: share of root calls to trace, from 0.0 to 1.0
+        rate_limit: maximum number of root calls traced per second, if set
+        parent_based: if set, nested calls follow decision made for their parent
+                      (including parents bound with `bind_to_trace` or created by other OpenTelemetry instrumentation)
+    """
+
+    ratio: float = 1.0
+    rate_limit: Optional[float] = None
+    parent_based: bool = True
+
+
+class Sampler:
+    def __init__(self, config: SamplingConfig):
+        if not 0.0 <= config.ratio <= 1.0:
+            raise ValueError(f"Sampling ratio should be between 0.0 and 1.0, got {config.ratio}")
+        if config.rate_limit is not None and config.rate_limit <= 0:
+            raise ValueError(f"Sampling rate limit should be positive, got {config.rate_limit}")
+        self.ratio = config.ratio
+        self.rate_limit = config.rate_limit
+        self.parent_based = config.parent_based
+        self._lock = threading.Lock()
+        self._capacity = max(config.rate_limit or 0.0, 1.0)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+
+    def should_sample(self, parent: Optional[SpanObject] = None, context: Optional[Context] = None) -> bool:
+        """
+        Decide whether call with given parent (see `get_parent`) is traced.
+
+        `context` is OpenTelemetry context the span would be started in, current one if not set.
+        """
+        if self.parent_based:
+            if parent is not None:
+                return not isinstance(parent, NullSpanObject)
+            otel_parent = opentelemetry.trace.get_current_span(context).get_span_context()
+            if otel_parent.is_valid:
+                return otel_parent.trace_flags.sampled
+        if self.ratio < 1.0 and random.random() >= self.ratio:
+            return False
+        if self.rate_limit is not None:
+            return self._acquire()
+        return True
+
+    def _acquire(self) -> bool:
+        assert self.rate_limit is not None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
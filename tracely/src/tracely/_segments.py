@@ -0,0 +1,94 @@
+"""
+Append-only segment files with length-prefixed records.
+
+Each segment starts with `SEGMENT_MAGIC` followed by records of 4-byte big-endian length and payload.
+Segments are named by increasing sequence number, so lexical order is write order.
+"""
+
+import os
+import struct
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+SEGMENT_MAGIC = b"TRACELY1"
+SEGMENT_SUFFIX = ".seg"
+_LENGTH = struct.Struct(">I")
+
+
+def list_segments(directory: str) -> List[str]:
+    """Paths of segments in directory in write order."""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(SEGMENT_SUFFIX)]
+
+
+def read_records(path: str, offset: int = 0) -> Iterator[Tuple[bytes, int]]:
+    """
+    Read records from segment starting at given offset.
+
+    Yields record payload and offset of the next record. Stops at the end of file
+    or at incomplete record (which may still be written).
+    """
+    with open(path, "rb") as f:
+        if offset == 0:
+            if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise ValueError(f"{path} is not a tracely segment file")
+            offset = len(SEGMENT_MAGIC)
+        else:
+            f.seek(offset)
+        while True:
+            header = f.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            offset += _LENGTH.size + length
+            yield payload, offset
+
+
+class SegmentWriter:
+    """Appends records to the newest segment in directory, starting a new one when size limit is reached."""
+
+    def __init__(self, directory: str, max_segment_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        existing = list_segments(directory)
+        self._next_sequence = int(os.path.basename(existing[-1])[: -len(SEGMENT_SUFFIX)]) + 1 if existing else 0
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self.current_path: Optional[str] = None
+
+    def append(self, payload: bytes) -> None:
+        if self._file is None or self._size + _LENGTH.size + len(payload) > self.max_segment_bytes:
+            self.rotate()
+        assert self._file is not None
+        self._file.write(_LENGTH.pack(len(payload)) + payload)
+        self._file.flush()
+        self._size += _LENGTH.size + len(payload)
+
+    def rotate(self) -> None:
+        # finished segment is durable before writing continues in the next one
+        self.sync()
+        self.close()
+        self.current_path = os.path.join(self.directory, f"{self._next_sequence:020d}{SEGMENT_SUFFIX}")
+        self._next_sequence += 1
+        self._file = open(self.current_path, "wb")
+        self._file.write(SEGMENT_MAGIC)
+        self._file.flush()
+        self._size = len(SEGMENT_MAGIC)
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.current_path = None
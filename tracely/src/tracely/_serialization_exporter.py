@@ -0,0 +1,129 @@
+"""
+Deferred serialization of arguments and results (`SerializationConfig(deferred=True)`).
+
+Traced calls capture values as `DeferredValue` and keep them in `DeferredValues` of their pipeline
+until exporter, running in export thread of batch processor, serializes them into span attributes.
+"""
+
+import threading
+import weakref
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from opentelemetry.attributes import BoundedAttributes
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace import Span as SdkSpan
+from opentelemetry.sdk.trace import SpanLimits
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.trace import Span
+
+from ._spans import replace_span
+from .serialization import AttributeSerializer
+from .serialization import DeferredValue
+
+
+class DeferredValues:
+    """
+    Values captured by traced calls, waiting for serialization by `SerializingSpanExporter`.
+
+    Values are kept by span context until span is finished, then by finished span object
+    (which is passed through span processors to exporter), so values of spans dropped before export
+    (export queue overflow, tail sampling) are released together with the spans.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int], Dict[str, DeferredValue]] = {}
+        self._finished: "weakref.WeakKeyDictionary[ReadableSpan, Dict[str, DeferredValue]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def attach(self, span: Span, values: Dict[str, DeferredValue]) -> bool:
+        """Keep values captured for span until it is exported, returns False if span is not recorded."""
+        if not span.is_recording():
+            return False
+        context = span.get_span_context()
+        with self._lock:
+            self._pending[(context.trace_id, context.span_id)] = values
+        return True
+
+    def finish(self, span: ReadableSpan) -> None:
+        """Move values of finished span to the span object passed to span processors."""
+        if span.context is None:
+            return
+        with self._lock:
+            values = self._pending.pop((span.context.trace_id, span.context.span_id), None)
+            if values is not None:
+                self._finished[span] = values
+
+    def get(self, span: ReadableSpan) -> Optional[Dict[str, DeferredValue]]:
+        with self._lock:
+            return self._finished.get(span)
+
+
+class DeferredValuesSpanProcessor(SpanProcessor):
+    """Span processor handing values captured for finished spans over to `SerializingSpanExporter`."""
+
+    def __init__(self, processor: SpanProcessor, deferred_values: DeferredValues):
+        self._processor = processor
+        self._deferred_values = deferred_values
+
+    def on_start(self, span: SdkSpan, parent_context: Optional[Context] = None) -> None:
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self._deferred_values.finish(span)
+        self._processor.on_end(span)
+
+    def shutdown(self) -> None:
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._processor.force_flush(timeout_millis)
+
+
+class SerializingSpanExporter(SpanExporter):
+    """
+    Span exporter serializing values captured by traced calls before passing spans to wrapped exporter.
+
+    Serialized attributes are subject to the same `limits` as attributes set on spans.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        serializer: AttributeSerializer,
+        deferred_values: DeferredValues,
+        limits: Optional[SpanLimits] = None,
+    ):
+        self._exporter = exporter
+        self._serializer = serializer
+        self._deferred_values = deferred_values
+        self._limits = limits or SpanLimits()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self._exporter.export([self._serialize(span) for span in spans])
+
+    def _serialize(self, span: ReadableSpan) -> ReadableSpan:
+        deferred = self._deferred_values.get(span)
+        if not deferred:
+            return span
+        values = dict(span.attributes or {})
+        for name, value in deferred.items():
+            values.update(self._serializer.resolve(name, value))
+        attributes = BoundedAttributes(
+            self._limits.max_span_attributes, values, immutable=True, max_value_len=self._limits.max_attribute_length
+        )
+        attributes.dropped += span.dropped_attributes
+        return replace_span(span, attributes=attributes)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
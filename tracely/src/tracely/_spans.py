@@ -0,0 +1,41 @@
+from typing import Any
+from typing import Sequence
+from typing import TypeVar
+
+from opentelemetry.attributes import BoundedAttributes
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.util import BoundedList
+
+T = TypeVar("T")
+
+
+def _bounded(items: Sequence[T], dropped: int) -> BoundedList:
+    bounded = BoundedList.from_seq(None, items)
+    bounded.dropped = dropped
+    return bounded
+
+
+def replace_span(span: ReadableSpan, **changes: Any) -> ReadableSpan:
+    """
+    Copy of finished span with given `ReadableSpan` fields (e.g. `resource`, `attributes`) replaced.
+
+    Numbers of attributes, events and links dropped by span limits are kept.
+    """
+    attributes = BoundedAttributes(attributes=span.attributes)
+    attributes.dropped = span.dropped_attributes
+    fields = {
+        "name": span.name,
+        "context": span.context,
+        "parent": span.parent,
+        "resource": span.resource,
+        "attributes": attributes,
+        "events": _bounded(span.events, span.dropped_events),
+        "links": _bounded(span.links, span.dropped_links),
+        "kind": span.kind,
+        "status": span.status,
+        "start_time": span.start_time,
+        "end_time": span.end_time,
+        "instrumentation_scope": span.instrumentation_scope,
+    }
+    fields.update(changes)
+    return ReadableSpan(**fields)
@@ -0,0 +1,261 @@
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import requests
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from ._delivery import Delivery
+from ._delivery import post_with_retries
+from ._delivery import prepare_body
+from ._delivery import write_json_atomic
+from ._segments import SegmentWriter
+from ._segments import list_segments
+from ._segments import read_records
+
+logger = logging.getLogger(__name__)
+
+_CHECKPOINT_FILE = "checkpoint.json"
+# suffix of segments which cannot be read (e.g. left empty by a crash), they are kept for inspection but not sent
+CORRUPT_SUFFIX = ".corrupt"
+# forked processes spool into "pid-<pid>" subdirectories, spool adopted by another process after its owner
+# exited is renamed to "pid-<adopter>-from-<pid>"
+_PROCESS_PREFIX = "pid-"
+_ADOPTED_SEPARATOR = "-from-"
+_ORPHAN_SCAN_INTERVAL = 10.0
+
+
+@dataclasses.dataclass
+class SpoolConfig:
+    """
+    Persistent export queue configuration.
+
+    Args:
+        directory: directory to keep spooled spans in, should not be shared between processes
+        max_bytes: disk budget, oldest segments are dropped when it is exceeded
+        segment_bytes: size of a single segment file
+        max_backoff: maximum delay in seconds between retries when collector is unavailable
+    """
+
+    directory: str
+    max_bytes: int = 1024 * 1024 * 1024
+    segment_bytes: int = 16 * 1024 * 1024
+    max_backoff: float = 60.0
+
+
+def process_spool_config(config: SpoolConfig, pid: int) -> SpoolConfig:
+    """Spool of forked process in its own subdirectory, so processes do not share segment files."""
+    return dataclasses.replace(config, directory=os.path.join(config.directory, f"{_PROCESS_PREFIX}{pid}"))
+
+
+def _spool_owner(name: str) -> Optional[int]:
+    """Process id owning spool subdirectory with given name, None if it is not a process spool."""
+    if not name.startswith(_PROCESS_PREFIX):
+        return None
+    try:
+        return int(name[len(_PROCESS_PREFIX) :].split(_ADOPTED_SEPARATOR)[0])
+    except ValueError:
+        return None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # process exists but belongs to other user
+        return True
+    return True
+
+
+class SpoolSpanExporter(SpanExporter):
+    """
+    Span exporter that writes encoded OTLP batches to segment files on disk,
+    background thread sends them to collector and resumes from last checkpoint after restart.
+
+    If `orphans_directory` is set, spools of exited processes in its `pid-<pid>` subdirectories
+    (see `process_spool_config`) are adopted and sent by this exporter as well, so spans of restarted
+    forked workers are not left on disk.
+    """
+
+    def __init__(
+        self,
+        config: SpoolConfig,
+        endpoint: str,
+        session: requests.Session,
+        timeout: float = 10.0,
+        compression: str = "none",
+        orphans_directory: Optional[str] = None,
+    ):
+        self._config = config
+        self._orphans_directory = orphans_directory
+        self._endpoint = endpoint
+        self._session = session
+        self._timeout = timeout
+        self._compression = compression
+        self._writer = SegmentWriter(config.directory, config.segment_bytes)
+        self._lock = threading.Lock()
+        self._has_data = threading.Event()
+        self._idle = threading.Event()
+        self._stop = threading.Event()
+        self._sender = threading.Thread(target=self._run, name="tracely-spool-sender", daemon=True)
+        self._sender.start()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        payload = encode_spans(spans).SerializeToString()
+        with self._lock:
+            self._writer.append(payload)
+            self._enforce_budget()
+        self._idle.clear()
+        self._has_data.set()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self._has_data.set()
+        return self._idle.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._has_data.set()
+        self._sender.join(self._timeout)
+        with self._lock:
+            self._writer.close()
+
+    def _enforce_budget(self) -> None:
+        segments = list_segments(self._config.directory)
+        total = sum(os.path.getsize(segment) for segment in segments)
+        dropped = 0
+        for segment in segments:
+            if total <= self._config.max_bytes or segment == self._writer.current_path:
+                break
+            total -= os.path.getsize(segment)
+            os.remove(segment)
+            dropped += 1
+        if dropped:
+            logger.warning(
+                "tracely spool exceeded %d bytes, dropped %d oldest segments", self._config.max_bytes, dropped
+            )
+
+    def _read_checkpoint(self, directory: str) -> Tuple[Optional[str], int]:
+        try:
+            with open(os.path.join(directory, _CHECKPOINT_FILE)) as f:
+                data = json.load(f)
+            return data["segment"], data["offset"]
+        except (OSError, ValueError, KeyError):
+            return None, 0
+
+    def _write_checkpoint(self, directory: str, segment: str, offset: int) -> None:
+        write_json_atomic(os.path.join(directory, _CHECKPOINT_FILE), {"segment": segment, "offset": offset})
+
+    def _run(self) -> None:
+        next_scan = 0.0
+        while not self._stop.is_set():
+            try:
+                sent = self._drain(self._config.directory, self._writer)
+                if self._orphans_directory is not None and time.monotonic() >= next_scan:
+                    next_scan = time.monotonic() + _ORPHAN_SCAN_INTERVAL
+                    sent = self._adopt_orphans(self._orphans_directory) or sent
+            except Exception:
+                # sender should outlive unexpected errors, otherwise spool only fills up until restart
+                logger.exception("tracely spool sender failed, retrying")
+                sent = False
+            if not sent:
+                self._idle.set()
+                self._has_data.wait(1.0)
+                self._has_data.clear()
+
+    def _adopt_orphans(self, root: str) -> bool:
+        """Send spools of exited processes, returns True if anything was sent."""
+        sent = False
+        pid = os.getpid()
+        for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+            path = os.path.join(root, name)
+            owner = _spool_owner(name)
+            if owner is None or path == self._config.directory or not os.path.isdir(path):
+                continue
+            if owner != pid:
+                if _process_alive(owner):
+                    continue
+                # rename is atomic, so only one of the live processes adopts the spool
+                claimed = os.path.join(root, f"{_PROCESS_PREFIX}{pid}{_ADOPTED_SEPARATOR}{name.split('-')[-1]}")
+                try:
+                    os.rename(path, claimed)
+                except OSError:
+                    continue
+                logger.info("tracely spool adopted spool of exited process %s", name)
+                path = claimed
+            sent = self._drain(path, None) or sent
+            if self._stop.is_set():
+                return sent
+            if not list_segments(path):
+                try:
+                    os.remove(os.path.join(path, _CHECKPOINT_FILE))
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    # unreadable segments are kept for inspection
+                    pass
+        return sent
+
+    def _drain(self, directory: str, writer: Optional[SegmentWriter]) -> bool:
+        """
+        Send all records spooled in directory, returns True if anything was sent.
+
+        Segment currently written by `writer` is kept, other segments are removed once sent.
+        """
+        sent = False
+        checkpoint_segment, offset = self._read_checkpoint(directory)
+        for segment in list_segments(directory):
+            name = os.path.basename(segment)
+            if checkpoint_segment is not None and name < checkpoint_segment:
+                os.remove(segment)
+                continue
+            position = offset if name == checkpoint_segment else 0
+            with self._lock:
+                # segment that is not written to anymore can be removed once it is read to the end
+                active = writer is not None and segment == writer.current_path
+            try:
+                for payload, position in read_records(segment, position):
+                    if not self._send(payload):
+                        return sent
+                    sent = True
+                    self._write_checkpoint(directory, name, position)
+            except FileNotFoundError:
+                # segment was dropped to keep disk budget
+                continue
+            except ValueError as e:
+                if active:
+                    return sent
+                logger.error("tracely spool skipped unreadable segment %s: %s", segment, e)
+                os.replace(segment, segment + CORRUPT_SUFFIX)
+                continue
+            if active:
+                return sent
+            os.remove(segment)
+        return sent
+
+    def _send(self, payload: bytes) -> bool:
+        """Send single record with retries, returns False if spool is stopping."""
+        body, headers = prepare_body(payload, self._compression == "gzip")
+        result = post_with_retries(
+            lambda: self._session.post(self._endpoint, data=body, headers=headers, timeout=self._timeout),
+            "tracely spool",
+            max_retries=None,
+            backoff=min(1.0, self._config.max_backoff),
+            max_backoff=self._config.max_backoff,
+            wait=self._stop.wait,
+            stopped=self._stop.is_set,
+        )
+        return result is not Delivery.FAILED
@@ -0,0 +1,290 @@
+"""
+Self-telemetry of the export pipeline: span counters, export queue depth, batch sizes,
+export latency and HTTP errors, available with `tracely.get_stats()`.
+"""
+
+import bisect
+import collections
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import requests
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace import Span
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of histogram buckets, last bucket is unbounded
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS: Tuple[float, ...] = (1, 8, 32, 128, 512, 2048, 8192)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {"count": self.count, "sum": self.sum, "max": self.max, "buckets": buckets}
+
+
+class _Counter:
+    """
+    Counter incremented for every span without taking a lock.
+
+    `next()` of `itertools.count` is a single C call, so unlike `value += 1` concurrent increments
+    are never lost. The count has no way to be read without advancing it, so a read is `next()` too:
+    the counter remembers how many times it was read and subtracts these extra counts.
+    Reads must not race each other, so `value` is called with `ExportStats` lock held.
+    """
+
+    __slots__ = ("_count", "_reads")
+
+    def __init__(self):
+        self._count = itertools.count()
+        self._reads = 0
+
+    def increment(self) -> None:
+        next(self._count)
+
+    def value(self) -> int:
+        value = next(self._count) - self._reads
+        self._reads += 1
+        return value
+
+
+_all_stats: "weakref.WeakSet[ExportStats]" = weakref.WeakSet()
+
+
+class ExportStats:
+    """
+    Counters of the export pipeline, updated by `StatsSpanProcessor`, `StatsSpanExporter` and session hook.
+
+    Tracing configured by `init_tracing` uses module level `_stats`, every `TracelyPipeline` has its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: "weakref.WeakSet[SpanProcessor]" = weakref.WeakSet()
+        self.reset()
+        _all_stats.add(self)
+
+    def reset(self) -> None:
+        with self._lock:
+            # updated for every span, so incremented without taking the lock
+            self.spans_started = _Counter()
+            self.spans_ended = _Counter()
+            self.spans_dropped = _Counter()
+            self.spans_exported = 0
+            self.spans_failed = 0
+            self.batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+            self.export_latency = _Histogram(LATENCY_BUCKETS)
+            self.http_errors: Dict[int, int] = {}
+
+    def register_queue(self, processor: SpanProcessor) -> None:
+        self._queues.add(processor)
+
+    def queue_depth(self) -> int:
+        depth = 0
+        for processor in list(self._queues):
+            queue = _find_queue(processor)
+            if queue is not None:
+                depth += len(queue)
+        return depth
+
+    def record_export(self, size: int, latency: float, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.spans_exported += size
+            else:
+                self.spans_failed += size
+            self.batch_sizes.record(size)
+            self.export_latency.record(latency)
+
+    def record_response(self, response: requests.Response, *args, **kwargs) -> None:
+        if response.status_code >= 400:
+            with self._lock:
+                self.http_errors[response.status_code] = self.http_errors.get(response.status_code, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "spans_started": self.spans_started.value(),
+                "spans_ended": self.spans_ended.value(),
+                "spans_exported": self.spans_exported,
+                "spans_failed": self.spans_failed,
+                "spans_dropped": self.spans_dropped.value(),
+                "queue_depth": self.queue_depth(),
+                "batch_size": self.batch_sizes.snapshot(),
+                "export_latency": self.export_latency.snapshot(),
+                "http_errors": dict(self.http_errors),
+            }
+
+
+def _find_queue(processor: Any) -> Optional[Deque]:
+    """Queue of OpenTelemetry batch processor (its location differs between SDK versions)."""
+    processor = getattr(processor, "_batch_processor", processor)
+    queue = getattr(processor, "_queue", None)
+    if queue is None:
+        queue = getattr(processor, "queue", None)
+    return queue if isinstance(queue, collections.deque) else None
+
+
+_stats = ExportStats()
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Statistics of the export pipeline of `init_tracing` since it was called (or since fork in child process),
+    pipelines created with `TracelyPipeline` count their spans separately (see `TracelyPipeline.get_stats`):
+    - spans_started, spans_ended: spans started and finished (after tail sampling) in this process
+    - spans_exported, spans_failed: spans passed to exporter successfully or with failure
+    - spans_dropped: spans dropped because export queue was full
+    - queue_depth: number of spans waiting in export queue
+    - batch_size, export_latency: histograms of exported batch sizes and export call duration in seconds
+    - http_errors: number of HTTP error responses from collector by status code
+    """
+    return _stats.snapshot()
+
+
+class StatsSpanProcessor(SpanProcessor):
+    """Span processor counting started and ended spans and spans dropped by the wrapped batch processor."""
+
+    def __init__(self, processor: SpanProcessor, stats: ExportStats):
+        self._processor = processor
+        self._stats = stats
+        self._queue = _find_queue(processor)
+        stats.register_queue(processor)
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._stats.spans_started.increment()
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        stats = self._stats
+        queue = self._queue
+        stats.spans_ended.increment()
+        # batch processor silently drops oldest span when its queue is full
+        if queue is not None and queue.maxlen is not None and len(queue) >= queue.maxlen:
+            stats.spans_dropped.increment()
+        self._processor.on_end(span)
+
+    def shutdown(self) -> None:
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._processor.force_flush(timeout_millis)
+
+
+class StatsSpanExporter(SpanExporter):
+    """Span exporter recording batch sizes, latency and result of wrapped exporter calls."""
+
+    def __init__(self, exporter: SpanExporter, stats: ExportStats):
+        self._exporter = exporter
+        self._stats = stats
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        start = time.perf_counter()
+        result = SpanExportResult.FAILURE
+        try:
+            result = self._exporter.export(spans)
+            return result
+        finally:
+            self._stats.record_export(len(spans), time.perf_counter() - start, result == SpanExportResult.SUCCESS)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+
+class StatsLogger:
+    """Background thread logging export statistics every `interval` seconds."""
+
+    def __init__(self, stats: ExportStats, interval: float):
+        self._stats = stats
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tracely-stats", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            stats = self._stats.snapshot()
+            latency = stats["export_latency"]
+            logger.info(
+                "tracely stats: %s",
+                json.dumps(
+                    {
+                        "started": stats["spans_started"],
+                        "ended": stats["spans_ended"],
+                        "exported": stats["spans_exported"],
+                        "failed": stats["spans_failed"],
+                        "dropped": stats["spans_dropped"],
+                        "queue_depth": stats["queue_depth"],
+                        "avg_batch_size": round(stats["batch_size"]["sum"] / max(stats["batch_size"]["count"], 1), 1),
+                        "avg_export_latency": round(latency["sum"] / max(latency["count"], 1), 4),
+                        "http_errors": stats["http_errors"],
+                    }
+                ),
+            )
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_loggers: List[StatsLogger] = []
+
+
+def start_stats_logger(interval: float) -> None:
+    """Log export statistics periodically, replacing logger started by previous `init_tracing` call."""
+    stop_stats_logger()
+    _loggers.append(StatsLogger(_stats, interval))
+
+
+def stop_stats_logger() -> None:
+    while _loggers:
+        _loggers.pop().stop()
+
+
+def _reinit_after_fork() -> None:
+    for stats in list(_all_stats):
+        # lock could be held by other thread of the parent at the moment of fork
+        stats._lock = threading.Lock()
+        stats.reset()
+    if _loggers:
+        start_stats_logger(_loggers[-1]._interval)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
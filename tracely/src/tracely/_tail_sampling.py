@@ -0,0 +1,124 @@
+import collections
+import dataclasses
+import random
+import threading
+from typing import List
+from typing import Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace import Span
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.trace import StatusCode
+
+
+@dataclasses.dataclass
+class TailSamplingConfig:
+    """
+    Tail sampling configuration: spans are buffered per trace and the decision to export
+    is made when the root span of the trace ends.
+
+    Args:
+        keep_errors: export traces where any span has ERROR status
+        latency_threshold: export traces where root span took longer than this number of seconds
+        cost_budget: export traces where sum of all `cost.*` attributes (except roll-up `cost.total.*`) is above this value
+        ratio: share of traces not matching any rule to export anyway
+        max_traces: maximum number of unfinished traces kept in memory,
+                    oldest trace is evaluated with the spans it has when the limit is reached
+        max_spans_per_trace: maximum number of spans buffered for a single trace, extra spans are dropped
+    """
+
+    keep_errors: bool = True
+    latency_threshold: Optional[float] = None
+    cost_budget: Optional[float] = None
+    ratio: float = 0.0
+    max_traces: int = 10000
+    max_spans_per_trace: int = 1000
+
+
+class _TraceBuffer:
+    __slots__ = ("spans", "has_error", "cost")
+
+    def __init__(self):
+        self.spans: List[ReadableSpan] = []
+        self.has_error = False
+        self.cost = 0.0
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Span processor that buffers finished spans per trace and passes whole traces
+    matching `TailSamplingConfig` rules to the wrapped processor.
+    """
+
+    def __init__(self, processor: SpanProcessor, config: Optional[TailSamplingConfig] = None):
+        self._processor = processor
+        self._config = config or TailSamplingConfig()
+        self._traces: "collections.OrderedDict[int, _TraceBuffer]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context is None:
+            return
+        trace_id = span.context.trace_id
+        is_root = span.parent is None or span.parent.is_remote
+        to_export: List[ReadableSpan] = []
+        with self._lock:
+            buffer = self._traces.get(trace_id)
+            if buffer is None:
+                buffer = self._traces[trace_id] = _TraceBuffer()
+                if len(self._traces) > self._config.max_traces:
+                    _, evicted = self._traces.popitem(last=False)
+                    if self._should_export(evicted, None):
+                        to_export.extend(evicted.spans)
+            if len(buffer.spans) < self._config.max_spans_per_trace:
+                buffer.spans.append(span)
+            if span.status.status_code == StatusCode.ERROR:
+                buffer.has_error = True
+            if span.attributes:
+                for key, value in span.attributes.items():
+                    # roll-up totals of the root span repeat costs of its children
+                    if (
+                        key.startswith("cost.")
+                        and not key.startswith("cost.total.")
+                        and isinstance(value, (int, float))
+                    ):
+                        buffer.cost += value
+            if is_root:
+                del self._traces[trace_id]
+                if self._should_export(buffer, span):
+                    to_export.extend(buffer.spans)
+        for exported in to_export:
+            self._processor.on_end(exported)
+
+    def _should_export(self, buffer: _TraceBuffer, root: Optional[ReadableSpan]) -> bool:
+        config = self._config
+        if config.keep_errors and buffer.has_error:
+            return True
+        if config.cost_budget is not None and buffer.cost > config.cost_budget:
+            return True
+        if (
+            config.latency_threshold is not None
+            and root is not None
+            and root.start_time is not None
+            and root.end_time is not None
+            and (root.end_time - root.start_time) / 1e9 > config.latency_threshold
+        ):
+            return True
+        return config.ratio > 0 and random.random() < config.ratio
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pending = list(self._traces.values())
+            self._traces.clear()
+        for buffer in pending:
+            if self._should_export(buffer, None):
+                for span in buffer.spans:
+                    self._processor.on_end(span)
+        self._processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._processor.force_flush(timeout_millis)
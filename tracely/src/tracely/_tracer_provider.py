@@ -1,8 +1,12 @@
+import dataclasses
+import os
 import urllib.parse
 import uuid
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 import opentelemetry.trace
@@ -10,11 +14,14 @@ import requests
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanLimits
+from opentelemetry.sdk.trace import SpanProcessor
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SimpleSpanProcessor
 from opentelemetry.trace import NonRecordingSpan
 from opentelemetry.trace import SpanContext
 from opentelemetry.trace import TraceFlags
 
+from ._context import DataContext
 from ._context import UsageDetails
 from ._context import _data_context
 from ._context import set_tracer
@@ -25,10 +32,51 @@ from ._env import (
     _TRACE_COLLECTOR_EXPORT_NAME,
     _TRACE_COLLECTOR_TYPE,
     _TRACE_COLLECTOR_PROJECT_ID,
+    _TRACE_CACHE_DIR,
+    _TRACE_ENABLED,
+    _TRACE_AGENT_SOCKET,
+    _TRACE_STATS_LOG_INTERVAL,
+    parse_env,
 )
+from ._agent import LocalAgentSpanExporter
+from ._deferred_exporter import DeferredSpanExporter
+from ._export_config import ExportConfig
+from ._export_config import check_export_config
+from ._file_exporter import FileExportConfig
+from ._file_exporter import FileSpanExporter
+from ._file_exporter import check_file_export_config
+from ._fork import ForkSafeSpanProcessor
+from ._pricing import PricingTable
+from ._resolution_cache import CacheInvalidatingSpanExporter
+from ._resolution_cache import ResolutionCache
+from ._resolution_cache import ResolvedExport
+from ._sampling import Sampler
+from ._serialization_exporter import DeferredValues
+from ._serialization_exporter import DeferredValuesSpanProcessor
+from ._serialization_exporter import SerializingSpanExporter
+from ._sampling import SamplingConfig
+from ._spool import SpoolConfig
+from ._stats import ExportStats
+from ._stats import StatsSpanExporter
+from ._stats import StatsSpanProcessor
+from ._stats import _stats
+from ._stats import start_stats_logger
+from ._stats import stop_stats_logger
+from ._spool import SpoolSpanExporter
+from ._spool import process_spool_config
+from ._tail_sampling import TailSamplingConfig
+from ._tail_sampling import TailSamplingSpanProcessor
 from .evidently_cloud_client import EvidentlyCloudClient
 from .evidently_oss_client import EvidentlyOSSClient
-from .interceptors import Interceptor
+from .interceptors import AnyInterceptor
+from .serialization import AttributeSerializer
+from .serialization import SerializationConfig
+
+_EXPORTER_TYPES = ("grpc", "http", "console", "memory", "local-agent", "file")
+# exporter types which do not need collector, so export dataset is not resolved
+# (local agent and `tracely upload` of files resolve export dataset themselves)
+_LOCAL_EXPORTER_TYPES = ("console", "memory", "local-agent", "file")
+_PROCESSOR_TYPES = ("batch", "simple", "tail")
 
 
 def _create_tracer_provider(
@@ -40,7 +88,19 @@ def _create_tracer_provider(
     export_name: Optional[str] = None,
     default_usage_details: Optional[UsageDetails] = None,
     usage_details_by_model_id: Optional[Dict[str, UsageDetails]] = None,
-    interceptors: Optional[List[Interceptor]] = None,
+    interceptors: Optional[Sequence[AnyInterceptor]] = None,
+    sampling: Optional[SamplingConfig] = None,
+    tail_sampling: Optional[TailSamplingConfig] = None,
+    spool: Optional[SpoolConfig] = None,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_ttl: float = 3600.0,
+    serialization: Optional[SerializationConfig] = None,
+    agent_socket: Optional[str] = None,
+    export: Optional[ExportConfig] = None,
+    file_export: Optional[FileExportConfig] = None,
+    data_context: Optional[DataContext] = None,
+    stats: ExportStats = _stats,
 ) -> trace.TracerProvider:
     """
     Creates Evidently telemetry tracer provider which would be used for sending traces.
@@ -50,6 +110,8 @@ def _create_tracer_provider(
         api_key: authorization api key for Evidently tracing
         project_id: id of project in Evidently Cloud
         export_name: string name of exported data, all data with same id would be grouped into single dataset
+        data_context: context to configure (export id, pricing, interceptors, ...), global one if not set
+        stats: export statistics updated by the created processors
     """
 
     _address = address or _TRACE_COLLECTOR_ADDRESS
@@ -82,120 +144,284 @@ def _create_tracer_provider(
             "or EVIDENTLY_TRACE_COLLECTOR_PROJECT_ID env variable"
         )
 
-    # Detect OSS mode by checking if /api/users/login endpoint exists
-    # Cloud has this endpoint, OSS doesn't
-    is_oss_mode = False
-    if _exporter_type not in ("console", "inmemory"):
-        try:
-            # Try to check if cloud login endpoint exists
-            test_session = requests.Session()
-            login_url = urllib.parse.urljoin(_address, "/api/users/login")
-            response = test_session.get(
-                login_url,
-                headers={"X-Evidently-Token": _api_key or "test"},
-                timeout=2,
-            )
-            # If we get a response (even 401/403), the endpoint exists (Cloud mode)
-            # Only 404 means the endpoint doesn't exist (OSS mode)
-            if response.status_code == 404:
-                is_oss_mode = True
-        except (requests.exceptions.HTTPError, requests.exceptions.RequestException, requests.exceptions.Timeout):
-            # If request fails (network error, timeout, etc.), assume OSS mode
-            is_oss_mode = True
-
-    if _exporter_type not in ("console", "inmemory"):
-        # Use same logic for both OSS and Cloud, only difference is the client
-        client: Union[EvidentlyOSSClient, EvidentlyCloudClient]
-        if is_oss_mode:
-            client = EvidentlyOSSClient(_address, _api_key)
+    sampler = Sampler(sampling) if sampling is not None else None
+    _export = export or ExportConfig()
+    check_export_config(_export)
+    if spool is not None and _exporter_type != "http":
+        raise ValueError(f"Persistent spool is supported only with http exporter type, got {_exporter_type}")
+    if _exporter_type not in _EXPORTER_TYPES:
+        raise ValueError("Unexpected value of exporter type")
+    if (file_export is not None) != (_exporter_type == "file"):
+        raise ValueError(f"File export configuration should be set only with file exporter type, got {_exporter_type}")
+    if file_export is not None:
+        check_file_export_config(file_export)
+    if processor_type not in _PROCESSOR_TYPES:
+        raise ValueError(f"Unexpected processor type: {processor_type}. Expected values: batch, simple or tail")
+
+    if data_context is None:
+        data_context = _data_context
+    data_context.default_usage_details = default_usage_details
+    data_context.usage_details_by_model_id = usage_details_by_model_id
+    data_context.pricing = PricingTable(default_usage_details, usage_details_by_model_id)
+    data_context.interceptors = interceptors or ()
+    data_context.sampler = sampler
+    data_context.serializer = serializer = AttributeSerializer(serialization)
+    data_context.deferred_values = deferred_values = DeferredValues() if serializer.config.deferred else None
+
+    _cache_dir = cache_dir or _TRACE_CACHE_DIR
+    cache = ResolutionCache(_cache_dir, cache_ttl) if _cache_dir else None
+    # resolution is kept, so processors rebuilt in forked child processes do not query collector again
+    resolution: List[Tuple[ResolvedExport, bool]] = []
+    parent_pid = os.getpid()
+
+    def resolve_once() -> Tuple[ResolvedExport, bool]:
+        if resolution:
+            return resolution[0]
+        resolved = ResolvedExport(export_id="<not_set>", is_oss_mode=False)
+        from_cache = False
+        if _exporter_type not in _LOCAL_EXPORTER_TYPES:
+            cached = cache.get(_address, _project_id, _export_name) if cache is not None else None
+            if cached is not None:
+                resolved, from_cache = cached, True
+            else:
+                resolved = _resolve_export(_address, _api_key, _project_id, _export_name)
+                if cache is not None:
+                    cache.put(_address, _project_id, _export_name, resolved)
+            data_context.export_id = uuid.UUID(resolved.export_id)
+            data_context.project_id = uuid.UUID(_project_id)
         else:
-            client = EvidentlyCloudClient(_address, _api_key)
+            data_context.export_id = "<not_set>"
+            data_context.project_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
+        resolution.append((resolved, from_cache))
+        return resolved, from_cache
 
-        datasets_response: requests.Response = client.request(
-            "/api/datasets",
-            "GET",
-            query_params={"project_id": _project_id, "source_type": ["tracing"]},
+    def create_exporter() -> SpanExporter:
+        resolved, from_cache = resolve_once()
+        _spool = spool
+        if spool is not None and os.getpid() != parent_pid:
+            # forked processes should not share spool directory with parent
+            _spool = process_spool_config(spool, os.getpid())
+        _file_export = file_export
+        if file_export is not None and os.getpid() != parent_pid:
+            _file_export = dataclasses.replace(
+                file_export, directory=os.path.join(file_export.directory, f"pid-{os.getpid()}")
+            )
+        exporter = _create_exporter(
+            _exporter_type,
+            _address,
+            _api_key,
+            resolved.is_oss_mode,
+            _spool,
+            agent_socket or _TRACE_AGENT_SOCKET,
+            _export,
+            _file_export,
+            spool_orphans_directory=spool.directory if spool is not None else None,
+            stats=stats,
         )
-        datasets = datasets_response.json()["datasets"]
-        _export_id = None
-        for dataset in datasets:
-            if dataset["name"] == _export_name:
-                _export_id = dataset["id"]
-                break
-        if _export_id is None:
-            resp: requests.Response = client.request(
-                "/api/datasets/tracing",
-                "POST",
-                query_params={"project_id": _project_id},
-                body={"name": _export_name},
+        if cache is not None and from_cache:
+            exporter = CacheInvalidatingSpanExporter(
+                exporter,
+                lambda: cache.invalidate(_address, _project_id, _export_name),
             )
+        return exporter
 
-            _export_id = resp.json()["dataset_id"]
-        _data_context.export_id = uuid.UUID(_export_id)
-        _data_context.project_id = uuid.UUID(_project_id)
-    else:
-        _data_context.export_id = "<not_set>"
-        _data_context.project_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
-    _data_context.default_usage_details = default_usage_details
-    _data_context.usage_details_by_model_id = usage_details_by_model_id
-    _data_context.interceptors = interceptors or []
-
-    tracer_provider = TracerProvider(
-        resource=Resource.create(
+    def create_resource() -> Resource:
+        return Resource.create(
             {
-                "evidently.export_id": str(_data_context.export_id),
-                "evidently.project_id": str(_data_context.project_id),
+                "evidently.export_id": str(data_context.export_id),
+                "evidently.project_id": str(data_context.project_id),
             }
         )
+
+    def resolve() -> Tuple[SpanExporter, Resource]:
+        exporter = create_exporter()
+        return exporter, create_resource()
+
+    if lazy:
+        data_context.export_id = "<pending>"
+        resource = Resource.create({"evidently.export_id": "<pending>", "evidently.project_id": str(_project_id)})
+    else:
+        resolve_once()
+        resource = create_resource()
+
+    # deferred attributes are serialized in exporter within the same limits as set by the provider
+    span_limits = SpanLimits()
+    tracer_provider = TracerProvider(resource=resource, span_limits=span_limits)
+
+    def create_processor() -> SpanProcessor:
+        # called again in forked child process, so it should not block: lazy exporter is created
+        # in background thread and export resolved by the parent is reused
+        exporter: SpanExporter
+        if lazy:
+            exporter = DeferredSpanExporter(resolve, resource)
+        else:
+            exporter = create_exporter()
+        if deferred_values is None:
+            return _create_span_processor(processor_type, exporter, tail_sampling, _export, stats)
+        exporter = SerializingSpanExporter(exporter, serializer, deferred_values, span_limits)
+        return DeferredValuesSpanProcessor(
+            _create_span_processor(processor_type, exporter, tail_sampling, _export, stats), deferred_values
+        )
+
+    tracer_provider.add_span_processor(ForkSafeSpanProcessor(create_processor))
+    return tracer_provider
+
+
+def _resolve_export(address: str, api_key: str, project_id: str, export_name: str) -> ResolvedExport:
+    is_oss_mode = _detect_oss_mode(address, api_key)
+    export_id = _resolve_export_id(_create_client(address, api_key, is_oss_mode), project_id, export_name)
+    return ResolvedExport(export_id=export_id, is_oss_mode=is_oss_mode)
+
+
+def _detect_oss_mode(address: str, api_key: str) -> bool:
+    """
+    Detect OSS mode by checking if /api/users/login endpoint exists
+    Cloud has this endpoint, OSS doesn't
+    """
+    try:
+        # Try to check if cloud login endpoint exists
+        test_session = requests.Session()
+        login_url = urllib.parse.urljoin(address, "/api/users/login")
+        response = test_session.get(
+            login_url,
+            headers={"X-Evidently-Token": api_key or "test"},
+            timeout=2,
+        )
+        # If we get a response (even 401/403), the endpoint exists (Cloud mode)
+        # Only 404 means the endpoint doesn't exist (OSS mode)
+        return response.status_code == 404
+    except (requests.exceptions.HTTPError, requests.exceptions.RequestException, requests.exceptions.Timeout):
+        # If request fails (network error, timeout, etc.), assume OSS mode
+        return True
+
+
+def _create_client(address: str, api_key: str, is_oss_mode: bool) -> Union[EvidentlyOSSClient, EvidentlyCloudClient]:
+    # Use same logic for both OSS and Cloud, only difference is the client
+    if is_oss_mode:
+        return EvidentlyOSSClient(address, api_key)
+    return EvidentlyCloudClient(address, api_key)
+
+
+def _resolve_export_id(
+    client: Union[EvidentlyOSSClient, EvidentlyCloudClient],
+    project_id: str,
+    export_name: str,
+) -> str:
+    """Find id of tracing dataset with given name in project, create dataset if it does not exist."""
+    datasets_response: requests.Response = client.request(
+        "/api/datasets",
+        "GET",
+        query_params={"project_id": project_id, "source_type": ["tracing"]},
+    )
+    datasets = datasets_response.json()["datasets"]
+    for dataset in datasets:
+        if dataset["name"] == export_name:
+            return dataset["id"]
+    resp: requests.Response = client.request(
+        "/api/datasets/tracing",
+        "POST",
+        query_params={"project_id": project_id},
+        body={"name": export_name},
     )
+    return resp.json()["dataset_id"]
+
 
+def _create_exporter(
+    exporter_type: str,
+    address: str,
+    api_key: str,
+    is_oss_mode: bool,
+    spool: Optional[SpoolConfig],
+    agent_socket: str,
+    export: ExportConfig,
+    file_export: Optional[FileExportConfig] = None,
+    spool_orphans_directory: Optional[str] = None,
+    stats: ExportStats = _stats,
+) -> SpanExporter:
     exporter: SpanExporter
-    if _exporter_type == "grpc":
+    if exporter_type == "grpc":
+        import grpc  # type: ignore[import-untyped]
         from opentelemetry.exporter.otlp.proto.grpc import trace_exporter as grpc_exporter
 
         headers = []
-        if _api_key:
+        if api_key:
             if is_oss_mode:
-                headers = [("evidently-secret", _api_key)]
+                headers = [("evidently-secret", api_key)]
             else:
-                headers = [("authorization", _api_key)]
+                headers = [("authorization", api_key)]
         exporter = grpc_exporter.OTLPSpanExporter(
-            _address,
+            address,
             headers=headers,
+            timeout=export.export_timeout,
+            compression=grpc.Compression.Gzip if export.compression == "gzip" else grpc.Compression.NoCompression,
         )
-    elif _exporter_type == "http":
+    elif exporter_type == "http":
+        from opentelemetry.exporter.otlp.proto.http import Compression
         from opentelemetry.exporter.otlp.proto.http import trace_exporter as http_exporter
 
-        if is_oss_mode:
-            oss_client = EvidentlyOSSClient(_address, _api_key)
-            exporter = http_exporter.OTLPSpanExporter(
-                urllib.parse.urljoin(_address, "/api/v1/traces"),
-                session=oss_client.session(),
+        session = _create_client(address, api_key, is_oss_mode).session()
+        session.hooks["response"].append(stats.record_response)
+        if spool is not None:
+            exporter = SpoolSpanExporter(
+                spool,
+                urllib.parse.urljoin(address, "/api/v1/traces"),
+                session,
+                timeout=export.export_timeout,
+                compression=export.compression,
+                orphans_directory=spool_orphans_directory,
             )
         else:
-            cloud = EvidentlyCloudClient(_address, _api_key)
             exporter = http_exporter.OTLPSpanExporter(
-                urllib.parse.urljoin(_address, "/api/v1/traces"),
-                session=cloud.session(),
+                urllib.parse.urljoin(address, "/api/v1/traces"),
+                session=session,
+                timeout=export.export_timeout,
+                compression=Compression.Gzip if export.compression == "gzip" else Compression.NoCompression,
             )
-    elif _exporter_type == "console":
+    elif exporter_type == "local-agent":
+        exporter = LocalAgentSpanExporter(agent_socket)
+    elif exporter_type == "file":
+        assert file_export is not None
+        exporter = FileSpanExporter(file_export)
+    elif exporter_type == "console":
         from opentelemetry.sdk.trace.export import ConsoleSpanExporter
 
         exporter = ConsoleSpanExporter()
-    elif _exporter_type == "memory":
+    elif exporter_type == "memory":
         from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
         exporter = InMemorySpanExporter()
     else:
         raise ValueError("Unexpected value of exporter type")
+    return exporter
+
+
+def _create_span_processor(
+    processor_type: str,
+    exporter: SpanExporter,
+    tail_sampling: Optional[TailSamplingConfig],
+    export: ExportConfig,
+    stats: ExportStats,
+) -> SpanProcessor:
+    exporter = StatsSpanExporter(exporter, stats)
     if processor_type == "batch":
-        tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
-    elif processor_type == "simple":
-        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
-    else:
-        raise ValueError(f"Unexpected processor type: {processor_type}. Expected values: batch or simple")
-    set_tracer(tracer_provider.get_tracer("evidently"))
-    return tracer_provider
+        return StatsSpanProcessor(_create_batch_processor(exporter, export), stats)
+    if processor_type == "simple":
+        return StatsSpanProcessor(SimpleSpanProcessor(exporter), stats)
+    if processor_type == "tail":
+        return TailSamplingSpanProcessor(
+            StatsSpanProcessor(_create_batch_processor(exporter, export), stats), tail_sampling
+        )
+    raise ValueError(f"Unexpected processor type: {processor_type}. Expected values: batch, simple or tail")
+
+
+def _create_batch_processor(exporter: SpanExporter, export: ExportConfig) -> BatchSpanProcessor:
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=export.max_queue_size,
+        schedule_delay_millis=export.schedule_delay * 1000,
+        max_export_batch_size=export.max_batch_size,
+        export_timeout_millis=export.export_timeout * 1000,
+    )
 
 
 def init_tracing(
@@ -209,13 +435,27 @@ def init_tracing(
     processor_type: str = "batch",
     default_usage_details: Optional[UsageDetails] = None,
     usage_details_by_model_id: Optional[Dict[str, UsageDetails]] = None,
-    interceptors: Optional[List[Interceptor]] = None,
+    interceptors: Optional[Sequence[AnyInterceptor]] = None,
+    sampling: Optional[SamplingConfig] = None,
+    tail_sampling: Optional[TailSamplingConfig] = None,
+    spool: Optional[SpoolConfig] = None,
+    export: Optional[ExportConfig] = None,
+    lazy: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_ttl: float = 3600.0,
+    serialization: Optional[SerializationConfig] = None,
+    agent_socket: Optional[str] = None,
+    file_export: Optional[FileExportConfig] = None,
+    stats_log_interval: Optional[float] = None,
+    enabled: Optional[bool] = None,
 ) -> trace.TracerProvider:
     """
     Initialize Evidently tracing
     Args:
         address: address of collector service
-        exporter_type: type of exporter to use "grpc" or "http"
+        exporter_type: type of exporter to use "grpc" or "http",
+                       "local-agent" to send spans to `tracely agent` process running on the same host,
+                       "file" to write spans to local files (see `file_export`) without collector
         api_key: authorization api key for Evidently tracing
         project_id: id of project in Evidently Cloud
         export_name: string name of exported data, all data with same id would be grouped into single dataset
@@ -225,11 +465,46 @@ def init_tracing(
         processor_type: (default: batch) type of processor to use:
                         'batch' - upload traces in batches once in several seconds in separate thread
                         'simple' - upload traces synchronously as it is reported, can cause performance issues.
-        default_usage_details: usage data for tokens
-        usage_details_by_model_id: usage data for tokens by model id (if provided)
-        interceptors: list of interceptors to use
+                        'tail' - buffer spans per trace and upload in batches only traces
+                                 matching `tail_sampling` rules (errors, slow or expensive traces).
+        default_usage_details: usage data for tokens, used for calls without model id or with unknown model id
+        usage_details_by_model_id: usage data for tokens by model id (if provided),
+                                   ids ending with `*` match model ids by prefix (e.g. `gpt-4.1-*`)
+        interceptors: list of interceptors to use (`Interceptor` or `AsyncInterceptor` for coroutine functions)
+        sampling: head sampling configuration, if not set - all calls are traced.
+                  Calls that are not sampled run without creating spans.
+        tail_sampling: rules for 'tail' processor type, if not set - only traces with errors are uploaded.
+        spool: persistent export queue configuration (http exporter only), if set - spans are written
+               to disk first and uploaded by background thread, surviving collector outages and restarts.
+        export: batching, queue size, request timeout and compression settings of http and grpc export,
+                if not set - taken from EVIDENTLY_TRACE_* env variables (see `ExportConfig`).
+        lazy: if set - return immediately and detect collector mode and export dataset in background thread,
+              spans created meanwhile are buffered (up to limit) and uploaded once export dataset is resolved.
+        cache_dir: directory to cache detected collector mode and export dataset id in,
+                   so next process starts do not query collector (can be set with EVIDENTLY_TRACE_CACHE_DIR).
+                   Cached entry is removed if upload of traces fails.
+        cache_ttl: time in seconds cached entries are valid for.
+        serialization: size limits for arguments and results recorded in spans.
+        agent_socket: path of local agent socket for "local-agent" exporter type
+                      (default: EVIDENTLY_TRACE_AGENT_SOCKET env variable or /tmp/tracely-agent.sock).
+        file_export: directory, format and rotation of segment files for "file" exporter type.
+        stats_log_interval: if set - log export statistics (see `get_stats`) every given number of seconds
+                            (can be set with EVIDENTLY_TRACE_STATS_LOG_INTERVAL).
+        enabled: if set to False - tracing is disabled: decorated functions are called directly
+                 and `create_trace_event` yields span object which ignores all writes.
+                 Defaults to EVIDENTLY_TRACE_ENABLED env variable (enabled if not set).
 
     """
+    if not (enabled if enabled is not None else _TRACE_ENABLED):
+        set_tracer(None)
+        stop_stats_logger()
+        return trace.NoOpTracerProvider()
+    _stats_log_interval = (
+        stats_log_interval
+        if stats_log_interval is not None
+        else parse_env("EVIDENTLY_TRACE_STATS_LOG_INTERVAL", _TRACE_STATS_LOG_INTERVAL, float)
+    )
+    _stats.reset()
     provider = _create_tracer_provider(
         address,
         exporter_type,
@@ -240,8 +515,23 @@ def init_tracing(
         default_usage_details,
         usage_details_by_model_id,
         interceptors,
+        sampling,
+        tail_sampling,
+        spool,
+        lazy,
+        cache_dir,
+        cache_ttl,
+        serialization,
+        agent_socket,
+        export,
+        file_export,
     )
 
+    if _stats_log_interval > 0:
+        start_stats_logger(_stats_log_interval)
+    else:
+        stop_stats_logger()
+
     if as_global:
         trace.set_tracer_provider(provider)
         set_tracer(trace.get_tracer("evidently"))
@@ -0,0 +1,241 @@
+"""
+Bulk upload of span segment files written by `exporter_type="file"` (or left by spool) to collector.
+
+Segments are uploaded in parallel by a bounded pool of workers, each with its own session (connection).
+Records of a segment are merged into larger requests and sent in order; offset of the last uploaded
+record is kept in `<segment>.uploaded` file next to the segment, so interrupted upload resumes
+where it stopped and already uploaded segments are skipped.
+
+The newest segment of each directory may still be appended to by a running file exporter, so it is
+uploaded up to its current end but not marked complete (nor deleted) unless writers have stopped.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import requests
+from google.protobuf.message import DecodeError  # type: ignore[import-untyped]
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from ._delivery import Delivery
+from ._delivery import merge_requests
+from ._delivery import post_with_retries
+from ._delivery import prepare_body
+from ._delivery import write_json_atomic
+from ._segments import SEGMENT_SUFFIX
+from ._segments import read_records
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".uploaded"
+
+
+@dataclasses.dataclass
+class UploadConfig:
+    """
+    Bulk upload configuration.
+
+    Args:
+        concurrency: number of segments uploaded in parallel (and of open connections)
+        max_batch_bytes: maximum size of single request before compression
+        compression: compress requests with gzip
+        max_retries: number of retries of failed request before upload of segment is stopped
+        backoff: delay in seconds before the first retry, doubled after each retry up to `max_backoff`
+        max_backoff: maximum delay in seconds between retries
+        timeout: timeout in seconds of single request
+        delete: remove segments (and their checkpoints) once they are uploaded
+        writers_stopped: file exporters writing to the directory have stopped, so the newest segment
+                         of each directory is complete as well
+    """
+
+    concurrency: int = 8
+    max_batch_bytes: int = 4 * 1024 * 1024
+    compression: bool = True
+    max_retries: int = 5
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    timeout: float = 30.0
+    delete: bool = False
+    writers_stopped: bool = False
+
+
+def find_segments(directory: str) -> List[str]:
+    """Segment files in directory and its subdirectories (of forked processes), in write order."""
+    segments: List[str] = []
+    for root, _, files in os.walk(directory):
+        segments.extend(os.path.join(root, name) for name in files if name.endswith(SEGMENT_SUFFIX))
+    return sorted(segments)
+
+
+def read_checkpoint(segment: str) -> Tuple[int, bool]:
+    """Offset of the next record to upload and whether upload of segment has finished."""
+    try:
+        with open(segment + CHECKPOINT_SUFFIX) as f:
+            data = json.load(f)
+        return data["offset"], data["complete"]
+    except (OSError, ValueError, KeyError):
+        return 0, False
+
+
+def _write_checkpoint(segment: str, offset: int, complete: bool) -> None:
+    write_json_atomic(segment + CHECKPOINT_SUFFIX, {"offset": offset, "complete": complete})
+
+
+def _count_spans(request: ExportTraceServiceRequest) -> int:
+    return sum(len(scope_spans.spans) for resource in request.resource_spans for scope_spans in resource.scope_spans)
+
+
+class _Report:
+    def __init__(self, segments: int):
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self.counters: Dict[str, int] = {
+            "segments": segments,
+            "segments_uploaded": 0,
+            "segments_skipped": 0,
+            # newest segments uploaded up to their current end, which may still be appended to
+            "segments_active": 0,
+            "segments_failed": 0,
+            "spans": 0,
+            "requests": 0,
+            "retries": 0,
+            "bytes_sent": 0,
+        }
+
+    def add(self, **counters: int) -> None:
+        with self._lock:
+            for key, value in counters.items():
+                self.counters[key] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.monotonic() - self._start
+            return {
+                **self.counters,
+                "seconds": round(elapsed, 2),
+                "spans_per_second": round(self.counters["spans"] / max(elapsed, 1e-9)),
+                "megabytes_per_second": round(self.counters["bytes_sent"] / max(elapsed, 1e-9) / 1024 / 1024, 2),
+            }
+
+
+class SegmentUploader:
+    """Uploads segment files to collector traces endpoint, setting `resource_attributes` on all spans."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        session_factory: Callable[[], requests.Session],
+        resource_attributes: Dict[str, str],
+        config: Optional[UploadConfig] = None,
+    ):
+        self.config = config or UploadConfig()
+        if self.config.concurrency < 1:
+            raise ValueError(f"Upload concurrency should be positive, got {self.config.concurrency}")
+        self._endpoint = endpoint
+        self._session_factory = session_factory
+        self._resource_attributes = resource_attributes
+        self._sessions = threading.local()
+
+    def upload(self, directory: str) -> Dict[str, Any]:
+        """Upload all segments in directory, returns report with counters and throughput."""
+        segments = find_segments(directory)
+        # segments are sorted, so the last one of each directory is the newest
+        newest = set({os.path.dirname(segment): segment for segment in segments}.values())
+        report = _Report(len(segments))
+        with ThreadPoolExecutor(self.config.concurrency, thread_name_prefix="tracely-upload") as executor:
+            for _ in executor.map(
+                lambda segment: self._upload_segment(
+                    segment, report, active=segment in newest and not self.config.writers_stopped
+                ),
+                segments,
+            ):
+                pass
+        return report.snapshot()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = self._sessions.session = self._session_factory()
+        return session
+
+    def _batches(self, segment: str, offset: int) -> Iterator[Tuple[List[bytes], int]]:
+        """Records of segment grouped into batches up to `max_batch_bytes`, with offset after each batch."""
+        batch: List[bytes] = []
+        size = 0
+        for payload, position in read_records(segment, offset):
+            if batch and size + len(payload) > self.config.max_batch_bytes:
+                yield batch, offset
+                batch, size = [], 0
+            batch.append(payload)
+            size += len(payload)
+            offset = position
+        if batch:
+            yield batch, offset
+
+    def _upload_segment(self, segment: str, report: _Report, active: bool) -> None:
+        offset, complete = read_checkpoint(segment)
+        if complete:
+            report.add(segments_skipped=1)
+            self._cleanup(segment)
+            return
+        try:
+            for batch, next_offset in self._batches(segment, offset):
+                request = merge_requests(batch, self._resource_attributes)
+                if not self._send(request.SerializeToString(), report):
+                    report.add(segments_failed=1)
+                    logger.error("tracely upload of %s stopped at offset %d", segment, offset)
+                    return
+                report.add(spans=_count_spans(request))
+                offset = next_offset
+                _write_checkpoint(segment, offset, complete=False)
+        except (ValueError, DecodeError) as e:
+            # not a segment file or corrupt record, segment is left for inspection
+            report.add(segments_failed=1)
+            logger.error("tracely upload of %s failed: %s", segment, e)
+            return
+        if active:
+            report.add(segments_active=1)
+            logger.info("tracely uploaded %s up to offset %d, it may still be written to", segment, offset)
+            return
+        _write_checkpoint(segment, offset, complete=True)
+        report.add(segments_uploaded=1)
+        logger.info("tracely uploaded %s", segment)
+        self._cleanup(segment)
+
+    def _cleanup(self, segment: str) -> None:
+        if self.config.delete:
+            for path in (segment, segment + CHECKPOINT_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _send(self, body: bytes, report: _Report) -> bool:
+        body, headers = prepare_body(body, self.config.compression)
+        attempts = 0
+
+        def post() -> requests.Response:
+            nonlocal attempts
+            attempts += 1
+            report.add(requests=1, bytes_sent=len(body))
+            return self._session().post(self._endpoint, data=body, headers=headers, timeout=self.config.timeout)
+
+        result = post_with_retries(
+            post,
+            "tracely upload",
+            max_retries=self.config.max_retries,
+            backoff=self.config.backoff,
+            max_backoff=self.config.max_backoff,
+        )
+        report.add(retries=attempts - 1)
+        return result is Delivery.SENT
@@ -0,0 +1,155 @@
+import argparse
+import json
+import logging
+import signal
+import threading
+import urllib.parse
+import uuid
+from typing import List
+from typing import Optional
+
+from ._agent import AgentConfig
+from ._agent import TracelyAgent
+from ._env import _EVIDENTLY_API_KEY
+from ._env import _TRACE_AGENT_SOCKET
+from ._env import _TRACE_COLLECTOR_ADDRESS
+from ._env import _TRACE_COLLECTOR_API_KEY
+from ._env import _TRACE_COLLECTOR_EXPORT_NAME
+from ._env import _TRACE_COLLECTOR_PROJECT_ID
+from ._tracer_provider import _create_client
+from ._tracer_provider import _resolve_export
+from ._upload import SegmentUploader
+from ._upload import UploadConfig
+from .fake_collector import FakeCollector
+from .fake_collector import FakeCollectorConfig
+
+
+def _add_collector_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--address", default=_TRACE_COLLECTOR_ADDRESS, help="collector address")
+    parser.add_argument("--api-key", default=_TRACE_COLLECTOR_API_KEY or _EVIDENTLY_API_KEY, help="API key")
+    parser.add_argument("--project-id", default=_TRACE_COLLECTOR_PROJECT_ID, help="project id")
+    parser.add_argument("--export-name", default=_TRACE_COLLECTOR_EXPORT_NAME, help="export dataset name")
+
+
+def _check_collector_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if not args.export_name:
+        parser.error("export name is required (--export-name or EVIDENTLY_TRACE_COLLECTOR_EXPORT_NAME env variable)")
+    try:
+        args.project_id = str(uuid.UUID(args.project_id))
+    except ValueError:
+        parser.error("valid project id is required (--project-id or EVIDENTLY_TRACE_COLLECTOR_PROJECT_ID env variable)")
+
+
+def _run_agent(args: argparse.Namespace) -> int:
+    resolved = _resolve_export(args.address, args.api_key, args.project_id, args.export_name)
+    agent = TracelyAgent(
+        urllib.parse.urljoin(args.address, "/api/v1/traces"),
+        _create_client(args.address, args.api_key, resolved.is_oss_mode).session(),
+        {"evidently.export_id": resolved.export_id, "evidently.project_id": args.project_id},
+        AgentConfig(
+            socket_path=args.socket,
+            flush_interval=args.flush_interval,
+            max_batch_bytes=args.max_batch_bytes,
+            compression=not args.no_compression,
+        ),
+    )
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    agent.start()
+    logging.info("tracely agent listening on %s, forwarding to %s", args.socket, args.address)
+    stopped.wait()
+    agent.stop()
+    return 0
+
+
+def _run_upload(args: argparse.Namespace) -> int:
+    resolved = _resolve_export(args.address, args.api_key, args.project_id, args.export_name)
+    uploader = SegmentUploader(
+        urllib.parse.urljoin(args.address, "/api/v1/traces"),
+        lambda: _create_client(args.address, args.api_key, resolved.is_oss_mode).session(),
+        {"evidently.export_id": resolved.export_id, "evidently.project_id": args.project_id},
+        UploadConfig(
+            concurrency=args.concurrency,
+            max_batch_bytes=args.max_batch_bytes,
+            compression=not args.no_compression,
+            max_retries=args.max_retries,
+            delete=args.delete,
+            writers_stopped=args.writers_stopped,
+        ),
+    )
+    report = uploader.upload(args.directory)
+    logging.info("tracely upload report: %s", json.dumps(report))
+    return 1 if report["segments_failed"] else 0
+
+
+def _run_fake_collector(args: argparse.Namespace) -> int:
+    collector = FakeCollector(
+        FakeCollectorConfig(
+            host=args.host,
+            port=args.port,
+            grpc_port=args.grpc_port,
+            mode=args.mode,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            max_spans_per_second=args.max_spans_per_second,
+        )
+    )
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    collector.start()
+    logging.info("fake collector listening on %s (gRPC: %s)", collector.address, collector.grpc_address)
+    stopped.wait()
+    collector.stop()
+    logging.info("fake collector stats: %s", json.dumps(collector.stats()))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="tracely")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    agent_parser = commands.add_parser("agent", help="forward spans from local worker processes to collector")
+    _add_collector_arguments(agent_parser)
+    agent_parser.add_argument("--socket", default=_TRACE_AGENT_SOCKET, help="path of Unix domain socket")
+    agent_parser.add_argument("--flush-interval", type=float, default=1.0, help="seconds between forwarded batches")
+    agent_parser.add_argument("--max-batch-bytes", type=int, default=4 * 1024 * 1024, help="maximum batch size")
+    agent_parser.add_argument("--no-compression", action="store_true", help="do not gzip forwarded batches")
+
+    upload_parser = commands.add_parser("upload", help="upload span files written by file exporter to collector")
+    upload_parser.add_argument("directory", help="directory with segment files")
+    _add_collector_arguments(upload_parser)
+    upload_parser.add_argument("--concurrency", type=int, default=8, help="number of parallel uploads")
+    upload_parser.add_argument("--max-batch-bytes", type=int, default=4 * 1024 * 1024, help="maximum request size")
+    upload_parser.add_argument("--no-compression", action="store_true", help="do not gzip requests")
+    upload_parser.add_argument("--max-retries", type=int, default=5, help="retries of failed request")
+    upload_parser.add_argument("--delete", action="store_true", help="remove uploaded segment files")
+    upload_parser.add_argument(
+        "--writers-stopped",
+        action="store_true",
+        help="processes writing segments have stopped, upload and complete the newest segment of each directory",
+    )
+
+    collector_parser = commands.add_parser("fake-collector", help="run local stand-in collector for testing")
+    collector_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    collector_parser.add_argument("--port", type=int, default=8000, help="HTTP port")
+    collector_parser.add_argument("--grpc-port", type=int, help="gRPC port, gRPC is disabled if not set")
+    collector_parser.add_argument("--mode", choices=("cloud", "oss"), default="oss", help="collector type")
+    collector_parser.add_argument("--latency", type=float, default=0.0, help="seconds added to traces requests")
+    collector_parser.add_argument("--error-rate", type=float, default=0.0, help="share of failed traces requests")
+    collector_parser.add_argument("--max-spans-per-second", type=float, help="throughput cap")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "agent":
+        _check_collector_arguments(agent_parser, args)
+        return _run_agent(args)
+    if args.command == "upload":
+        _check_collector_arguments(upload_parser, args)
+        if args.concurrency < 1:
+            upload_parser.error("--concurrency should be positive")
+        return _run_upload(args)
+    if args.command == "fake-collector":
+        return _run_fake_collector(args)
+    return 1
@@ -1,41 +1,74 @@
+import typing
 from contextlib import contextmanager
 from typing import Optional
 from typing import Generator
 
 import opentelemetry.sdk.trace
 
-from ._context import get_tracer
+from ._context import _selected_pipeline
 from ._context import create_context
+from ._context import get_pipeline_state
 from ._runtime_context import get_current_span
+from ._runtime_context import get_parent
 from ._runtime_context import set_current_span
+from .proxy import NULL_SPAN
 from .proxy import SpanObject
+from .proxy import get_null_span
+
+if typing.TYPE_CHECKING:
+    from ._pipeline import TracelyPipeline
 
 
 @contextmanager
-def create_trace_event(name: str, **params) -> Generator[SpanObject, None, None]:
+def create_trace_event(
+    name: str, *, pipeline: Optional["TracelyPipeline"] = None, **params
+) -> Generator[SpanObject, None, None]:
     """
     Create a span with given name.
 
     Args:
         name: name of the span
+        pipeline: pipeline to create span with, it is also selected for traced calls inside the block.
+                  If not set - pipeline selected with `TracelyPipeline.activate()` or tracing configured by `init_tracing`
         **params: attributes to set for span
 
     Returns:
         span object to work with
     """
-    _tracer = get_tracer()
+    if pipeline is not None:
+        token = _selected_pipeline.set(pipeline)
+        try:
+            with create_trace_event(name, **params) as span:
+                yield span
+        finally:
+            _selected_pipeline.reset(token)
+        return
+    _tracer, data_context = get_pipeline_state()
     if _tracer is None:
-        raise ValueError("tracer not initialized")
-    with _tracer.start_as_current_span(f"{name}") as span:
-        obj = SpanObject(span)
-        prev_span = get_current_span()
+        # tracing is disabled or not initialized
+        yield NULL_SPAN
+        return
+    prev_span = get_current_span()
+    parent, otel_context = get_parent(prev_span, data_context)
+    sampler = data_context.sampler
+    if sampler is not None and not sampler.should_sample(parent, otel_context):
+        null_span = get_null_span(data_context)
+        set_current_span(null_span)
+        try:
+            yield null_span
+        finally:
+            set_current_span(prev_span)
+        return
+    with _tracer.start_as_current_span(f"{name}", context=otel_context) as span:
+        obj = SpanObject(span, buffered=True, parent=parent, data_context=data_context)
         set_current_span(obj)
 
         try:
             yield obj
         finally:
             for attr, value in params.items():
-                span.set_attribute(attr, value)
+                obj.set_attribute(attr, data_context.serializer.capture(value))
+            obj.flush()
             set_current_span(prev_span)
 
 
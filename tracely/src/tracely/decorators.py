@@ -1,38 +1,410 @@
+import asyncio
+import contextlib
+import contextvars
+import inspect
+import time
 from functools import wraps
-from inspect import BoundArguments, iscoroutinefunction, Parameter, Signature
-from typing import Any, Callable, List, Optional
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction, Parameter, Signature
+import typing
+from typing import Any, Callable, List, Optional, Tuple
 
+from opentelemetry import context as context_api
+from opentelemetry.trace import Span
 from opentelemetry.trace import StatusCode
+from opentelemetry.trace import set_span_in_context
 
-from ._context import get_interceptors
-from ._context import get_tracer
+from . import _context
+from ._context import DataContext
+from ._context import _selected_pipeline
+from ._context import get_pipeline_state
 from .proxy import SpanObject
+from .proxy import get_null_span
 from .proxy import set_result
 from ._runtime_context import get_current_span
+from ._runtime_context import get_parent
 from ._runtime_context import set_current_span
+from .interceptors import AsyncHookStages
 from .interceptors import InterceptorContext
+from .interceptors import InterceptorHooks
 
+if typing.TYPE_CHECKING:
+    from ._pipeline import TracelyPipeline
 
-def _fill_span_from_signature(
-    track_args: Optional[List[str]],
-    ignore_args: Optional[List[str]],
-    sign: Signature,
-    bind: BoundArguments,
-    span: SpanObject,
+_UNKNOWN = "<unknown>"
+_NO_ACTIVATION = contextlib.nullcontext()
+
+
+class _CallPlan:
+    """
+    Resolved layout of tracked arguments for a traced function.
+
+    Built once at decoration time so each call only maps positional and keyword
+    values to tracked names without binding the signature.
+    """
+
+    def __init__(self, f: Callable[..., Any], track_args: Optional[List[str]], ignore_args: Optional[List[str]]):
+        sign = inspect.signature(f)
+        final_args = track_args
+        if final_args is None:
+            final_args = list(sign.parameters.keys())
+        if ignore_args is not None:
+            final_args = [item for item in final_args if item not in ignore_args]
+        positional = [
+            name
+            for name, param in sign.parameters.items()
+            if param.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+        ]
+        self.named = frozenset(
+            name
+            for name, param in sign.parameters.items()
+            if param.kind not in (Parameter.POSITIONAL_ONLY, Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)
+        )
+        self.entries: Tuple[Tuple[str, Any, Optional[int], Any], ...] = tuple(
+            self._entry(sign, tracked, positional) for tracked in final_args
+        )
+
+    @staticmethod
+    def _entry(sign: Signature, tracked: str, positional: List[str]) -> Tuple[str, Any, Optional[int], Any]:
+        param = sign.parameters.get(tracked)
+        if param is None:
+            return tracked, None, None, _UNKNOWN
+        position = positional.index(tracked) if tracked in positional else None
+        if param.kind == Parameter.VAR_POSITIONAL:
+            position = len(positional)
+        default = param.default if param.default is not Parameter.empty else _UNKNOWN
+        return tracked, param.kind, position, default
+
+    def fill_span(self, span: SpanObject, args: tuple, kwargs: dict):
+        serialize = span._data_context.serializer.capture
+        args_count = len(args)
+        for name, kind, position, default in self.entries:
+            if kind == Parameter.VAR_POSITIONAL and position is not None:
+                value = args[position:] if args_count > position else default
+            elif kind == Parameter.VAR_KEYWORD:
+                value = {k: v for k, v in kwargs.items() if k not in self.named} or default
+            elif position is not None and position < args_count:
+                value = args[position]
+            elif kind is not None and kind != Parameter.POSITIONAL_ONLY and name in kwargs:
+                value = kwargs[name]
+            else:
+                value = default
+            span.set_attribute(name, serialize(value))
+
+
+def _handle_exception(
+    span: SpanObject, hooks: InterceptorHooks, interceptor_context: Optional[InterceptorContext], e: Exception
+) -> bool:
+    for on_exception in hooks.on_exception:
+        # interceptor handling the exception stops the chain
+        if on_exception(span, interceptor_context, e):
+            return True
+    return False
+
+
+def _on_exception(
+    span: SpanObject, hooks: InterceptorHooks, interceptor_context: Optional[InterceptorContext], e: Exception
 ):
-    final_args = track_args
-    if final_args is None:
-        final_args = list(sign.parameters.keys())
-    if ignore_args is not None:
-        final_args = [item for item in final_args if item not in ignore_args]
-    for tracked in final_args:
-        if tracked in bind.arguments:
-            value = bind.arguments[tracked]
-        elif tracked in sign.parameters and sign.parameters[tracked].default != Parameter.empty:
-            value = sign.parameters[tracked].default
+    if not _handle_exception(span, hooks, interceptor_context, e):
+        span.set_attribute("exception", str(e))
+        span.set_status(StatusCode.ERROR)
+
+
+async def _run_async_hooks(stages: AsyncHookStages, /, *args, **kwargs) -> List[Any]:
+    results: List[Any] = []
+    for stage in stages:
+        if len(stage) == 1:
+            results.append(await stage[0](*args, **kwargs))
         else:
-            value = "<unknown>"
-        span.set_attribute(tracked, value)
+            results.extend(await asyncio.gather(*(hook(*args, **kwargs) for hook in stage)))
+    return results
+
+
+async def _on_exception_async(
+    span: SpanObject, hooks: InterceptorHooks, interceptor_context: Optional[InterceptorContext], e: Exception
+):
+    processed = _handle_exception(span, hooks, interceptor_context, e)
+    for stage in hooks.async_on_exception:
+        if processed:
+            break
+        processed = any(await _run_async_hooks((stage,), span, interceptor_context, e))
+    if not processed:
+        span.set_attribute("exception", str(e))
+        span.set_status(StatusCode.ERROR)
+
+
+class _Activation:
+    """Makes span (and pipeline, if set) current for tracely and OpenTelemetry while generator body runs."""
+
+    def __init__(
+        self, span: SpanObject, otel_span: Optional[Span] = None, pipeline: Optional["TracelyPipeline"] = None
+    ):
+        self.span = span
+        self.otel_context = set_span_in_context(otel_span) if otel_span is not None else None
+        self.pipeline = pipeline
+        self._prev_span: Optional[SpanObject] = None
+        self._token: Optional[object] = None
+        self._pipeline_token: Optional[contextvars.Token] = None
+
+    def __enter__(self):
+        self._prev_span = get_current_span()
+        set_current_span(self.span)
+        if self.otel_context is not None:
+            self._token = context_api.attach(self.otel_context)
+        if self.pipeline is not None:
+            self._pipeline_token = _selected_pipeline.set(self.pipeline)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._pipeline_token is not None:
+            _selected_pipeline.reset(self._pipeline_token)
+            self._pipeline_token = None
+        if self._token is not None:
+            context_api.detach(self._token)
+            self._token = None
+        set_current_span(self._prev_span)
+
+
+def _select_pipeline(func: Callable[..., Any], pipeline: "TracelyPipeline") -> Callable[..., Any]:
+    """Select pipeline for the duration of call, so nested traced calls are traced by the same pipeline."""
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def selected_async(*args, **kwargs):
+            token = _selected_pipeline.set(pipeline)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _selected_pipeline.reset(token)
+
+        return selected_async
+
+    @wraps(func)
+    def selected(*args, **kwargs):
+        token = _selected_pipeline.set(pipeline)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _selected_pipeline.reset(token)
+
+    return selected
+
+
+class _StreamRecorder:
+    """
+    Collects stream statistics and bounded preview of items:
+    string items are concatenated up to `max_bytes` characters, other items are kept up to `max_keys` items.
+    """
+
+    def __init__(self, otel_span: Span, track_output: bool, data_context: DataContext):
+        self.otel_span = otel_span
+        self.track_output = track_output
+        self.items = 0
+        self.time_to_first_item: Optional[float] = None
+        self._preview: List[Any] = []
+        self._preview_size = 0
+        self._all_text = True
+        config = data_context.serializer.config
+        self._max_chars = config.max_bytes
+        self._max_items = config.max_keys
+
+    def record(self, item):
+        if self.items == 0:
+            start_time = getattr(self.otel_span, "start_time", None)
+            if start_time is not None:
+                self.time_to_first_item = (time.time_ns() - start_time) / 1e9
+        self.items += 1
+        if not self.track_output:
+            return
+        if isinstance(item, str):
+            if self._preview_size < self._max_chars:
+                self._preview.append(item)
+                self._preview_size += len(item)
+        else:
+            self._all_text = False
+            if len(self._preview) < self._max_items:
+                self._preview.append(item)
+
+    def preview(self):
+        if self._all_text:
+            return "".join(self._preview)
+        return self._preview
+
+    def finish(self, span: SpanObject, completed: bool):
+        span.set_attribute("stream.items", self.items)
+        span.set_attribute("stream.completed", completed)
+        if self.time_to_first_item is not None:
+            span.set_attribute("stream.time_to_first_item", self.time_to_first_item)
+
+
+def _wrap_generator(
+    f: Callable[..., Any],
+    plan: _CallPlan,
+    span_name: Optional[str],
+    track_output: Optional[bool],
+    parse_output: Optional[bool],
+    pipeline: Optional["TracelyPipeline"],
+) -> Callable[..., Any]:
+    @wraps(f)
+    def func(*args, **kwargs):
+        _tracer, data_context = get_pipeline_state(pipeline)
+        activation = None
+        span = None
+        otel_span = None
+        stream = None
+        hooks = data_context.interceptor_hooks
+        interceptor_context = InterceptorContext() if hooks else None
+        if _tracer is not None:
+            sampler = data_context.sampler
+            parent, otel_context = get_parent(get_current_span(), data_context)
+            if sampler is not None and not sampler.should_sample(parent, otel_context):
+                activation = _Activation(get_null_span(data_context), pipeline=pipeline)
+            else:
+                otel_span = _tracer.start_span(f"{span_name or f.__name__}", context=otel_context)
+                span = SpanObject(otel_span, buffered=True, parent=parent, data_context=data_context)
+                activation = _Activation(span, otel_span, pipeline)
+                stream = _StreamRecorder(otel_span, bool(track_output), data_context)
+        elif pipeline is not None:
+            activation = _Activation(get_null_span(data_context), pipeline=pipeline)
+        try:
+            with activation or _NO_ACTIVATION:
+                if span is not None:
+                    plan.fill_span(span, args, kwargs)
+                    for before_call in hooks.before_call:
+                        before_call(span, interceptor_context, *args, **kwargs)
+                gen = f(*args, **kwargs)
+            send_value = None
+            thrown: Optional[BaseException] = None
+            while True:
+                with activation or _NO_ACTIVATION:
+                    try:
+                        if thrown is not None:
+                            error, thrown = thrown, None
+                            item = gen.throw(error)
+                        else:
+                            item = gen.send(send_value)
+                    except StopIteration as stop:
+                        result = stop.value
+                        break
+                if stream is not None:
+                    stream.record(item)
+                try:
+                    send_value = yield item
+                except GeneratorExit:
+                    with activation or _NO_ACTIVATION:
+                        gen.close()
+                    raise
+                except BaseException as e:
+                    thrown = e
+            if span is not None and stream is not None:
+                stream.finish(span, completed=True)
+                if track_output and stream.items > 0:
+                    preview = stream.preview()
+                    set_result(span, preview, bool(parse_output))
+                    for after_call in hooks.after_call:
+                        after_call(span, interceptor_context, preview)
+                span.set_status(StatusCode.OK)
+            return result
+        except GeneratorExit:
+            if span is not None and stream is not None:
+                stream.finish(span, completed=False)
+                span.set_status(StatusCode.OK)
+            raise
+        except Exception as e:
+            if span is not None and stream is not None and otel_span is not None:
+                stream.finish(span, completed=False)
+                otel_span.record_exception(e)
+                _on_exception(span, hooks, interceptor_context, e)
+            raise
+        finally:
+            if span is not None and otel_span is not None:
+                span.flush()
+                otel_span.end()
+
+    return func
+
+
+def _wrap_async_generator(
+    f: Callable[..., Any],
+    plan: _CallPlan,
+    span_name: Optional[str],
+    track_output: Optional[bool],
+    parse_output: Optional[bool],
+    pipeline: Optional["TracelyPipeline"],
+) -> Callable[..., Any]:
+    @wraps(f)
+    async def func(*args, **kwargs):
+        _tracer, data_context = get_pipeline_state(pipeline)
+        activation = None
+        span = None
+        otel_span = None
+        stream = None
+        hooks = data_context.interceptor_hooks
+        interceptor_context = InterceptorContext() if hooks else None
+        if _tracer is not None:
+            sampler = data_context.sampler
+            parent, otel_context = get_parent(get_current_span(), data_context)
+            if sampler is not None and not sampler.should_sample(parent, otel_context):
+                activation = _Activation(get_null_span(data_context), pipeline=pipeline)
+            else:
+                otel_span = _tracer.start_span(f"{span_name or f.__name__}", context=otel_context)
+                span = SpanObject(otel_span, buffered=True, parent=parent, data_context=data_context)
+                activation = _Activation(span, otel_span, pipeline)
+                stream = _StreamRecorder(otel_span, bool(track_output), data_context)
+        elif pipeline is not None:
+            activation = _Activation(get_null_span(data_context), pipeline=pipeline)
+        try:
+            with activation or _NO_ACTIVATION:
+                if span is not None:
+                    plan.fill_span(span, args, kwargs)
+                    for before_call in hooks.before_call:
+                        before_call(span, interceptor_context, *args, **kwargs)
+                agen = f(*args, **kwargs)
+            send_value = None
+            thrown: Optional[BaseException] = None
+            while True:
+                with activation or _NO_ACTIVATION:
+                    try:
+                        if thrown is not None:
+                            error, thrown = thrown, None
+                            item = await agen.athrow(error)
+                        else:
+                            item = await agen.asend(send_value)
+                    except StopAsyncIteration:
+                        break
+                if stream is not None:
+                    stream.record(item)
+                try:
+                    send_value = yield item
+                except GeneratorExit:
+                    with activation or _NO_ACTIVATION:
+                        await agen.aclose()
+                    raise
+                except BaseException as e:
+                    thrown = e
+            if span is not None and stream is not None:
+                stream.finish(span, completed=True)
+                if track_output and stream.items > 0:
+                    preview = stream.preview()
+                    set_result(span, preview, bool(parse_output))
+                    for after_call in hooks.after_call:
+                        after_call(span, interceptor_context, preview)
+                span.set_status(StatusCode.OK)
+        except GeneratorExit:
+            if span is not None and stream is not None:
+                stream.finish(span, completed=False)
+                span.set_status(StatusCode.OK)
+            raise
+        except Exception as e:
+            if span is not None and stream is not None and otel_span is not None:
+                stream.finish(span, completed=False)
+                otel_span.record_exception(e)
+                _on_exception(span, hooks, interceptor_context, e)
+            raise
+        finally:
+            if span is not None and otel_span is not None:
+                span.flush()
+                otel_span.end()
+
+    return func
 
 
 def trace_event(
@@ -41,6 +413,7 @@ def trace_event(
     ignore_args: Optional[List[str]] = None,
     track_output: Optional[bool] = True,
     parse_output: Optional[bool] = True,
+    pipeline: Optional["TracelyPipeline"] = None,
 ):
     """
     Trace given function call.
@@ -52,77 +425,112 @@ def trace_event(
         ignore_args: list of arguments to ignore, if set to None - do not ignore any arguments.
         track_output: track the output of the function call
         parse_output: parse the output (dict, list and tuple) of the function call
+        pipeline: pipeline to trace calls with, it is also selected for nested traced calls while function runs.
+                  If not set - pipeline selected with `TracelyPipeline.activate()` at the time of call is used,
+                  or tracing configured by `init_tracing`
+
+    For generator and async generator functions span is kept open until the stream is exhausted or closed,
+    and records number of items (`stream.items`), time to first item in seconds (`stream.time_to_first_item`)
+    and whether the stream was consumed to the end (`stream.completed`). With `track_output` bounded preview
+    of items is recorded as result: string items are concatenated, other items are collected into a list.
     """
 
     def wrapper(f: Callable[..., Any]) -> Callable[..., Any]:
+        plan = _CallPlan(f, track_args, ignore_args)
+        if isasyncgenfunction(f):
+            return _wrap_async_generator(f, plan, span_name, track_output, parse_output, pipeline)
+        if isgeneratorfunction(f):
+            return _wrap_generator(f, plan, span_name, track_output, parse_output, pipeline)
         if iscoroutinefunction(f):
 
             @wraps(f)
             async def func(*args, **kwargs):
-                import inspect
-
-                _tracer = get_tracer()
-                sign = inspect.signature(f)
-                bind = sign.bind(*args, **kwargs)
-                interceptor_context = InterceptorContext()
-                with _tracer.start_as_current_span(f"{span_name or f.__name__}") as span:
-                    _fill_span_from_signature(track_args, ignore_args, bind.signature, bind, span)
-                    for interceptor in get_interceptors():
-                        interceptor.before_call(span, interceptor_context, *args, **kwargs)
+                if not _context._tracing_configured:
+                    return await f(*args, **kwargs)
+                _tracer, data_context = get_pipeline_state(pipeline)
+                if _tracer is None:
+                    return await f(*args, **kwargs)
+                prev_span = get_current_span()
+                parent, otel_context = get_parent(prev_span, data_context)
+                sampler = data_context.sampler
+                if sampler is not None and not sampler.should_sample(parent, otel_context):
+                    set_current_span(get_null_span(data_context))
+                    try:
+                        return await f(*args, **kwargs)
+                    finally:
+                        set_current_span(prev_span)
+                hooks = data_context.interceptor_hooks
+                interceptor_context = InterceptorContext() if hooks else None
+                with _tracer.start_as_current_span(f"{span_name or f.__name__}", context=otel_context) as otel_span:
+                    span = SpanObject(otel_span, buffered=True, parent=parent, data_context=data_context)
+                    set_current_span(span)
+                    plan.fill_span(span, args, kwargs)
+                    for before_call in hooks.before_call:
+                        before_call(span, interceptor_context, *args, **kwargs)
+                    if hooks.async_before_call:
+                        await _run_async_hooks(hooks.async_before_call, span, interceptor_context, *args, **kwargs)
                     try:
                         result = await f(*args, **kwargs)
                         if result is not None and track_output:
                             set_result(span, result, parse_output)
-                            for interceptor in get_interceptors():
-                                interceptor.after_call(span, interceptor_context, result)
+                            for after_call in hooks.after_call:
+                                after_call(span, interceptor_context, result)
+                            if hooks.async_after_call:
+                                await _run_async_hooks(hooks.async_after_call, span, interceptor_context, result)
                         span.set_status(StatusCode.OK)
                     except Exception as e:
-                        processed = False
-                        for interceptor in get_interceptors():
-                            processed = processed or interceptor.on_exception(span, interceptor_context, e)
-                        if not processed:
-                            span.set_attribute("exception", str(e))
-                            span.set_status(StatusCode.ERROR)
+                        if hooks.async_on_exception:
+                            await _on_exception_async(span, hooks, interceptor_context, e)
+                        else:
+                            _on_exception(span, hooks, interceptor_context, e)
                         raise
+                    finally:
+                        span.flush()
+                        set_current_span(prev_span)
                 return result
 
-            return func
+            return func if pipeline is None else _select_pipeline(func, pipeline)
         else:
 
             @wraps(f)
             def func(*args, **kwargs):
-                import inspect
-
-                _tracer = get_tracer()
-                sign = inspect.signature(f)
-                bind = sign.bind(*args, **kwargs)
-                interceptor_context = InterceptorContext()
-                with _tracer.start_as_current_span(f"{span_name or f.__name__}") as otel_span:
-                    prev_span = get_current_span()
-                    span = SpanObject(otel_span)
+                if not _context._tracing_configured:
+                    return f(*args, **kwargs)
+                _tracer, data_context = get_pipeline_state(pipeline)
+                if _tracer is None:
+                    return f(*args, **kwargs)
+                prev_span = get_current_span()
+                parent, otel_context = get_parent(prev_span, data_context)
+                sampler = data_context.sampler
+                if sampler is not None and not sampler.should_sample(parent, otel_context):
+                    set_current_span(get_null_span(data_context))
+                    try:
+                        return f(*args, **kwargs)
+                    finally:
+                        set_current_span(prev_span)
+                hooks = data_context.interceptor_hooks
+                interceptor_context = InterceptorContext() if hooks else None
+                with _tracer.start_as_current_span(f"{span_name or f.__name__}", context=otel_context) as otel_span:
+                    span = SpanObject(otel_span, buffered=True, parent=parent, data_context=data_context)
                     set_current_span(span)
-                    _fill_span_from_signature(track_args, ignore_args, bind.signature, bind, span)
-                    for interceptor in get_interceptors():
-                        interceptor.before_call(span, interceptor_context, *args, **kwargs)
+                    plan.fill_span(span, args, kwargs)
+                    for before_call in hooks.before_call:
+                        before_call(span, interceptor_context, *args, **kwargs)
                     try:
                         result = f(*args, **kwargs)
                         if result is not None and track_output:
                             set_result(span, result, parse_output)
-                            for interceptor in get_interceptors():
-                                interceptor.after_call(span, interceptor_context, result)
+                            for after_call in hooks.after_call:
+                                after_call(span, interceptor_context, result)
                         span.set_status(StatusCode.OK)
                     except Exception as e:
-                        processed = False
-                        for interceptor in get_interceptors():
-                            processed = processed or interceptor.on_exception(span, interceptor_context, e)
-                        if not processed:
-                            span.set_attribute("exception", str(e))
-                            span.set_status(StatusCode.ERROR)
+                        _on_exception(span, hooks, interceptor_context, e)
                         raise
                     finally:
+                        span.flush()
                         set_current_span(prev_span)
                 return result
 
-            return func
+            return func if pipeline is None else _select_pipeline(func, pipeline)
 
     return wrapper
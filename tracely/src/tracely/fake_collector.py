@@ -0,0 +1,255 @@
+"""
+Local stand-in for Evidently collector, for tests and load testing without live backend.
+
+Implements endpoints used by tracely: `/api/users/login` (collector type detection and Cloud login),
+`/api/datasets`, `/api/datasets/tracing` and OTLP `/api/v1/traces` over HTTP, and OTLP trace service over gRPC.
+Latency, error rate and throughput cap can be configured to test export retries and queue overflow.
+
+Run in-process:
+
+    with FakeCollector(FakeCollectorConfig(latency=0.05, error_rate=0.1)) as collector:
+        init_tracing(address=collector.address, ...)
+        ...
+        print(collector.stats())
+
+or as a subprocess with `tracely fake-collector --port 8000`, counters are available at `/stats`.
+"""
+
+import dataclasses
+import gzip
+import json
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceResponse
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource as PbResource
+from opentelemetry.proto.trace.v1.trace_pb2 import Span as PbSpan
+
+
+@dataclasses.dataclass
+class FakeCollectorConfig:
+    """
+    Fake collector configuration.
+
+    Args:
+        host: interface to listen on
+        port: HTTP port, 0 to choose free port
+        grpc_port: gRPC port, 0 to choose free port, None to disable gRPC
+        mode: "cloud" or "oss", OSS collector does not have `/api/users/login` endpoint
+        latency: delay in seconds added to every traces request
+        api_latency: delay in seconds added to every API request (login and export dataset resolution)
+        error_rate: share of traces requests failed with `error_status` (UNAVAILABLE for gRPC)
+        error_status: HTTP status of failed requests
+        max_spans_per_second: throughput cap, requests over it are rejected with 429 (RESOURCE_EXHAUSTED for gRPC)
+        keep_spans: keep received spans, their resources and export latency (time from span end to receiving it)
+                    in memory, see `FakeCollector.spans`, `FakeCollector.resources` and `FakeCollector.latencies`
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    grpc_port: Optional[int] = None
+    mode: str = "oss"
+    latency: float = 0.0
+    api_latency: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    max_spans_per_second: Optional[float] = None
+    keep_spans: bool = False
+
+
+class FakeCollector:
+    """Fake collector serving HTTP (and optionally gRPC) in background threads."""
+
+    def __init__(self, config: Optional[FakeCollectorConfig] = None):
+        self.config = config or FakeCollectorConfig()
+        if self.config.mode not in ("cloud", "oss"):
+            raise ValueError(f"Unexpected fake collector mode: {self.config.mode}. Expected values: cloud or oss")
+        self.datasets: Dict[str, str] = {}
+        self.spans: List[PbSpan] = []
+        self.resources: List[PbResource] = []
+        self.latencies: List[float] = []
+        self._counters: Dict[str, int] = {
+            "requests": 0,
+            "spans_received": 0,
+            "bytes_received": 0,
+            "requests_failed": 0,
+            "requests_throttled": 0,
+        }
+        self._requests_by_path: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._tokens = self.config.max_spans_per_second or 0.0
+        self._last_refill = time.monotonic()
+        self._http_server: Optional[ThreadingHTTPServer] = None
+        self._grpc_server: Any = None
+        self.address = ""
+        self.grpc_address: Optional[str] = None
+
+    def __enter__(self) -> "FakeCollector":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._http_server = ThreadingHTTPServer((self.config.host, self.config.port), _make_handler(self))
+        self._http_server.daemon_threads = True
+        self.address = f"http://{self.config.host}:{self._http_server.server_address[1]}"
+        threading.Thread(target=self._http_server.serve_forever, name="tracely-fake-collector", daemon=True).start()
+        if self.config.grpc_port is not None:
+            self._start_grpc()
+
+    def _start_grpc(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        import grpc  # type: ignore[import-untyped]
+        from opentelemetry.proto.collector.trace.v1 import trace_service_pb2_grpc
+
+        collector = self
+
+        class TraceService(trace_service_pb2_grpc.TraceServiceServicer):
+            def Export(self, request, context):
+                code = collector._accept(request, request.ByteSize(), "grpc")
+                if code == 429:
+                    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "throughput cap exceeded")
+                elif code != 200:
+                    context.abort(grpc.StatusCode.UNAVAILABLE, "injected error")
+                return ExportTraceServiceResponse()
+
+        self._grpc_server = grpc.server(ThreadPoolExecutor(max_workers=8))
+        trace_service_pb2_grpc.add_TraceServiceServicer_to_server(TraceService(), self._grpc_server)
+        port = self._grpc_server.add_insecure_port(f"{self.config.host}:{self.config.grpc_port}")
+        self.grpc_address = f"{self.config.host}:{port}"
+        self._grpc_server.start()
+
+    def stop(self) -> None:
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._grpc_server is not None:
+            self._grpc_server.stop(None)
+            self._grpc_server = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "requests_by_path": dict(self._requests_by_path),
+                "datasets": len(self.datasets),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            for key in self._counters:
+                self._counters[key] = 0
+            self._requests_by_path.clear()
+            self.spans.clear()
+            self.resources.clear()
+            self.latencies.clear()
+
+    def _count_request(self, path: str) -> None:
+        with self._lock:
+            self._counters["requests"] += 1
+            self._requests_by_path[path] = self._requests_by_path.get(path, 0) + 1
+
+    def _accept(self, request: ExportTraceServiceRequest, size: int, path: str) -> int:
+        """Apply configured latency, errors and throughput cap, returns HTTP status of response."""
+        self._count_request(path)
+        config = self.config
+        if config.latency:
+            time.sleep(config.latency)
+        spans = [span for resource in request.resource_spans for scope in resource.scope_spans for span in scope.spans]
+        with self._lock:
+            if config.error_rate and random.random() < config.error_rate:
+                self._counters["requests_failed"] += 1
+                return config.error_status
+            if config.max_spans_per_second is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._tokens + (now - self._last_refill) * config.max_spans_per_second,
+                    config.max_spans_per_second,
+                )
+                self._last_refill = now
+                if len(spans) > self._tokens:
+                    self._counters["requests_throttled"] += 1
+                    return 429
+                self._tokens -= len(spans)
+            self._counters["spans_received"] += len(spans)
+            self._counters["bytes_received"] += size
+            if config.keep_spans:
+                received_at = time.time_ns()
+                self.spans.extend(spans)
+                self.resources.extend(resource.resource for resource in request.resource_spans)
+                self.latencies.extend((received_at - span.end_time_unix_nano) / 1e9 for span in spans)
+        return 200
+
+    def _find_or_create_dataset(self, name: str) -> str:
+        with self._lock:
+            if name not in self.datasets:
+                self.datasets[name] = str(uuid.uuid4())
+            return self.datasets[name]
+
+
+def _make_handler(collector: FakeCollector):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status: int, body: Any = None) -> None:
+            data = (body if isinstance(body, str) else json.dumps(body)).encode() if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_body(self) -> Tuple[bytes, int]:
+            """Request body (decompressed) and its size as sent."""
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            size = len(body)
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return body, size
+
+        def do_GET(self):
+            path = urllib.parse.urlparse(self.path).path
+            if path == "/stats":
+                return self._reply(200, collector.stats())
+            collector._count_request(path)
+            if collector.config.api_latency:
+                time.sleep(collector.config.api_latency)
+            if path == "/api/users/login" and collector.config.mode == "cloud":
+                return self._reply(200, "fake-jwt-token")
+            if path == "/api/datasets":
+                with collector._lock:
+                    datasets = [{"id": dataset_id, "name": name} for name, dataset_id in collector.datasets.items()]
+                return self._reply(200, {"datasets": datasets})
+            self._reply(404, {"detail": "Not Found"})
+
+        def do_POST(self):
+            url = urllib.parse.urlparse(self.path)
+            body, size = self._read_body()
+            if url.path == "/api/v1/traces":
+                request = ExportTraceServiceRequest.FromString(body)
+                status = collector._accept(request, size, url.path)
+                return self._reply(status, {} if status == 200 else {"detail": "rejected by fake collector"})
+            collector._count_request(url.path)
+            if collector.config.api_latency:
+                time.sleep(collector.config.api_latency)
+            if url.path == "/api/datasets/tracing":
+                name = json.loads(body or b"{}").get("name", "")
+                return self._reply(200, {"dataset_id": collector._find_or_create_dataset(name)})
+            self._reply(404, {"detail": "Not Found"})
+
+    return Handler
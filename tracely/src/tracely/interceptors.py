@@ -1,8 +1,15 @@
 import abc
+import typing
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import Union
 
-from tracely.proxy import SpanObject
+if typing.TYPE_CHECKING:
+    from tracely.proxy import SpanObject
 
 
 class InterceptorContext:
@@ -19,14 +26,105 @@ class InterceptorContext:
 
 
 class Interceptor:
+    """
+    Hooks called around traced functions. Only overridden hooks are called.
+
+    Interceptors with higher `priority` are called first, interceptors with equal priority
+    are called in the order they are passed to `init_tracing`.
+    """
+
+    priority: int = 0
+
     @abc.abstractmethod
-    def before_call(self, span: SpanObject, context: InterceptorContext, *args, **kwargs):
+    def before_call(self, span: "SpanObject", context: InterceptorContext, *args, **kwargs):
         pass
 
     @abc.abstractmethod
-    def after_call(self, span: SpanObject, context: InterceptorContext, return_value):
+    def after_call(self, span: "SpanObject", context: InterceptorContext, return_value):
         pass
 
     @abc.abstractmethod
-    def on_exception(self, span: SpanObject, context: InterceptorContext, ex: Exception) -> bool:
+    def on_exception(self, span: "SpanObject", context: InterceptorContext, ex: Exception) -> bool:
+        pass
+
+
+class AsyncInterceptor:
+    """
+    Interceptor with awaitable hooks, called only for coroutine functions decorated with `trace_event`
+    (after regular interceptors), so hooks doing I/O do not block the event loop.
+
+    Interceptors with higher `priority` are awaited first. Interceptors with `concurrent = True` and equal priority
+    do not depend on each other and their hooks run concurrently with `asyncio.gather`.
+    """
+
+    priority: int = 0
+    concurrent: bool = False
+
+    async def before_call(self, span: "SpanObject", context: InterceptorContext, *args, **kwargs):
         pass
+
+    async def after_call(self, span: "SpanObject", context: InterceptorContext, return_value):
+        pass
+
+    async def on_exception(self, span: "SpanObject", context: InterceptorContext, ex: Exception) -> bool:
+        return False
+
+
+AnyInterceptor = Union[Interceptor, AsyncInterceptor]
+# hooks of async interceptors grouped into stages: stages run one by one, hooks of a stage run concurrently
+AsyncHookStages = Tuple[Tuple[Callable[..., Any], ...], ...]
+
+
+class InterceptorHooks:
+    """Interceptors compiled into per-hook tuples of bound methods, without hooks not overridden by interceptors."""
+
+    __slots__ = (
+        "before_call",
+        "after_call",
+        "on_exception",
+        "async_before_call",
+        "async_after_call",
+        "async_on_exception",
+    )
+
+    def __init__(self, interceptors: Sequence[AnyInterceptor] = ()):
+        ordered = sorted(interceptors, key=lambda interceptor: -getattr(interceptor, "priority", 0))
+        sync = [interceptor for interceptor in ordered if not isinstance(interceptor, AsyncInterceptor)]
+        async_ = [interceptor for interceptor in ordered if isinstance(interceptor, AsyncInterceptor)]
+        self.before_call: Tuple[Callable[..., Any], ...] = _hooks(sync, "before_call")
+        self.after_call: Tuple[Callable[..., Any], ...] = _hooks(sync, "after_call")
+        self.on_exception: Tuple[Callable[..., Any], ...] = _hooks(sync, "on_exception")
+        self.async_before_call: AsyncHookStages = _async_hooks(async_, "before_call")
+        self.async_after_call: AsyncHookStages = _async_hooks(async_, "after_call")
+        self.async_on_exception: AsyncHookStages = _async_hooks(async_, "on_exception")
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.before_call
+            or self.after_call
+            or self.on_exception
+            or self.async_before_call
+            or self.async_after_call
+            or self.async_on_exception
+        )
+
+
+def _hooks(interceptors: Sequence[AnyInterceptor], name: str) -> Tuple[Callable[..., Any], ...]:
+    base = getattr(Interceptor, name)
+    return tuple(
+        getattr(interceptor, name) for interceptor in interceptors if getattr(type(interceptor), name) is not base
+    )
+
+
+def _async_hooks(interceptors: Sequence[AsyncInterceptor], name: str) -> AsyncHookStages:
+    base = getattr(AsyncInterceptor, name)
+    stages: List[Tuple[Any, List[Callable[..., Any]]]] = []
+    for interceptor in interceptors:
+        if getattr(type(interceptor), name) is base:
+            continue
+        key = (interceptor.priority, True) if interceptor.concurrent else None
+        if key is not None and stages and stages[-1][0] == key:
+            stages[-1][1].append(getattr(interceptor, name))
+        else:
+            stages.append((key, [getattr(interceptor, name)]))
+    return tuple(tuple(hooks) for _, hooks in stages)
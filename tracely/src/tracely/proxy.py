@@ -1,30 +1,111 @@
 import typing
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Union
 
 import opentelemetry.trace
-from tracely._tracer_provider import _data_context
+from tracely._context import DataContext
+from tracely._context import _data_context
+from tracely._context import get_pipeline_state
+from tracely.serialization import DeferredValue
 
 if typing.TYPE_CHECKING:
+    from openai.types.responses import Response
     from openai.types.responses import ResponseUsage
 
 
 class SpanObject:
+    """
+    Wrapper around OpenTelemetry span.
+
+    If created with `buffered=True`, attributes are staged locally and written to the span
+    with single `set_attributes` call on `flush()`, which must be called before the span ends.
+    Buffered spans also roll up token usage and costs: on `flush()` totals of the span and its finished
+    children are passed to `parent`, and the root span (without parent) gets `tokens.total.*` and `cost.total.*`.
+    Serialization and pricing settings are taken from `data_context` (of current pipeline if not set).
+    """
+
     context: Dict[str, typing.Any]
+    _buffer: Optional[Dict[str, typing.Any]]
+    _usage: Optional[Dict[str, float]]
+    _child_usage: Optional[List[Dict[str, float]]]
 
-    def __init__(self, span: Optional[opentelemetry.trace.Span] = None):
+    def __init__(
+        self,
+        span: Optional[opentelemetry.trace.Span] = None,
+        buffered: bool = False,
+        parent: Optional["SpanObject"] = None,
+        data_context: Optional[DataContext] = None,
+    ):
         self.context = {}
+        self._data_context = data_context if data_context is not None else get_pipeline_state()[1]
+        self._buffer = {} if buffered else None
+        self._usage = None
+        # appended by children from any thread, list.append is atomic so no lock is needed
+        self._child_usage = [] if buffered else None
+        self._parent = parent if parent is not None and parent._child_usage is not None else None
         if span is None:
             self.span = opentelemetry.trace.get_current_span()
         else:
             self.span = span
 
     def set_attribute(self, name, value):
-        self.span.set_attribute(name, value)
+        if self._buffer is None:
+            if type(value) is DeferredValue:
+                # not buffered span cannot carry captured values to export thread
+                self.span.set_attributes(dict(self._data_context.serializer.resolve(name, value)))
+            else:
+                self.span.set_attribute(name, value)
+        else:
+            self._buffer[name] = value
+
+    def get_attribute(self, name, default=None):
+        if self._buffer is not None and name in self._buffer:
+            return self._buffer[name]
+        attributes = getattr(self.span, "attributes", None)
+        if attributes is not None:
+            return attributes.get(name, default)
+        return default
+
+    def flush(self):
+        """Write staged attributes to the span, attributes set after flush are written directly."""
+        if self._buffer is not None:
+            self._rollup_usage(self._buffer)
+            if self._buffer:
+                if self._data_context.serializer.config.deferred:
+                    self._defer(self._buffer)
+                self.span.set_attributes(self._buffer)
+            self._buffer = None
+
+    def _defer(self, buffer: Dict[str, typing.Any]):
+        deferred = {name: value for name, value in buffer.items() if type(value) is DeferredValue}
+        if not deferred:
+            return
+        for name in deferred:
+            del buffer[name]
+        deferred_values = self._data_context.deferred_values
+        if deferred_values is None or not deferred_values.attach(self.span, deferred):
+            for name, value in deferred.items():
+                buffer.update(self._data_context.serializer.resolve(name, value))
+
+    def _rollup_usage(self, buffer: Dict[str, typing.Any]):
+        children = self._child_usage
+        if not self._usage and not children:
+            return
+        totals = dict(self._usage or {})
+        for usage in children or ():
+            for key, value in usage.items():
+                totals[key] = totals.get(key, 0) + value
+        if self._parent is not None:
+            self._parent._child_usage.append(totals)  # type: ignore[union-attr]
+        else:
+            for key, value in totals.items():
+                kind, name = key.split(".", 1)
+                buffer[f"{kind}.total.{name}"] = value
 
     def set_result(self, value, parse_output: bool = True):
-        set_result(self.span, value, parse_output=parse_output)
+        set_result(self, value, parse_output=parse_output)
 
     def set_session(self, value: str):
         self.set_attribute("session_id", value)
@@ -34,19 +115,20 @@ class SpanObject:
 
     def update_usage(
         self,
-        usage: Optional["ResponseUsage"] = None,
+        usage: Optional[Union["ResponseUsage", "Response"]] = None,
         *,
         tokens: Optional[Dict[str, int]] = None,
         costs: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
     ):
         if usage is not None:
             if tokens is not None or costs is not None:
                 raise ValueError("Cannot specify both usage and tokens+costs, use only one instead")
-            self._update_usage_openai(usage)
+            self._update_usage_openai(usage, model)
         else:
             if tokens is None:
                 raise ValueError("Must specify either tokens or usage")
-            self._update_usage(tokens=tokens, costs=costs)
+            self._update_usage(tokens=tokens, costs=costs, model=model)
 
     def set_context_value(self, key, value):
         self.context[key] = value
@@ -62,46 +144,107 @@ class SpanObject:
         *,
         tokens: Dict[str, int],
         costs: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
     ):
+        usage = self._usage
+        if usage is None:
+            usage = self._usage = {}
         for k, v in tokens.items():
             self.set_attribute(f"tokens.{k}", v)
+            usage[f"tokens.{k}"] = v
+        prices = self._data_context.pricing.get(model)
+        all_costs = prices.costs(tokens) if prices is not None else {}
         if costs:
-            for k, cost_value in costs.items():
-                self.set_attribute(f"cost.{k}", cost_value)
-        usage_details = _data_context.get_model_usage_details("default")
-        if usage_details:
-            for k, v in tokens.items():
-                cost = usage_details.cost_per_token.get(k)
-                if cost:
-                    self.set_attribute(f"cost.{k}", cost * v)
-
-    def _update_usage_openai(self, usage: "ResponseUsage"):
+            # explicitly provided costs take precedence over calculated ones
+            all_costs.update(costs)
+        for k, cost_value in all_costs.items():
+            self.set_attribute(f"cost.{k}", cost_value)
+            usage[f"cost.{k}"] = cost_value
+
+    def _update_usage_openai(self, usage: Union["ResponseUsage", "Response"], model: Optional[str] = None):
+        response_usage = getattr(usage, "usage", None)
+        if response_usage is not None:
+            # whole response object, which also knows the model
+            model = model or getattr(usage, "model", None)
+            usage = response_usage
+        cached_tokens = usage.input_tokens_details.cached_tokens
         self._update_usage(
             tokens={
                 "total_input": usage.input_tokens,
-                "input": usage.input_tokens - usage.input_tokens_details.cached_tokens,
-                "cached_input": usage.input_tokens_details.cached_tokens,
+                "input": usage.input_tokens - cached_tokens,
+                "cached_input": cached_tokens,
                 "output": usage.output_tokens,
             },
+            model=model,
         )
 
     def set_status(self, status):
         self.span.set_status(status)
 
 
+class NullSpanObject(SpanObject):
+    """
+    Span object for calls that are not traced: all writes are dropped and no context is kept.
+
+    Each pipeline has its own instance (see `get_null_span`), so nested calls know which pipeline
+    made the sampling decision.
+    """
+
+    def __init__(self, data_context: Optional[DataContext] = None):
+        self.context = {}
+        self._buffer = None
+        self._usage = None
+        self._child_usage = None
+        self._parent = None
+        self._data_context = data_context if data_context is not None else _data_context
+        self.span = opentelemetry.trace.INVALID_SPAN
+
+    def set_attribute(self, name, value):
+        pass
+
+    def get_attribute(self, name, default=None):
+        return default
+
+    def flush(self):
+        pass
+
+    def set_result(self, value, parse_output: bool = True):
+        pass
+
+    def update_usage(
+        self,
+        usage: Optional[Union["ResponseUsage", "Response"]] = None,
+        *,
+        tokens: Optional[Dict[str, int]] = None,
+        costs: Optional[Dict[str, float]] = None,
+        model: Optional[str] = None,
+    ):
+        pass
+
+    def set_context_value(self, key, value):
+        pass
+
+    def set_status(self, status):
+        pass
+
+
+def get_null_span(data_context: DataContext) -> NullSpanObject:
+    """Span object of not sampled calls of pipeline with given data context."""
+    if data_context.null_span is None:
+        data_context.null_span = NullSpanObject(data_context)
+    return data_context.null_span
+
+
+NULL_SPAN = get_null_span(_data_context)
+
+
 def set_result(span, result, parse_output: bool):
-    if parse_output and isinstance(result, dict):
-        value: Union[str, int, float]
-        for k, v in result.items():
-            if isinstance(v, (int, float)):
-                value = v
-            else:
-                value = str(v)
-            span.set_attribute(f"result.{k}", value)
-    elif parse_output and isinstance(result, (tuple, list)):
-        for idx, item in enumerate(result):
-            span.set_attribute(f"result.{idx}", str(item))
-    elif isinstance(result, (int, float)):
-        span.set_attribute("result", result)
+    serializer = span._data_context.serializer
+    if parse_output and isinstance(result, (dict, tuple, list)):
+        if serializer.config.deferred:
+            span.set_attribute("result", serializer.capture(result, flatten=True))
+        else:
+            for key, value in serializer.flatten("result", result):
+                span.set_attribute(key, value)
     else:
-        span.set_attribute("result", str(result))
+        span.set_attribute("result", serializer.capture(result))
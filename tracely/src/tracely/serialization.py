@@ -0,0 +1,223 @@
+import dataclasses
+import json
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+AttributeValue = Union[str, bool, int, float]
+Handler = Callable[[Any], Any]
+
+_PRIMITIVES = (str, bool, int, float)
+_TRUNCATED = "..."
+# larger numpy arrays are described by shape and dtype instead of converting all values
+_NUMPY_MAX_SIZE = 1000
+
+
+@dataclasses.dataclass
+class SerializationConfig:
+    """
+    Limits for serializing function arguments and results into span attributes.
+
+    Args:
+        max_bytes: maximum size of a single attribute value in bytes (UTF-8), longer values are truncated
+        max_depth: maximum nesting depth of containers serialized, deeper values are replaced with type name
+        max_keys: maximum number of items serialized from a single container
+        flatten_depth: number of nesting levels of dict / list / tuple results split into separate
+                       `result.<key>` attributes when output is parsed
+        deferred: capture arguments and results in traced calls and serialize them in export thread,
+                  dicts, lists and sets are copied (shallowly), other values are captured by reference,
+                  so they should not be mutated after the call
+    """
+
+    max_bytes: int = 16 * 1024
+    max_depth: int = 4
+    max_keys: int = 100
+    flatten_depth: int = 1
+    deferred: bool = False
+
+
+class DeferredValue:
+    """Value captured by traced call to be serialized in export thread."""
+
+    __slots__ = ("value", "flatten")
+
+    def __init__(self, value: Any, flatten: bool = False):
+        self.value = value
+        self.flatten = flatten
+
+
+def _snapshot(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is dict:
+        return dict(value)
+    if value_type is list:
+        return list(value)
+    if value_type is set:
+        return frozenset(value)
+    return value
+
+
+_HANDLERS: Dict[type, Handler] = {}
+_RESOLVED: Dict[type, Optional[Handler]] = {}
+
+
+def register_serializer(value_type: Type, handler: Handler) -> None:
+    """
+    Register handler converting values of given type (and its subclasses) into plain values:
+    dict, list, str, int, float or bool. Result is then serialized with size limits applied.
+    """
+    _HANDLERS[value_type] = handler
+    _RESOLVED.clear()
+
+
+def _dataclass_handler(value: Any) -> Dict[str, Any]:
+    return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+
+
+def _pydantic_handler(value: Any) -> Any:
+    return value.model_dump()
+
+
+def _pydantic_v1_handler(value: Any) -> Any:
+    return value.dict()
+
+
+def _bytes_handler(value: Union[bytes, bytearray, memoryview]) -> str:
+    return bytes(value).decode("utf-8", errors="replace")
+
+
+def _resolve_handler(value_type: type) -> Optional[Handler]:
+    if value_type in _RESOLVED:
+        return _RESOLVED[value_type]
+    handler: Optional[Handler] = None
+    for base in value_type.__mro__:
+        if base in _HANDLERS:
+            handler = _HANDLERS[base]
+            break
+    else:
+        if dataclasses.is_dataclass(value_type):
+            handler = _dataclass_handler
+        elif hasattr(value_type, "model_dump"):
+            handler = _pydantic_handler
+        elif hasattr(value_type, "__fields__") and hasattr(value_type, "dict"):
+            handler = _pydantic_v1_handler
+        elif value_type.__module__ == "numpy" and hasattr(value_type, "tolist"):
+            handler = _numpy_handler
+    _RESOLVED[value_type] = handler
+    return handler
+
+
+def _numpy_handler(value: Any) -> Any:
+    size = getattr(value, "size", 1)
+    if size > _NUMPY_MAX_SIZE:
+        return {"shape": list(value.shape), "dtype": str(value.dtype), "size": size}
+    return value.tolist()
+
+
+register_serializer(bytes, _bytes_handler)
+register_serializer(bytearray, _bytes_handler)
+register_serializer(memoryview, _bytes_handler)
+
+
+class AttributeSerializer:
+    """Converts arbitrary values into span attribute values within configured limits."""
+
+    def __init__(self, config: Optional[SerializationConfig] = None):
+        self.config = config or SerializationConfig()
+
+    def serialize(self, value: Any) -> AttributeValue:
+        value_type = type(value)
+        if value_type is str:
+            return self._truncate(value)
+        if value_type in _PRIMITIVES:
+            return value
+        plain = self._normalize(value, 0)
+        if isinstance(plain, str):
+            return self._truncate(plain)
+        if isinstance(plain, _PRIMITIVES):
+            return plain
+        if plain is None:
+            return "None"
+        return self._truncate(json.dumps(plain, ensure_ascii=False, default=str))
+
+    def capture(self, value: Any, flatten: bool = False) -> Union[AttributeValue, DeferredValue]:
+        """
+        Attribute value for traced call: serialized value, or captured value in deferred mode
+        (short strings and other primitives are used as is). Captured values with `flatten`
+        are split into `<name>.<key>` attributes.
+        """
+        if not self.config.deferred:
+            return self.serialize(value)
+        value_type = type(value)
+        if (
+            not flatten
+            and value_type in _PRIMITIVES
+            and (value_type is not str or len(value) * 4 <= self.config.max_bytes)
+        ):
+            return value
+        return DeferredValue(_snapshot(value), flatten)
+
+    def resolve(self, name: str, value: DeferredValue) -> Iterator[Tuple[str, AttributeValue]]:
+        """Serialize captured value into attributes."""
+        if value.flatten:
+            yield from self.flatten(name, value.value)
+        else:
+            yield name, self.serialize(value.value)
+
+    def flatten(self, prefix: str, value: Any, depth: int = 0) -> Iterator[Tuple[str, AttributeValue]]:
+        """Split dict / list / tuple value into `<prefix>.<key>` attributes up to `flatten_depth` levels."""
+        if depth < self.config.flatten_depth:
+            items: Optional[Iterable[Tuple[Any, Any]]] = None
+            if isinstance(value, dict):
+                items = value.items()
+            elif isinstance(value, (list, tuple)):
+                items = enumerate(value)
+            if items is not None:
+                for idx, (key, item) in enumerate(items):
+                    if idx >= self.config.max_keys:
+                        yield f"{prefix}.{_TRUNCATED}", f"{len(value) - idx} more items"
+                        return
+                    yield from self.flatten(f"{prefix}.{key}", item, depth + 1)
+                return
+        yield prefix, self.serialize(value)
+
+    def _truncate(self, value: str) -> str:
+        max_bytes = self.config.max_bytes
+        # UTF-8 uses at most 4 bytes per character, so short strings do not need encoding
+        if len(value) * 4 <= max_bytes:
+            return value
+        encoded = value.encode("utf-8")
+        if len(encoded) <= max_bytes:
+            return value
+        return encoded[: max(max_bytes - len(_TRUNCATED), 0)].decode("utf-8", errors="ignore") + _TRUNCATED
+
+    def _normalize(self, value: Any, depth: int) -> Any:
+        value_type = type(value)
+        if value is None or value_type in _PRIMITIVES:
+            return self._truncate(value) if value_type is str else value
+        if depth >= self.config.max_depth:
+            return f"<{value_type.__name__}>"
+        max_keys = self.config.max_keys
+        if isinstance(value, dict):
+            result = {}
+            for idx, (key, item) in enumerate(value.items()):
+                if idx >= max_keys:
+                    result[_TRUNCATED] = f"{len(value) - idx} more items"
+                    break
+                result[str(key)] = self._normalize(item, depth + 1)
+            return result
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = [self._normalize(item, depth + 1) for idx, item in zip(range(max_keys), value)]
+            if len(value) > max_keys:
+                items.append(f"{_TRUNCATED} {len(value) - max_keys} more items")
+            return items
+        handler = _resolve_handler(value_type)
+        if handler is None:
+            return self._truncate(str(value))
+        return self._normalize(handler(value), depth + 1)
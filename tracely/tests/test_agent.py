@@ -0,0 +1,110 @@
+import gzip
+import os
+import socket
+from uuid import UUID
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._agent import AgentConfig
+from tracely._agent import LocalAgentSpanExporter
+from tracely._agent import TracelyAgent
+from tracely._segments import _LENGTH
+
+EXPORT_ID = str(UUID(int=42))
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+class StubSession:
+    def __init__(self):
+        self.received = []
+
+    def post(self, url, data, headers, timeout):
+        self.received.append((data, headers))
+        return StubResponse(200)
+
+
+@trace_event()
+def traced(value):
+    return value
+
+
+def test_agent_forwards_merged_batches(tmp_path):
+    socket_path = os.path.join(tmp_path, "agent.sock")
+    session = StubSession()
+    agent = TracelyAgent(
+        "http://collector/api/v1/traces",
+        session,
+        {"evidently.export_id": EXPORT_ID},
+        AgentConfig(socket_path=socket_path, flush_interval=60),
+    )
+    agent.start()
+    provider = init_tracing(
+        exporter_type="local-agent",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        agent_socket=socket_path,
+    )
+    try:
+        for value in range(5):
+            traced(value)
+    finally:
+        provider.shutdown()
+        agent.stop()
+
+    assert len(session.received) == 1
+    data, headers = session.received[0]
+    assert headers["Content-Encoding"] == "gzip"
+    request = ExportTraceServiceRequest.FromString(gzip.decompress(data))
+    assert len(request.resource_spans) == 1
+    resource_spans = request.resource_spans[0]
+    attributes = {attribute.key: attribute.value.string_value for attribute in resource_spans.resource.attributes}
+    assert attributes["evidently.export_id"] == EXPORT_ID
+    assert sum(len(scope_spans.spans) for scope_spans in resource_spans.scope_spans) == 5
+
+
+def test_exporter_fails_without_agent(tmp_path):
+    exporter = LocalAgentSpanExporter(os.path.join(tmp_path, "missing.sock"))
+    assert exporter.export([]) == SpanExportResult.FAILURE
+
+
+def test_agent_drops_malformed_records(tmp_path):
+    socket_path = os.path.join(tmp_path, "agent.sock")
+    session = StubSession()
+    agent = TracelyAgent(
+        "http://collector/api/v1/traces",
+        session,
+        {"evidently.export_id": EXPORT_ID},
+        AgentConfig(socket_path=socket_path, flush_interval=60),
+    )
+    agent.start()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(_LENGTH.pack(3) + b"\xff\xff\xff")
+    assert agent.force_flush(5)
+    provider = init_tracing(
+        exporter_type="local-agent",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        agent_socket=socket_path,
+    )
+    try:
+        traced(1)
+    finally:
+        provider.shutdown()
+        agent.stop()
+
+    (data, _), *_ = session.received
+    request = ExportTraceServiceRequest.FromString(gzip.decompress(data))
+    assert sum(len(scope_spans.spans) for scope_spans in request.resource_spans[0].scope_spans) == 1
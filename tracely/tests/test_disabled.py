@@ -0,0 +1,49 @@
+import pytest
+
+import tracely
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._context import set_tracer
+from tracely.proxy import NULL_SPAN
+
+
+@trace_event()
+def traced(value):
+    span = tracely.get_current_span()
+    span.set_attribute("value", value)
+    span.update_usage(tokens={"input": 1})
+    return value * 2
+
+
+@trace_event()
+async def async_traced(value):
+    return value * 2
+
+
+@pytest.fixture
+def not_initialized():
+    set_tracer(None)
+
+
+def test_decorated_call_when_not_initialized(not_initialized):
+    assert traced(21) == 42
+    assert tracely.get_current_span() is NULL_SPAN
+
+
+@pytest.mark.asyncio
+async def test_async_decorated_call_when_not_initialized(not_initialized):
+    assert await async_traced(21) == 42
+
+
+def test_create_trace_event_when_not_initialized(not_initialized):
+    with tracely.create_trace_event("event", param=1) as span:
+        span.set_attribute("key", "value")
+        span.set_result({"data": 1})
+    assert span is NULL_SPAN
+
+
+def test_init_tracing_disabled():
+    init_tracing(enabled=False)
+
+    assert tracely.get_tracer() is None
+    assert traced(1) == 2
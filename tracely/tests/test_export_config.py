@@ -0,0 +1,71 @@
+import gzip
+import os
+import subprocess
+import sys
+from uuid import UUID
+
+import pytest
+
+from tracely import ExportConfig
+from tracely import SpoolConfig
+from tracely import init_tracing
+from tracely._spool import SpoolSpanExporter
+
+
+class StubResponse:
+    status_code = 200
+    ok = True
+
+
+class StubSession:
+    def __init__(self):
+        self.received = []
+
+    def post(self, url, data, headers, timeout):
+        self.received.append((data, headers, timeout))
+        return StubResponse()
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        ExportConfig(max_queue_size=0),
+        ExportConfig(max_queue_size=100, max_batch_size=200),
+        ExportConfig(schedule_delay=0),
+        ExportConfig(export_timeout=-1),
+        ExportConfig(compression="zstd"),
+    ],
+)
+def test_invalid_export_config(config):
+    with pytest.raises(ValueError):
+        init_tracing(
+            exporter_type="console",
+            project_id=UUID(int=0),
+            export_name="test",
+            as_global=False,
+            export=config,
+        )
+
+
+def test_spool_compression(tmp_path):
+    session = StubSession()
+    exporter = SpoolSpanExporter(
+        SpoolConfig(str(tmp_path)), "http://collector/api/v1/traces", session, timeout=2.0, compression="gzip"
+    )
+    exporter.export([])
+    assert exporter.force_flush(5000)
+    exporter.shutdown()
+
+    data, headers, timeout = session.received[0]
+    assert headers["Content-Encoding"] == "gzip"
+    assert timeout == 2.0
+    gzip.decompress(data)
+
+
+def test_invalid_env_value_does_not_break_import():
+    script = "import tracely\ntry:\n    tracely.ExportConfig()\nexcept ValueError as e:\n    print(e)"
+    env = {**os.environ, "EVIDENTLY_TRACE_MAX_QUEUE_SIZE": "2O48"}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+
+    assert "EVIDENTLY_TRACE_MAX_QUEUE_SIZE" in result.stdout
+    assert "'2O48'" in result.stdout
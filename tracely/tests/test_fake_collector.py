@@ -0,0 +1,86 @@
+import json
+import urllib.request
+from uuid import UUID
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from tracely import ExportConfig
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._tracer_provider import _create_exporter
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+
+@trace_event()
+def traced(value):
+    return value
+
+
+def _init(address, exporter_type="http", **kwargs):
+    return init_tracing(
+        address=address,
+        exporter_type=exporter_type,
+        processor_type="simple",
+        api_key="secret",
+        project_id=str(UUID(int=0)),
+        export_name="test",
+        as_global=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("mode", ["oss", "cloud"])
+def test_http_export(mode):
+    with FakeCollector(FakeCollectorConfig(mode=mode, keep_spans=True)) as collector:
+        provider = _init(collector.address)
+        for value in range(3):
+            traced(value)
+        provider.shutdown()
+
+        stats = collector.stats()
+        assert stats["spans_received"] == 3
+        assert stats["requests_by_path"]["/api/v1/traces"] == 3
+        assert stats["requests_by_path"]["/api/datasets/tracing"] == 1
+        assert list(collector.datasets) == ["test"]
+        assert len(collector.latencies) == 3
+        with urllib.request.urlopen(f"{collector.address}/stats") as response:
+            assert json.load(response)["spans_received"] == 3
+
+
+def test_grpc_export():
+    with FakeCollector(FakeCollectorConfig(grpc_port=0)) as collector:
+        exporter = _create_exporter("grpc", f"http://{collector.grpc_address}", "", True, None, "", ExportConfig())
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        with provider.get_tracer("test").start_as_current_span("span"):
+            pass
+        provider.shutdown()
+
+        assert collector.stats()["spans_received"] == 1
+        assert collector.stats()["requests_by_path"] == {"grpc": 1}
+
+
+def test_error_injection():
+    with FakeCollector(FakeCollectorConfig(error_rate=1.0, error_status=400)) as collector:
+        provider = _init(collector.address)
+        traced(1)
+        provider.shutdown()
+
+        stats = collector.stats()
+        assert stats["requests_failed"] == 1
+        assert stats["spans_received"] == 0
+
+
+def test_throughput_cap():
+    with FakeCollector(FakeCollectorConfig(max_spans_per_second=2)) as collector:
+        provider = _init(collector.address, export=ExportConfig(export_timeout=0.5))
+        for value in range(3):
+            traced(value)
+        provider.shutdown()
+
+        stats = collector.stats()
+        assert stats["spans_received"] == 2
+        assert stats["requests_throttled"] >= 1
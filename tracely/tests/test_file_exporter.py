@@ -0,0 +1,133 @@
+import gzip
+import json
+import os
+import time
+import zlib
+from uuid import UUID
+
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from tracely import FileExportConfig
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._file_exporter import FileSpanExporter
+from tracely._segments import list_segments
+from tracely._segments import read_records
+
+
+def _create_spans(exporter, names):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+    for name in names:
+        with tracer.start_as_current_span(name):
+            pass
+
+
+def _span_names(directory):
+    names = []
+    for segment in list_segments(directory):
+        for payload, _ in read_records(segment):
+            request = ExportTraceServiceRequest.FromString(payload)
+            for resource_spans in request.resource_spans:
+                for scope_spans in resource_spans.scope_spans:
+                    names.extend(span.name for span in scope_spans.spans)
+    return names
+
+
+def test_writes_otlp_segments(tmp_path):
+    exporter = FileSpanExporter(FileExportConfig(directory=str(tmp_path), segment_bytes=400))
+
+    _create_spans(exporter, [f"span-{idx}" for idx in range(10)])
+    exporter.shutdown()
+
+    assert len(list_segments(str(tmp_path))) > 1
+    assert _span_names(str(tmp_path)) == [f"span-{idx}" for idx in range(10)]
+
+
+def test_rotates_by_time(tmp_path):
+    exporter = FileSpanExporter(FileExportConfig(directory=str(tmp_path), segment_seconds=0.001))
+
+    _create_spans(exporter, ["first"])
+    time.sleep(0.01)
+    _create_spans(exporter, ["second"])
+    exporter.shutdown()
+
+    assert len(list_segments(str(tmp_path))) == 2
+
+
+@pytest.mark.parametrize("format", ["otlp", "jsonl"])
+def test_rotation_syncs_finished_segment(tmp_path, monkeypatch, format):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(os.fstat(fd).st_ino) or fsync(fd))
+    config = FileExportConfig(directory=str(tmp_path), format=format, segment_bytes=400, fsync_interval=3600)
+    exporter = FileSpanExporter(config)
+
+    # gzip buffers compressed output, so jsonl segments need more spans to fill
+    _create_spans(exporter, [f"span-{idx}" for idx in range(1000)])
+
+    finished = sorted(os.path.join(tmp_path, name) for name in os.listdir(tmp_path))[:-1]
+    assert finished
+    assert all(os.stat(path).st_ino in synced for path in finished)
+    exporter.shutdown()
+
+
+def test_appends_new_segments_after_restart(tmp_path):
+    for name in ("first", "second"):
+        exporter = FileSpanExporter(FileExportConfig(directory=str(tmp_path)))
+        _create_spans(exporter, [name])
+        exporter.shutdown()
+
+    assert _span_names(str(tmp_path)) == ["first", "second"]
+
+
+def test_writes_jsonl(tmp_path):
+    exporter = FileSpanExporter(FileExportConfig(directory=str(tmp_path), format="jsonl", fsync_interval=0))
+
+    _create_spans(exporter, ["first", "second"])
+    (path,) = [os.path.join(tmp_path, name) for name in os.listdir(tmp_path)]
+    # synced data is readable before gzip stream is finished
+    with open(path, "rb") as f:
+        partial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(f.read())
+    exporter.shutdown()
+    with gzip.open(path, "rt") as f:
+        lines = [json.loads(line) for line in f.read().splitlines()]
+
+    assert len(partial.splitlines()) == 2
+    assert [line["name"] for line in lines] == ["first", "second"]
+
+
+def test_init_tracing_with_file_exporter(tmp_path):
+    @trace_event()
+    def offline_call(value):
+        return value
+
+    provider = init_tracing(
+        address="http://127.0.0.1:1",  # not used: file exporter does not need collector
+        exporter_type="file",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        file_export=FileExportConfig(directory=str(tmp_path)),
+    )
+    offline_call(1)
+    provider.shutdown()
+
+    assert _span_names(str(tmp_path)) == ["offline_call"]
+
+
+def test_file_export_config_requires_file_exporter(tmp_path):
+    with pytest.raises(ValueError):
+        init_tracing(
+            exporter_type="console",
+            project_id=UUID(int=0),
+            export_name="test",
+            as_global=False,
+            file_export=FileExportConfig(directory=str(tmp_path)),
+        )
+    with pytest.raises(ValueError):
+        init_tracing(exporter_type="file", project_id=UUID(int=0), export_name="test", as_global=False)
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+import sys
+from uuid import UUID
+
+import pytest
+
+from tracely import init_tracing
+from tracely import trace_event
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+
+@pytest.fixture
+def collector():
+    with FakeCollector(FakeCollectorConfig(keep_spans=True)) as collector:
+        yield collector
+
+
+@trace_event(track_args=["pid"])
+def traced(pid):
+    return pid
+
+
+def _child(provider):
+    traced(os.getpid())
+    provider.force_flush()
+
+
+@pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="fork is not supported")
+@pytest.mark.skipif(sys.platform == "darwin", reason="fork start method is not safe on macOS")
+def test_forked_children_export_spans(collector):
+    provider = init_tracing(
+        address=collector.address,
+        exporter_type="http",
+        processor_type="batch",
+        api_key="secret",
+        project_id=str(UUID(int=0)),
+        export_name="test",
+        as_global=False,
+    )
+    try:
+        traced(os.getpid())
+        context = multiprocessing.get_context("fork")
+        children = [context.Process(target=_child, args=(provider,)) for _ in range(3)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join(10)
+            assert child.exitcode == 0
+        provider.force_flush()
+    finally:
+        provider.shutdown()
+
+    span_pids = [
+        attribute.value.int_value for span in collector.spans for attribute in span.attributes if attribute.key == "pid"
+    ]
+    assert sorted(span_pids) == sorted([os.getpid()] + [child.pid for child in children])
+    # children reuse export resolved by the parent
+    requests_by_path = collector.stats()["requests_by_path"]
+    assert requests_by_path["/api/datasets"] == 1
+    assert requests_by_path["/api/users/login"] == 1
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from functools import wraps
 from uuid import UUID
 
@@ -6,10 +8,14 @@ import opentelemetry
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
+import tracely
 from tracely import init_tracing
 from tracely import trace_event
 from tracely import get_current_span
+from tracely._context import _data_context
+from tracely.interceptors import AsyncInterceptor
 from tracely.interceptors import Interceptor
+from tracely.interceptors import InterceptorHooks
 
 
 class MyException(Exception):
@@ -107,3 +113,173 @@ def test_trace_func_with_output_failed_deco(exporter):
     assert span.attributes["deco"] == "test_deco"
     assert span.attributes["status"] == "failed"
     assert span.attributes["error"] == "message"
+
+
+class RecordingInterceptor(Interceptor):
+    def __init__(self, name, calls, priority=0):
+        self.name = name
+        self.calls = calls
+        self.priority = priority
+
+    def before_call(self, span, context, *args, **kwargs):
+        self.calls.append(self.name)
+
+
+class AfterCallOnlyInterceptor(Interceptor):
+    def after_call(self, span, context, return_value):
+        pass
+
+
+def test_hooks_contain_only_overridden_methods():
+    hooks = InterceptorHooks([AfterCallOnlyInterceptor()])
+
+    assert hooks.before_call == ()
+    assert len(hooks.after_call) == 1
+    assert hooks.on_exception == ()
+    assert not InterceptorHooks([])
+
+
+def test_interceptor_priority():
+    calls = []
+    init_tracing(
+        exporter_type="console",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        interceptors=[
+            RecordingInterceptor("first", calls),
+            RecordingInterceptor("urgent", calls, priority=10),
+            RecordingInterceptor("second", calls),
+        ],
+    )
+
+    trace_func_with_output()
+
+    assert calls == ["urgent", "first", "second"]
+
+
+def test_hooks_rebuilt_when_interceptors_change(exporter):
+    calls = []
+    _data_context.interceptors = [RecordingInterceptor("replaced", calls)]
+
+    trace_func_with_output()
+
+    assert calls == ["replaced"]
+    assert "status" not in exporter.get_finished_spans()[0].attributes
+
+
+def test_add_and_remove_interceptor(exporter):
+    calls = []
+    interceptor = RecordingInterceptor("added", calls)
+    with pytest.raises(AttributeError):
+        tracely.get_interceptors().append(interceptor)
+
+    tracely.add_interceptor(interceptor)
+    trace_func_with_output()
+    tracely.remove_interceptor(interceptor)
+    trace_func_with_output()
+
+    assert calls == ["added"]
+    assert interceptor not in tracely.get_interceptors()
+
+
+class AuditInterceptor(AsyncInterceptor):
+    concurrent = True
+
+    def __init__(self, name, calls, delay=0.0):
+        self.name = name
+        self.calls = calls
+        self.delay = delay
+
+    async def before_call(self, span, context, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+        self.calls.append(self.name)
+        span.set_attribute(self.name, "before")
+
+    async def on_exception(self, span, context, ex):
+        span.set_attribute(self.name, "handled")
+        return True
+
+
+@trace_event()
+async def async_func():
+    return 1
+
+
+@trace_event()
+async def async_failing_func():
+    raise MyException("failed")
+
+
+def _init_async(interceptors):
+    provider = init_tracing(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        interceptors=interceptors,
+    )
+    exporter = InMemorySpanExporter()
+    if isinstance(provider, opentelemetry.sdk.trace.TracerProvider):
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+def test_async_interceptors_run_concurrently():
+    calls = []
+    exporter = _init_async([AuditInterceptor("slow", calls, 0.1), AuditInterceptor("fast", calls, 0.0)])
+
+    start = time.perf_counter()
+    asyncio.run(async_func())
+
+    assert time.perf_counter() - start < 0.19
+    # both hooks started before the slow one finished
+    assert calls == ["fast", "slow"]
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["slow"] == "before"
+    assert span.attributes["fast"] == "before"
+
+
+def test_async_interceptors_stages():
+    calls = []
+    sequential = AuditInterceptor("sequential", calls, 0.05)
+    sequential.concurrent = False
+    _init_async([sequential, AuditInterceptor("concurrent", calls)])
+
+    asyncio.run(async_func())
+
+    assert calls == ["sequential", "concurrent"]
+
+
+def test_async_interceptor_with_stages_argument():
+    @trace_event()
+    async def plan(stages):
+        return stages
+
+    exporter = _init_async([AuditInterceptor("audit", [])])
+
+    assert asyncio.run(plan(stages=2)) == 2
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["stages"] == 2
+    assert span.attributes["audit"] == "before"
+
+
+def test_async_interceptor_on_exception():
+    exporter = _init_async([AuditInterceptor("audit", [])])
+
+    with pytest.raises(MyException):
+        asyncio.run(async_failing_func())
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["audit"] == "handled"
+    assert "exception" not in span.attributes
+
+
+def test_async_interceptors_not_called_for_sync_functions():
+    calls = []
+    _init_async([AuditInterceptor("audit", calls)])
+
+    trace_func_with_output()
+
+    assert calls == []
@@ -0,0 +1,123 @@
+import threading
+import time
+from uuid import UUID
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import tracely
+from tracely import init_tracing
+from tracely._deferred_exporter import DeferredSpanExporter
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+
+def _deferred(resolve, max_buffered_spans=100):
+    placeholder = Resource.create({"evidently.export_id": "<pending>"})
+    exporter = DeferredSpanExporter(resolve, placeholder, max_buffered_spans)
+    provider = TracerProvider(resource=placeholder)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter, provider.get_tracer("test")
+
+
+def test_spans_buffered_until_resolved():
+    ready = threading.Event()
+    memory = InMemorySpanExporter()
+
+    def resolve():
+        ready.wait(5)
+        return memory, Resource.create({"evidently.export_id": "resolved"})
+
+    exporter, tracer = _deferred(resolve)
+    for name in ("a", "b"):
+        with tracer.start_as_current_span(name):
+            pass
+    assert memory.get_finished_spans() == ()
+
+    ready.set()
+    assert exporter.wait_ready(5)
+    with tracer.start_as_current_span("c"):
+        pass
+
+    spans = memory.get_finished_spans()
+    assert sorted(span.name for span in spans) == ["a", "b", "c"]
+    assert all(span.resource.attributes["evidently.export_id"] == "resolved" for span in spans)
+
+
+def test_buffer_is_bounded():
+    ready = threading.Event()
+    memory = InMemorySpanExporter()
+
+    def resolve():
+        ready.wait(5)
+        return memory, Resource.create({})
+
+    exporter, tracer = _deferred(resolve, max_buffered_spans=3)
+    for idx in range(10):
+        with tracer.start_as_current_span(f"span-{idx}"):
+            pass
+    ready.set()
+    exporter.wait_ready(5)
+
+    assert [span.name for span in memory.get_finished_spans()] == ["span-7", "span-8", "span-9"]
+
+
+def test_failed_resolution_is_retried():
+    attempts = []
+    memory = InMemorySpanExporter()
+
+    def resolve():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("collector is not available")
+        return memory, Resource.create({"evidently.export_id": "resolved"})
+
+    placeholder = Resource.create({"evidently.export_id": "<pending>"})
+    exporter = DeferredSpanExporter(resolve, placeholder, backoff=0.01)
+    provider = TracerProvider(resource=placeholder)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    with provider.get_tracer("test").start_as_current_span("a"):
+        pass
+
+    assert exporter.wait_ready(5)
+    assert len(attempts) == 3
+    (span,) = memory.get_finished_spans()
+    assert span.resource.attributes["evidently.export_id"] == "resolved"
+
+
+def test_shutdown_stops_retries():
+    def resolve():
+        raise ConnectionError("collector is not available")
+
+    exporter, _ = _deferred(resolve)
+    exporter.shutdown()
+    assert not exporter._resolver.is_alive()
+    assert not exporter.force_flush(100)
+
+
+def test_lazy_init_tracing():
+    with FakeCollector(FakeCollectorConfig(api_latency=0.5, keep_spans=True)) as collector:
+        start = time.perf_counter()
+        provider = init_tracing(
+            address=collector.address,
+            exporter_type="http",
+            processor_type="simple",
+            project_id=UUID(int=0),
+            export_name="lazy",
+            as_global=False,
+            lazy=True,
+        )
+        # returned before collector answered export dataset resolution
+        assert time.perf_counter() - start < 0.5
+        assert collector.datasets == {}
+        with tracely.create_trace_event("test"):
+            pass
+
+        assert provider.force_flush(10000)
+        provider.shutdown()
+        assert [span.name for span in collector.spans] == ["test"]
+        (resource,) = collector.resources
+        attributes = {attribute.key: attribute.value.string_value for attribute in resource.attributes}
+        assert attributes["evidently.export_id"] == collector.datasets["lazy"]
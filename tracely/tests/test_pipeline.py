@@ -0,0 +1,230 @@
+import asyncio
+from uuid import UUID
+
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import tracely
+from tracely import Interceptor
+from tracely import TracelyPipeline
+from tracely import UsageDetails
+from tracely import init_tracing
+from tracely import trace_event
+from tracely.fake_collector import FakeCollector
+from tracely.proxy import NULL_SPAN
+
+
+class TenantInterceptor(Interceptor):
+    def __init__(self, tenant):
+        self.tenant = tenant
+
+    def before_call(self, span, context, *args, **kwargs):
+        span.set_attribute("tenant", self.tenant)
+
+
+def _pipeline(tenant, **kwargs):
+    pipeline = TracelyPipeline(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name=tenant,
+        interceptors=[TenantInterceptor(tenant)],
+        **kwargs,
+    )
+    exporter = InMemorySpanExporter()
+    pipeline.provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return pipeline, exporter
+
+
+@pytest.fixture
+def global_exporter():
+    provider = init_tracing(
+        exporter_type="console", processor_type="simple", project_id=UUID(int=0), export_name="test", as_global=False
+    )
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+@trace_event()
+def handle(value):
+    return value
+
+
+def _names(exporter):
+    return [span.name for span in exporter.get_finished_spans()]
+
+
+def test_explicit_pipeline(global_exporter):
+    pipeline, exporter = _pipeline("a")
+
+    @pipeline.trace_event()
+    def pinned(value):
+        return handle(value)
+
+    @pipeline.trace_event()
+    def pinned_stream(count):
+        for value in range(count):
+            yield handle(value)
+
+    pinned(1)
+    with pipeline.create_trace_event("event", param=1):
+        handle(2)
+    assert list(pinned_stream(2)) == [0, 1]
+    handle(3)
+
+    spans = exporter.get_finished_spans()
+    # nested calls are traced by the pipeline of the outer call
+    assert [span.name for span in spans] == ["handle", "pinned", "handle", "event", "handle", "handle", "pinned_stream"]
+    assert spans[0].attributes["tenant"] == "a"
+    assert spans[3].attributes["param"] == 1
+    assert [span.attributes["value"] for span in global_exporter.get_finished_spans()] == [3]
+
+
+def test_activated_pipeline(global_exporter):
+    first, first_exporter = _pipeline("a")
+    second, second_exporter = _pipeline("b")
+
+    with first.activate():
+        handle(1)
+        with second.activate():
+            with tracely.create_trace_event("event"):
+                handle(2)
+        handle(3)
+
+    assert [span.attributes["value"] for span in first_exporter.get_finished_spans()] == [1, 3]
+    assert _names(second_exporter) == ["handle", "event"]
+    assert second_exporter.get_finished_spans()[0].attributes["tenant"] == "b"
+    assert _names(global_exporter) == []
+
+
+@pytest.mark.asyncio
+async def test_selection_is_task_local():
+    pipelines = [_pipeline(tenant) for tenant in ("a", "b")]
+
+    @trace_event()
+    async def request(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    async def serve(pipeline, value):
+        with pipeline.activate():
+            return await request(value)
+
+    await asyncio.gather(*(serve(pipeline, idx) for idx, (pipeline, _) in enumerate(pipelines)))
+
+    for idx, (_, exporter) in enumerate(pipelines):
+        (span,) = exporter.get_finished_spans()
+        assert span.attributes["value"] == idx
+
+
+def test_pipeline_prices():
+    pipeline, exporter = _pipeline("a", default_usage_details=UsageDetails(cost_per_token={"input": 2.0}))
+
+    with pipeline.create_trace_event("llm") as span:
+        span.update_usage(tokens={"input": 10})
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["cost.input"] == 20.0
+
+
+def test_disabled_pipeline(global_exporter):
+    pipeline = TracelyPipeline(enabled=False)
+
+    with pipeline.activate():
+        assert handle(1) == 1
+        assert tracely.get_current_span() is NULL_SPAN
+    with pipeline.create_trace_event("event") as span:
+        assert span is NULL_SPAN
+
+    assert _names(global_exporter) == []
+
+
+def test_pipelines_resolve_own_datasets():
+    with FakeCollector() as collector:
+        init_tracing(
+            address=collector.address,
+            exporter_type="http",
+            project_id=UUID(int=0),
+            export_name="global",
+            as_global=False,
+        )
+        pipelines = [
+            TracelyPipeline(address=collector.address, exporter_type="http", project_id=UUID(int=0), export_name=name)
+            for name in ("a", "b")
+        ]
+
+        assert [str(pipeline.get_info()["export_id"]) for pipeline in pipelines] == [
+            collector.datasets["a"],
+            collector.datasets["b"],
+        ]
+        assert str(tracely.get_info()["export_id"]) == collector.datasets["global"]
+        with pipelines[0].activate():
+            assert str(tracely.get_info()["export_id"]) == collector.datasets["a"]
+        for pipeline in pipelines:
+            pipeline.shutdown()
+
+
+def test_pipeline_span_inside_global_span_starts_new_trace(global_exporter):
+    tenant, exporter = _pipeline("a")
+
+    @trace_event()
+    def answer():
+        tracely.get_current_span().update_usage(tokens={"input": 10})
+
+    @trace_event()
+    def serve():
+        with tenant.activate():
+            answer()
+
+    serve()
+
+    (outer,) = global_exporter.get_finished_spans()
+    (inner,) = exporter.get_finished_spans()
+    assert inner.parent is None
+    assert inner.context.trace_id != outer.context.trace_id
+    assert inner.attributes["tokens.total.input"] == 10
+    assert not any(key.startswith("tokens.") for key in outer.attributes)
+
+
+def test_sampling_decision_is_not_inherited_from_other_pipeline():
+    init_tracing(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        sampling=tracely.SamplingConfig(ratio=0.0),
+    )
+    tenant, exporter = _pipeline("a", sampling=tracely.SamplingConfig(ratio=1.0))
+    dropped, dropped_exporter = _pipeline("b", sampling=tracely.SamplingConfig(ratio=0.0))
+
+    @trace_event()
+    def serve(pipeline, value):
+        # not sampled by global tracing, pipeline samples its calls on its own
+        with pipeline.activate():
+            handle(value)
+
+    serve(tenant, 1)
+    serve(dropped, 2)
+
+    assert [span.attributes["value"] for span in exporter.get_finished_spans()] == [1]
+    assert _names(dropped_exporter) == []
+
+
+def test_pipeline_stats_are_separate(global_exporter):
+    tenant, _ = _pipeline("a")
+    handle(1)
+    for name in ("first", "second"):
+        with tenant.create_trace_event(name):
+            pass
+    # another pipeline or `init_tracing` call does not reset stats of existing pipeline
+    other, _ = _pipeline("b")
+    init_tracing(exporter_type="console", project_id=UUID(int=0), export_name="test", as_global=False)
+
+    assert tenant.get_stats()["spans_ended"] == 2
+    assert other.get_stats()["spans_ended"] == 0
+    assert tracely.get_stats()["spans_ended"] == 0
+    tenant.shutdown()
+    other.shutdown()
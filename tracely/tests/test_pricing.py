@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+from uuid import UUID
+
+import opentelemetry.sdk.trace
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import tracely
+from tracely import PricingTier
+from tracely import UsageDetails
+from tracely import init_tracing
+from tracely._pricing import PricingTable
+
+GPT_41 = UsageDetails(cost_per_token={"input": 2.0, "cached_input": 0.5, "output": 8.0}, aliases=["gpt-4.1-*"])
+GPT_41_MINI = UsageDetails(cost_per_token={"input": 0.4, "output": 1.6}, aliases=["gpt-4.1-mini-*"])
+GEMINI = UsageDetails(
+    cost_per_token={"input": 1.25, "output": 10.0},
+    tiers=[PricingTier(min_input_tokens=200, cost_per_token={"input": 2.5, "output": 15.0})],
+)
+
+
+@pytest.fixture
+def exporter():
+    provider = init_tracing(
+        exporter_type="console",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        default_usage_details=UsageDetails(cost_per_token={"input": 0.001, "output": 0.005}),
+        usage_details_by_model_id={"gpt-4.1": GPT_41, "gpt-4.1-mini": GPT_41_MINI, "gemini-2.5-pro": GEMINI},
+    )
+    exporter = InMemorySpanExporter()
+    if isinstance(provider, opentelemetry.sdk.trace.TracerProvider):
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+def _costs(exporter):
+    (span,) = exporter.get_finished_spans()
+    return {key: value for key, value in span.attributes.items() if key.startswith("cost.") and ".total." not in key}
+
+
+def test_model_prices(exporter):
+    with tracely.create_trace_event("llm") as span:
+        span.update_usage(tokens={"input": 10, "output": 2}, model="gpt-4.1")
+
+    assert _costs(exporter) == {"cost.input": 20.0, "cost.output": 16.0}
+
+
+def test_unknown_model_uses_default_prices(exporter):
+    with tracely.create_trace_event("llm") as span:
+        span.update_usage(tokens={"input": 100, "output": 200}, model="claude")
+
+    assert _costs(exporter) == {"cost.input": 0.1, "cost.output": 1.0}
+
+
+def test_default_model_id_entry():
+    default = UsageDetails(cost_per_token={"input": 3.0})
+    table = PricingTable(UsageDetails(cost_per_token={"input": 1.0}), {"default": default, "gpt-4.1": GPT_41})
+
+    assert table.get().base["input"] == 3.0
+    assert table.get("claude").base["input"] == 1.0
+    assert PricingTable(None, {"default": default}).get().costs({"input": 2}) == {"input": 6.0}
+
+
+def test_prefix_match():
+    table = PricingTable(None, {"gpt-4.1": GPT_41, "gpt-4.1-mini": GPT_41_MINI})
+
+    assert table.get("gpt-4.1").base["input"] == 2.0
+    assert table.get("gpt-4.1-2025-04-14").base["input"] == 2.0
+    # the longest prefix wins
+    assert table.get("gpt-4.1-mini-2025-04-14").base["input"] == 0.4
+    assert table.get("gpt-4o") is None
+    assert table.get(None) is None
+
+
+def test_cached_input_prices():
+    table = PricingTable(None, {"gpt-4.1": GPT_41, "gpt-4.1-mini": GPT_41_MINI})
+    tokens = {"input": 10, "cached_input": 100, "output": 1}
+
+    assert table.get("gpt-4.1").costs(tokens) == {"input": 20.0, "cached_input": 50.0, "output": 8.0}
+    # priced as input if cached input price is not set
+    assert table.get("gpt-4.1-mini").costs(tokens) == pytest.approx({"input": 4.0, "cached_input": 40.0, "output": 1.6})
+
+
+def test_tiers():
+    prices = PricingTable(None, {"gemini-2.5-pro": GEMINI}).get("gemini-2.5-pro")
+
+    assert prices.costs({"input": 100, "output": 10}) == {"input": 125.0, "output": 100.0}
+    assert prices.costs({"input": 150, "cached_input": 50, "output": 10}) == {
+        "input": 375.0,
+        "cached_input": 125.0,
+        "output": 150.0,
+    }
+    assert prices.costs({"total_input": 250, "input": 250, "output": 10})["input"] == 625.0
+
+
+def test_explicit_costs_take_precedence(exporter):
+    with tracely.create_trace_event("llm") as span:
+        span.update_usage(tokens={"input": 10, "output": 2}, costs={"output": 1.0}, model="gpt-4.1")
+
+    assert _costs(exporter) == {"cost.input": 20.0, "cost.output": 1.0}
+
+
+def test_model_from_openai_response(exporter):
+    usage = SimpleNamespace(input_tokens=10, input_tokens_details=SimpleNamespace(cached_tokens=4), output_tokens=2)
+    with tracely.create_trace_event("llm") as span:
+        span.update_usage(SimpleNamespace(model="gpt-4.1-2025-04-14", usage=usage))
+
+    (span,) = exporter.get_finished_spans()
+    assert span.attributes["tokens.total_input"] == 10
+    assert span.attributes["tokens.cached_input"] == 4
+    assert _costs(exporter) == {"cost.input": 12.0, "cost.cached_input": 2.0, "cost.output": 16.0}
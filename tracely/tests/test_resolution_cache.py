@@ -0,0 +1,64 @@
+import os
+from uuid import UUID
+
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from tracely import _tracer_provider
+from tracely import init_tracing
+from tracely._resolution_cache import CacheInvalidatingSpanExporter
+from tracely._resolution_cache import ResolutionCache
+from tracely._resolution_cache import ResolvedExport
+
+EXPORT_ID = str(UUID(int=42))
+
+
+class FailingExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.FAILURE
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = ResolutionCache(str(tmp_path), ttl=60)
+    assert cache.get("http://collector", "project", "export") is None
+
+    cache.put("http://collector", "project", "export", ResolvedExport(EXPORT_ID, is_oss_mode=True))
+
+    assert cache.get("http://collector", "project", "export") == ResolvedExport(EXPORT_ID, True)
+    assert cache.get("http://collector", "project", "other") is None
+    assert ResolutionCache(str(tmp_path), ttl=-1).get("http://collector", "project", "export") is None
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_cache_invalidated_on_export_failure(tmp_path):
+    cache = ResolutionCache(str(tmp_path), ttl=60)
+    cache.put("http://collector", "project", "export", ResolvedExport(EXPORT_ID, is_oss_mode=False))
+    exporter = CacheInvalidatingSpanExporter(
+        FailingExporter(), lambda: cache.invalidate("http://collector", "project", "export")
+    )
+
+    assert exporter.export([]) == SpanExportResult.FAILURE
+    assert cache.get("http://collector", "project", "export") is None
+
+
+def test_init_tracing_uses_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def resolve_export(address, api_key, project_id, export_name):
+        calls.append((address, project_id, export_name))
+        return ResolvedExport(EXPORT_ID, is_oss_mode=True)
+
+    monkeypatch.setattr(_tracer_provider, "_resolve_export", resolve_export)
+    for _ in range(3):
+        provider = init_tracing(
+            address="http://localhost:1",
+            exporter_type="http",
+            project_id=UUID(int=0),
+            export_name="test",
+            as_global=False,
+            cache_dir=str(tmp_path),
+        )
+        assert provider.resource.attributes["evidently.export_id"] == EXPORT_ID
+        provider.shutdown()
+
+    assert len(calls) == 1
@@ -0,0 +1,100 @@
+from uuid import UUID
+
+import opentelemetry.sdk.trace
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import tracely
+from tracely import SamplingConfig
+from tracely import init_tracing
+from tracely import trace_event
+
+
+@trace_event()
+def traced_inner():
+    span = tracely.get_current_span()
+    span.set_attribute("inner", True)
+    return 1
+
+
+@trace_event()
+def traced_outer():
+    return traced_inner() + 1
+
+
+@trace_event()
+async def async_traced_outer():
+    return traced_inner() + 1
+
+
+def _exporter(sampling):
+    provider = init_tracing(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        sampling=sampling,
+    )
+    exporter = InMemorySpanExporter()
+    if isinstance(provider, opentelemetry.sdk.trace.TracerProvider):
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+def test_not_sampled_calls_pass_through():
+    exporter = _exporter(SamplingConfig(ratio=0.0))
+
+    assert traced_outer() == 2
+    with tracely.create_trace_event("manual") as span:
+        span.set_attribute("key", "value")
+        span.set_result(42)
+
+    assert exporter.get_finished_spans() == ()
+    assert tracely.get_current_span() is None
+
+
+@pytest.mark.asyncio
+async def test_not_sampled_async_calls_pass_through():
+    exporter = _exporter(SamplingConfig(ratio=0.0))
+
+    assert await async_traced_outer() == 2
+    assert exporter.get_finished_spans() == ()
+
+
+def test_sampled_calls_keep_children():
+    exporter = _exporter(SamplingConfig(ratio=1.0))
+
+    traced_outer()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["traced_inner", "traced_outer"]
+
+
+def test_rate_limit():
+    exporter = _exporter(SamplingConfig(rate_limit=5))
+
+    for _ in range(50):
+        traced_outer()
+
+    spans = exporter.get_finished_spans()
+    roots = [span for span in spans if span.name == "traced_outer"]
+    assert 5 <= len(roots) <= 6
+    assert len(spans) == 2 * len(roots)
+
+
+def test_parent_based_follows_bound_trace():
+    exporter = _exporter(SamplingConfig(ratio=0.0))
+
+    with tracely.bind_to_trace(1234):
+        traced_outer()
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 2
+    assert all(span.context.trace_id == 1234 for span in spans)
+
+
+def test_invalid_ratio():
+    with pytest.raises(ValueError):
+        _exporter(SamplingConfig(ratio=1.5))
@@ -0,0 +1,178 @@
+import dataclasses
+import gc
+import json
+import threading
+import time
+from uuid import UUID
+
+from opentelemetry.sdk.trace import SpanLimits
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from tracely import SerializationConfig
+from tracely import init_tracing
+from tracely import register_serializer
+from tracely import trace_event
+from tracely._context import _data_context
+from tracely._serialization_exporter import DeferredValues
+from tracely._serialization_exporter import DeferredValuesSpanProcessor
+from tracely._serialization_exporter import SerializingSpanExporter
+from tracely.serialization import AttributeSerializer
+from tracely.serialization import DeferredValue
+
+
+@dataclasses.dataclass
+class Document:
+    title: str
+    pages: int
+
+
+class Secret:
+    def __init__(self, value):
+        self.value = value
+
+
+class PydanticLike:
+    def model_dump(self):
+        return {"field": 1}
+
+
+def test_primitives_are_kept():
+    serializer = AttributeSerializer()
+    assert serializer.serialize(1) == 1
+    assert serializer.serialize(1.5) == 1.5
+    assert serializer.serialize(True) is True
+    assert serializer.serialize("text") == "text"
+    assert serializer.serialize(None) == "None"
+
+
+def test_structures():
+    serializer = AttributeSerializer()
+    assert json.loads(serializer.serialize({"a": [1, 2], "b": Document("t", 3)})) == {
+        "a": [1, 2],
+        "b": {"title": "t", "pages": 3},
+    }
+    assert json.loads(serializer.serialize(PydanticLike())) == {"field": 1}
+    assert serializer.serialize(b"bytes") == "bytes"
+
+
+def test_limits():
+    serializer = AttributeSerializer(SerializationConfig(max_bytes=20, max_depth=2, max_keys=2))
+    truncated = serializer.serialize("x" * 100)
+    assert len(truncated.encode("utf-8")) <= 20
+    assert truncated.endswith("...")
+    assert len(serializer.serialize("ж" * 100).encode("utf-8")) <= 20
+
+    serializer = AttributeSerializer(SerializationConfig(max_depth=2, max_keys=2))
+    assert json.loads(serializer.serialize({"a": {"b": {"c": 1}}})) == {"a": {"b": "<dict>"}}
+    assert json.loads(serializer.serialize([1, 2, 3, 4])) == [1, 2, "... 2 more items"]
+
+
+def test_flatten():
+    serializer = AttributeSerializer(SerializationConfig(max_keys=2, flatten_depth=2))
+    assert dict(serializer.flatten("result", {"a": {"b": 1}, "c": [1], "d": 2})) == {
+        "result.a.b": 1,
+        "result.c.0": 1,
+        "result....": "1 more items",
+    }
+
+
+def test_register_serializer():
+    serializer = AttributeSerializer()
+    assert serializer.serialize(Secret("password")).startswith("<")
+
+    register_serializer(Secret, lambda value: "***")
+
+    assert serializer.serialize(Secret("password")) == "***"
+
+
+class Payload:
+    def __init__(self, threads):
+        self.threads = threads
+
+
+def _payload_handler(value):
+    value.threads.append(threading.current_thread())
+    return {"payload": True}
+
+
+@trace_event(track_output=True, parse_output=True)
+def traced_with_payload(payload, items):
+    items.append(3)
+    return {"count": len(items), "payload": payload}
+
+
+def test_deferred_serialization():
+    register_serializer(Payload, _payload_handler)
+    provider = init_tracing(
+        exporter_type="console",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        serialization=SerializationConfig(deferred=True),
+    )
+    exporter = InMemorySpanExporter()
+    processor = BatchSpanProcessor(
+        SerializingSpanExporter(exporter, _data_context.serializer, _data_context.deferred_values),
+        schedule_delay_millis=10,
+    )
+    provider.add_span_processor(processor)
+
+    threads = []
+    items = [1, 2]
+    traced_with_payload(Payload(threads), items)
+    # arguments are copied when the call starts, as without deferred serialization
+    items.append(4)
+    # flush is not used: it may export in the calling thread
+    deadline = time.monotonic() + 5
+    while not exporter.get_finished_spans() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    (span,) = exporter.get_finished_spans()
+    assert json.loads(span.attributes["payload"]) == {"payload": True}
+    assert json.loads(span.attributes["items"]) == [1, 2]
+    assert span.attributes["result.count"] == 3
+    assert json.loads(span.attributes["result.payload"]) == {"payload": True}
+    assert threads and threading.current_thread() not in threads
+
+
+def _deferred_provider(processor, limits=None):
+    deferred_values = DeferredValues()
+    provider = TracerProvider(span_limits=limits)
+    provider.add_span_processor(DeferredValuesSpanProcessor(processor(deferred_values), deferred_values))
+    return provider.get_tracer("test"), deferred_values
+
+
+def test_deferred_attributes_within_span_limits():
+    limits = SpanLimits(max_span_attributes=3, max_events=1)
+    exporter = InMemorySpanExporter()
+    serializer = AttributeSerializer(SerializationConfig(deferred=True))
+    tracer, deferred_values = _deferred_provider(
+        lambda values: SimpleSpanProcessor(SerializingSpanExporter(exporter, serializer, values, limits)), limits
+    )
+
+    with tracer.start_as_current_span("call") as span:
+        span.set_attributes({"a": 1, "b": 2})
+        span.add_event("first")
+        span.add_event("second")
+        deferred_values.attach(span, {"result": DeferredValue({f"key{idx}": idx for idx in range(5)}, flatten=True)})
+
+    (exported,) = exporter.get_finished_spans()
+    assert dict(exported.attributes) == {"result.key2": 2, "result.key3": 3, "result.key4": 4}
+    assert exported.dropped_attributes == 4
+    assert exported.dropped_events == 1
+
+
+def test_deferred_values_of_dropped_spans_are_released():
+    # processor which drops all spans, e.g. tail sampling
+    tracer, deferred_values = _deferred_provider(lambda values: SpanProcessor())
+
+    with tracer.start_as_current_span("call") as span:
+        deferred_values.attach(span, {"payload": DeferredValue({"large": "value"})})
+    gc.collect()
+
+    assert not deferred_values._pending
+    assert not deferred_values._finished
@@ -1,3 +1,6 @@
+import asyncio
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 
 import opentelemetry.sdk.trace
@@ -49,6 +52,11 @@ def trace_func_with_tokens():
     }
 
 
+@trace_event(ignore_args=["secret"])
+def trace_func_with_args(question, secret, *extra, temperature=0.5, **options):
+    return None
+
+
 @pytest.fixture
 def exporter():
     provider = init_tracing(
@@ -185,3 +193,116 @@ def test_trace_func_with_inner_trace(exporter):
     assert len(spans) == 2
     assert spans[0].name == "trace_func_with_output"
     assert spans[1].name == "trace_func_with_inner_trace"
+
+
+def test_trace_func_with_args(exporter):
+    trace_func_with_args("q1", "s1", "e1", "e2", top_p=0.9)
+    trace_func_with_args(secret="s2", question="q2", temperature=0.1)
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 2
+    first, second = spans[0].attributes, spans[1].attributes
+    assert first["question"] == "q1"
+    assert "secret" not in first
+    assert first["extra"] == '["e1", "e2"]'
+    assert first["temperature"] == 0.5
+    assert second["question"] == "q2"
+    assert second["temperature"] == 0.1
+    assert second["extra"] == "<unknown>"
+    assert second["options"] == "<unknown>"
+
+
+@trace_event()
+def trace_func_with_current_span(name):
+    span = tracely.get_current_span()
+    span.set_attribute("seen", name)
+    return span.span.get_span_context().span_id
+
+
+@trace_event()
+async def async_trace_func_with_current_span(name):
+    span = tracely.get_current_span()
+    await asyncio.sleep(0.01)
+    assert tracely.get_current_span() is span
+    span.set_attribute("seen", name)
+    return name
+
+
+def test_current_span_in_thread_pool(exporter):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        span_ids = list(pool.map(trace_func_with_current_span, [f"call-{i}" for i in range(32)]))
+
+    spans = {span.context.span_id: span for span in exporter.get_finished_spans()}
+    assert len(spans) == 32
+    for idx, span_id in enumerate(span_ids):
+        assert spans[span_id].attributes["seen"] == f"call-{idx}"
+    assert tracely.get_current_span() is None
+
+
+@pytest.mark.asyncio
+async def test_current_span_in_concurrent_tasks(exporter):
+    with tracely.create_trace_event("parent") as parent:
+        await asyncio.gather(*(async_trace_func_with_current_span(f"task-{i}") for i in range(50)))
+        assert tracely.get_current_span() is parent
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 51
+    parent_span_id = spans[-1].context.span_id
+    for span in spans[:-1]:
+        assert span.attributes["seen"] == span.attributes["name"]
+        assert span.parent.span_id == parent_span_id
+
+
+def test_attributes_are_staged_until_span_ends(exporter):
+    with tracely.create_trace_event("staged") as span:
+        span.set_attribute("key", "value")
+        span.set_result({f"k{idx}": idx for idx in range(50)})
+        assert span.get_attribute("key") == "value"
+        assert span.get_attribute("result.k49") == 49
+        assert "key" not in span.span.attributes
+
+    attributes = exporter.get_finished_spans()[0].attributes
+    assert attributes["key"] == "value"
+    assert attributes["result.k49"] == 49
+
+
+@trace_event()
+def llm_call(input_tokens):
+    tracely.get_current_span().update_usage(tokens={"input": input_tokens, "output": 10})
+
+
+@trace_event()
+def agent_step():
+    llm_call(100)
+    with ThreadPoolExecutor() as executor:
+        # context (and so the parent span) is copied to the worker thread
+        ctx = copy_context()
+        executor.submit(ctx.run, llm_call, 200).result()
+
+
+def test_usage_rollup(exporter):
+    with tracely.create_trace_event("request") as span:
+        span.update_usage(tokens={"input": 1})
+        agent_step()
+        llm_call(300)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root = spans["request"]
+    assert root.attributes["tokens.input"] == 1
+    assert root.attributes["tokens.total.input"] == 601
+    assert root.attributes["tokens.total.output"] == 30
+    assert root.attributes["cost.total.input"] == pytest.approx(0.601)
+    assert root.attributes["cost.total.output"] == pytest.approx(0.15)
+    # only the root span carries totals
+    assert not any(key.startswith("tokens.total.") for key in spans["agent_step"].attributes)
+    assert not any(key.startswith("tokens.total.") for key in spans["llm_call"].attributes)
+
+
+def test_usage_rollup_single_span(exporter_without_costs):
+    with tracely.create_trace_event("request") as span:
+        span.update_usage(tokens={"input": 1}, costs={"input": 0.5})
+        span.update_usage(tokens={"input": 2}, costs={"input": 0.7})
+
+    (root,) = exporter_without_costs.get_finished_spans()
+    assert root.attributes["tokens.total.input"] == 2
+    assert root.attributes["cost.total.input"] == 0.7
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import signal
+import sys
+
+import pytest
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from tracely import SpoolConfig
+from tracely._segments import list_segments
+from tracely._spool import SpoolSpanExporter
+from tracely._spool import process_spool_config
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+class StubSession:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.received = []
+
+    def post(self, url, data, headers, timeout):
+        if self.status_code < 400:
+            self.received.append(data)
+        return StubResponse(self.status_code)
+
+
+def _span_names(payloads):
+    names = []
+    for payload in payloads:
+        request = ExportTraceServiceRequest()
+        request.ParseFromString(payload)
+        for resource_spans in request.resource_spans:
+            for scope_spans in resource_spans.scope_spans:
+                names.extend(span.name for span in scope_spans.spans)
+    return names
+
+
+def _create_spans(exporter, names):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+    for name in names:
+        with tracer.start_as_current_span(name):
+            pass
+
+
+def test_spool_sends_spans(tmp_path):
+    session = StubSession()
+    exporter = SpoolSpanExporter(SpoolConfig(str(tmp_path)), "http://collector/api/v1/traces", session)
+    _create_spans(exporter, ["a", "b", "c"])
+
+    assert exporter.force_flush(5000)
+    exporter.shutdown()
+    assert _span_names(session.received) == ["a", "b", "c"]
+
+
+def test_spool_resumes_after_restart(tmp_path):
+    config = SpoolConfig(str(tmp_path), max_backoff=0.01)
+    failing = StubSession(status_code=503)
+    exporter = SpoolSpanExporter(config, "http://collector/api/v1/traces", failing)
+    _create_spans(exporter, ["a", "b"])
+    exporter.shutdown()
+    assert failing.received == []
+
+    session = StubSession()
+    exporter = SpoolSpanExporter(config, "http://collector/api/v1/traces", session)
+    _create_spans(exporter, ["c"])
+    assert exporter.force_flush(5000)
+    exporter.shutdown()
+
+    assert _span_names(session.received) == ["a", "b", "c"]
+    # fully sent segments are removed, only last (active at shutdown) one is left
+    assert len(list_segments(str(tmp_path))) == 1
+
+
+def test_spool_disk_budget(tmp_path):
+    config = SpoolConfig(str(tmp_path), max_bytes=2048, segment_bytes=512, max_backoff=0.01)
+    exporter = SpoolSpanExporter(config, "http://collector/api/v1/traces", StubSession(status_code=503))
+    _create_spans(exporter, [f"span-{idx}" for idx in range(100)])
+    exporter.shutdown()
+
+    total = sum(os.path.getsize(segment) for segment in list_segments(str(tmp_path)))
+    assert 0 < total <= 2048
+
+
+def test_spool_skips_corrupt_segment(tmp_path):
+    # left by a crash between creating segment and writing its header
+    open(os.path.join(tmp_path, f"{0:020d}.seg"), "wb").close()
+    session = StubSession()
+    exporter = SpoolSpanExporter(SpoolConfig(str(tmp_path)), "http://collector/api/v1/traces", session)
+    _create_spans(exporter, ["a"])
+
+    assert exporter.force_flush(5000)
+    assert exporter._sender.is_alive()
+    exporter.shutdown()
+    assert _span_names(session.received) == ["a"]
+    assert os.path.exists(os.path.join(tmp_path, f"{0:020d}.seg.corrupt"))
+
+
+def _spool_and_crash(root):
+    config = process_spool_config(SpoolConfig(root, max_backoff=0.01), os.getpid())
+    exporter = SpoolSpanExporter(
+        config, "http://collector/api/v1/traces", StubSession(status_code=503), orphans_directory=root
+    )
+    _create_spans(exporter, ["child-a", "child-b"])
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+@pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="fork is not supported")
+@pytest.mark.skipif(sys.platform == "darwin", reason="fork start method is not safe on macOS")
+def test_spool_of_exited_process_is_drained(tmp_path):
+    root = str(tmp_path)
+    child = multiprocessing.get_context("fork").Process(target=_spool_and_crash, args=(root,))
+    child.start()
+    child.join(10)
+    assert child.exitcode == -signal.SIGKILL
+    # spool of a live process is left to its owner
+    alive = process_spool_config(SpoolConfig(root, max_backoff=0.01), os.getppid())
+    exporter = SpoolSpanExporter(alive, "http://collector/api/v1/traces", StubSession(status_code=503))
+    _create_spans(exporter, ["alive"])
+    exporter.shutdown()
+
+    session = StubSession()
+    exporter = SpoolSpanExporter(SpoolConfig(root), "http://collector/api/v1/traces", session, orphans_directory=root)
+    assert exporter.force_flush(5000)
+    exporter.shutdown()
+
+    assert _span_names(session.received) == ["child-a", "child-b"]
+    assert sorted(os.listdir(root)) == [os.path.basename(alive.directory)]
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from uuid import UUID
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from tracely import get_stats
+from tracely import init_tracing
+from tracely import trace_event
+from tracely._stats import ExportStats
+from tracely._stats import StatsSpanExporter
+from tracely._stats import StatsSpanProcessor
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+
+class BlockingExporter(SpanExporter):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def export(self, spans):
+        self.release.wait(5)
+        return SpanExportResult.SUCCESS
+
+
+@trace_event()
+def traced(value):
+    return value
+
+
+def _init(**kwargs):
+    kwargs.setdefault("exporter_type", "memory")
+    return init_tracing(
+        processor_type="simple",
+        project_id=str(UUID(int=0)),
+        export_name="test",
+        as_global=False,
+        **kwargs,
+    )
+
+
+def test_span_counters():
+    provider = _init()
+    for value in range(3):
+        traced(value)
+    provider.shutdown()
+
+    stats = get_stats()
+    assert stats["spans_started"] == 3
+    assert stats["spans_ended"] == 3
+    assert stats["spans_exported"] == 3
+    assert stats["spans_dropped"] == 0
+    assert stats["batch_size"]["count"] == 3
+    assert stats["export_latency"]["count"] == 3
+
+
+def test_dropped_spans_and_queue_depth():
+    stats = ExportStats()
+    exporter = BlockingExporter()
+    processor = BatchSpanProcessor(StatsSpanExporter(exporter, stats), max_queue_size=4, max_export_batch_size=1)
+    provider = TracerProvider()
+    provider.add_span_processor(StatsSpanProcessor(processor, stats))
+    tracer = provider.get_tracer("test")
+    for idx in range(10):
+        with tracer.start_as_current_span(f"span-{idx}"):
+            pass
+        # let worker take the first span, so queue state is deterministic
+        deadline = time.monotonic() + 5
+        while idx == 0 and stats.queue_depth() > 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    snapshot = stats.snapshot()
+    assert snapshot["spans_ended"] == 10
+    assert snapshot["queue_depth"] == 4
+    assert snapshot["spans_dropped"] == 5
+    exporter.release.set()
+    provider.shutdown()
+
+
+def test_counters_from_many_threads():
+    stats = ExportStats()
+    processor = StatsSpanProcessor(SimpleSpanProcessor(InMemorySpanExporter()), stats)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer("test")
+
+    def run():
+        for _ in range(500):
+            with tracer.start_as_current_span("span"):
+                pass
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # reading does not change counters
+    assert stats.snapshot()["spans_started"] == stats.snapshot()["spans_started"] == 4000
+    assert stats.snapshot()["spans_ended"] == 4000
+
+
+def test_http_errors():
+    with FakeCollector(FakeCollectorConfig(error_rate=1.0, error_status=400)) as collector:
+        provider = _init(exporter_type="http", address=collector.address)
+        traced(1)
+        provider.shutdown()
+
+    stats = get_stats()
+    assert stats["spans_failed"] == 1
+    assert stats["http_errors"] == {400: 1}
+
+
+def test_stats_log(caplog):
+    with caplog.at_level(logging.INFO, logger="tracely._stats"):
+        provider = _init(stats_log_interval=0.01)
+        traced(1)
+        time.sleep(0.1)
+        provider.shutdown()
+        _init(enabled=False)
+
+    assert any('"exported": 1' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,135 @@
+from uuid import UUID
+
+import opentelemetry.sdk.trace
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+import tracely
+from tracely import init_tracing
+from tracely import trace_event
+
+
+@trace_event()
+def stream_tokens(prompt):
+    span = tracely.get_current_span()
+    span.set_attribute("inside", True)
+    for token in ("Hello", ", ", "world"):
+        yield token
+
+
+@trace_event()
+def stream_numbers(count):
+    for idx in range(count):
+        yield {"idx": idx}
+
+
+@trace_event()
+def failing_stream():
+    yield "first"
+    raise ValueError("stream failed")
+
+
+@trace_event()
+def echo():
+    received = yield "ready"
+    while received is not None:
+        received = yield f"echo {received}"
+
+
+@trace_event()
+async def async_stream_tokens(prompt):
+    span = tracely.get_current_span()
+    span.set_attribute("inside", True)
+    for token in ("Hello", ", ", "world"):
+        yield token
+
+
+@pytest.fixture
+def exporter():
+    provider = init_tracing(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+    )
+    exporter = InMemorySpanExporter()
+    if isinstance(provider, opentelemetry.sdk.trace.TracerProvider):
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+def test_generator_span_covers_stream(exporter):
+    stream = stream_tokens("hi")
+    assert exporter.get_finished_spans() == ()
+    assert next(stream) == "Hello"
+    assert tracely.get_current_span() is None
+    assert exporter.get_finished_spans() == ()
+
+    assert list(stream) == [", ", "world"]
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 1
+    attributes = spans[0].attributes
+    assert attributes["prompt"] == "hi"
+    assert attributes["inside"] is True
+    assert attributes["result"] == "Hello, world"
+    assert attributes["stream.items"] == 3
+    assert attributes["stream.completed"] is True
+    assert attributes["stream.time_to_first_item"] >= 0
+    assert spans[0].status.status_code == StatusCode.OK
+
+
+def test_generator_preview_is_bounded(exporter):
+    assert len(list(stream_numbers(500))) == 500
+
+    attributes = exporter.get_finished_spans()[0].attributes
+    assert attributes["stream.items"] == 500
+    assert attributes["result.99"] == '{"idx": 99}'
+    assert "result.100" not in attributes
+
+
+def test_generator_closed_early(exporter):
+    stream = stream_numbers(10)
+    next(stream)
+    stream.close()
+
+    attributes = exporter.get_finished_spans()[0].attributes
+    assert attributes["stream.items"] == 1
+    assert attributes["stream.completed"] is False
+
+
+def test_generator_exception(exporter):
+    with pytest.raises(ValueError):
+        list(failing_stream())
+
+    span = exporter.get_finished_spans()[0]
+    assert span.status.status_code == StatusCode.ERROR
+    assert span.attributes["exception"] == "stream failed"
+
+
+def test_generator_send(exporter):
+    stream = echo()
+    assert next(stream) == "ready"
+    assert stream.send("a") == "echo a"
+    with pytest.raises(StopIteration):
+        stream.send(None)
+
+    assert exporter.get_finished_spans()[0].attributes["stream.items"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_generator(exporter):
+    with tracely.create_trace_event("parent"):
+        tokens = [token async for token in async_stream_tokens("hi")]
+
+    assert tokens == ["Hello", ", ", "world"]
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["async_stream_tokens", "parent"]
+    attributes = spans[0].attributes
+    assert attributes["inside"] is True
+    assert attributes["result"] == "Hello, world"
+    assert attributes["stream.items"] == 3
+    assert spans[0].parent.span_id == spans[1].context.span_id
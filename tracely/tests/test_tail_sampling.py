@@ -0,0 +1,116 @@
+import time
+from uuid import UUID
+
+import opentelemetry.sdk.trace
+import opentelemetry.trace
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import tracely
+from tracely import TailSamplingConfig
+from tracely import TailSamplingSpanProcessor
+from tracely import init_tracing
+from tracely import trace_event
+
+
+@trace_event()
+def failing_child():
+    raise ValueError("failed")
+
+
+@trace_event()
+def root_with_error():
+    try:
+        failing_child()
+    except ValueError:
+        pass
+    return "ok"
+
+
+@trace_event()
+def fast_root():
+    return "ok"
+
+
+@trace_event()
+def slow_root():
+    time.sleep(0.05)
+    return "ok"
+
+
+@trace_event()
+def expensive_root():
+    with tracely.create_trace_event("llm_call") as span:
+        span.update_usage(tokens={"input": 10}, costs={"input": 0.3})
+    with tracely.create_trace_event("llm_call") as span:
+        span.update_usage(tokens={"input": 10}, costs={"input": 0.3})
+    return "ok"
+
+
+def _exporter(config):
+    provider = init_tracing(
+        exporter_type="console",
+        processor_type="simple",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+    )
+    exporter = InMemorySpanExporter()
+    if isinstance(provider, opentelemetry.sdk.trace.TracerProvider):
+        provider.add_span_processor(TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), config))
+    return exporter
+
+
+def test_keeps_traces_with_errors():
+    exporter = _exporter(TailSamplingConfig())
+
+    fast_root()
+    root_with_error()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["failing_child", "root_with_error"]
+
+
+def test_keeps_slow_traces():
+    exporter = _exporter(TailSamplingConfig(latency_threshold=0.02))
+
+    fast_root()
+    slow_root()
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["slow_root"]
+
+
+@pytest.mark.parametrize("budget,expected", [(0.5, 3), (1.0, 0)])
+def test_keeps_expensive_traces(budget, expected):
+    exporter = _exporter(TailSamplingConfig(cost_budget=budget))
+
+    expensive_root()
+
+    assert len(exporter.get_finished_spans()) == expected
+
+
+def test_bounded_number_of_traces():
+    exporter = _exporter(TailSamplingConfig(max_traces=2))
+
+    roots = [tracely.get_tracer().start_span(f"root_{idx}") for idx in range(3)]
+    for root in roots:
+        with opentelemetry.trace.use_span(root):
+            with pytest.raises(ValueError):
+                failing_child()
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 1
+    assert spans[0].context.trace_id == roots[0].get_span_context().trace_id
+
+
+def test_init_tracing_with_tail_processor():
+    provider = init_tracing(
+        exporter_type="console",
+        processor_type="tail",
+        project_id=UUID(int=0),
+        export_name="test",
+        as_global=False,
+        tail_sampling=TailSamplingConfig(latency_threshold=1.0),
+    )
+    assert provider is not None
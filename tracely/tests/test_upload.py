@@ -0,0 +1,136 @@
+import os
+import urllib.parse
+from uuid import UUID
+
+import requests
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from tracely import FileExportConfig
+from tracely._file_exporter import FileSpanExporter
+from tracely._segments import _LENGTH
+from tracely._segments import list_segments
+from tracely._segments import read_records
+from tracely._upload import SegmentUploader
+from tracely._upload import UploadConfig
+from tracely._upload import read_checkpoint
+from tracely.cli import main
+from tracely.fake_collector import FakeCollector
+from tracely.fake_collector import FakeCollectorConfig
+
+SPANS = [f"span-{idx}" for idx in range(20)]
+
+
+def _write_segments(directory):
+    exporter = FileSpanExporter(FileExportConfig(directory=str(directory), segment_bytes=400))
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    for name in SPANS:
+        with provider.get_tracer("test").start_as_current_span(name):
+            pass
+    provider.shutdown()
+    return list_segments(str(directory))
+
+
+def _uploader(collector, **config):
+    config.setdefault("writers_stopped", True)
+    return SegmentUploader(
+        urllib.parse.urljoin(collector.address, "/api/v1/traces"),
+        requests.Session,
+        {"evidently.export_id": str(UUID(int=42))},
+        UploadConfig(concurrency=4, backoff=0.001, **config),
+    )
+
+
+def test_uploads_segments(tmp_path):
+    segments = _write_segments(tmp_path)
+    with FakeCollector(FakeCollectorConfig(keep_spans=True)) as collector:
+        report = _uploader(collector, max_batch_bytes=1000).upload(str(tmp_path))
+
+        assert collector.stats()["spans_received"] == len(SPANS)
+        assert sorted(span.name for span in collector.spans) == sorted(SPANS)
+    assert report["segments"] == report["segments_uploaded"] == len(segments) > 1
+    assert report["spans"] == len(SPANS)
+    assert all(read_checkpoint(segment)[1] for segment in segments)
+
+
+def test_skips_uploaded_segments(tmp_path):
+    segments = _write_segments(tmp_path)
+    with FakeCollector() as collector:
+        _uploader(collector).upload(str(tmp_path))
+        collector.reset()
+        report = _uploader(collector).upload(str(tmp_path))
+
+        assert collector.stats()["spans_received"] == 0
+    assert report["segments_skipped"] == len(segments)
+
+
+def test_resumes_failed_upload(tmp_path):
+    segments = _write_segments(tmp_path)
+    with FakeCollector(FakeCollectorConfig(error_rate=1.0)) as collector:
+        report = _uploader(collector, max_retries=2).upload(str(tmp_path))
+        assert report["segments_failed"] == len(segments)
+        assert report["retries"] == 2 * len(segments)
+        assert read_checkpoint(segments[0]) == (0, False)
+
+        collector.config.error_rate = 0.0
+        report = _uploader(collector).upload(str(tmp_path))
+
+        assert report["segments_uploaded"] == len(segments)
+        assert collector.stats()["spans_received"] == len(SPANS)
+
+
+def test_does_not_retry_rejected_requests(tmp_path):
+    segments = _write_segments(tmp_path)
+    with FakeCollector(FakeCollectorConfig(error_rate=1.0, error_status=400)) as collector:
+        report = _uploader(collector, max_retries=2).upload(str(tmp_path))
+
+    assert report["segments_failed"] == len(segments)
+    assert report["retries"] == 0
+
+
+def test_corrupt_segment_does_not_stop_upload(tmp_path):
+    segments = _write_segments(tmp_path)
+    with open(segments[0], "ab") as f:
+        f.write(_LENGTH.pack(3) + b"\xff\xff\xff")
+    with FakeCollector() as collector:
+        report = _uploader(collector).upload(str(tmp_path))
+
+    assert report["segments_failed"] == 1
+    assert report["segments_uploaded"] == len(segments) - 1
+
+
+def test_newest_segment_is_not_completed_while_written(tmp_path):
+    segments = _write_segments(tmp_path)
+    record, _ = list(read_records(segments[0]))[0]
+    with FakeCollector() as collector:
+        report = _uploader(collector, writers_stopped=False, delete=True).upload(str(tmp_path))
+        assert report["segments_uploaded"] == len(segments) - 1
+        assert report["segments_active"] == 1
+        offset, complete = read_checkpoint(segments[-1])
+        assert not complete
+        assert list_segments(str(tmp_path)) == segments[-1:]
+
+        # exporter appends to the newest segment after upload
+        with open(segments[-1], "ab") as f:
+            f.write(_LENGTH.pack(len(record)) + record)
+        collector.reset()
+        _uploader(collector, writers_stopped=False).upload(str(tmp_path))
+        assert collector.stats()["spans_received"] == 1
+
+        collector.reset()
+        report = _uploader(collector).upload(str(tmp_path))
+        assert collector.stats()["spans_received"] == 0
+        assert report["segments_uploaded"] == 1
+        assert read_checkpoint(segments[-1])[1]
+
+
+def test_upload_command(tmp_path):
+    _write_segments(tmp_path)
+    with FakeCollector() as collector:
+        args = ["upload", str(tmp_path), "--address", collector.address, "--api-key", "secret"]
+        args += ["--project-id", str(UUID(int=0)), "--export-name", "test", "--delete", "--writers-stopped"]
+        assert main(args) == 0
+
+        assert collector.stats()["spans_received"] == len(SPANS)
+    assert os.listdir(tmp_path) == []